@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+DIY Video Finder - Benchmark Suite
+==================================
+
+Micro- and macro-benchmarks of the hot paths, over generated catalogs of
+100 to 100k videos (fake_youtube.SyntheticCatalog, so runs are reproducible):
+
+- micro: parse_duration, format_views, calculate_trust_score, score_batch,
+         categorize_video
+- macro: apply_category_caps, v1 merge/parse (SaveVideoDataTool, needs
+         crewai), catalog save, render_script, import_script, save_videos
+
+Every benchmark processes the whole catalog once per repeat; the fastest
+repeat is the result (least disturbed by the machine). Results are saved as
+JSON, and `compare` flags benchmarks that got slower than a threshold:
+
+    python benchmarks.py run --save                  # record the baseline
+    python benchmarks.py run --sizes 1000 --filter score
+    python benchmarks.py compare --threshold 0.2     # run again, exit 1 on regressions
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+BASELINE_PATH = ROOT / ".cache" / "benchmarks" / "baseline.json"
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+DEFAULT_THRESHOLD = 0.20  # 20% slower = regression
+
+# Repeat until this much time was spent (at least MIN_REPEATS, at most MAX_REPEATS)
+MIN_TIME = 0.3
+MIN_REPEATS = 3
+MAX_REPEATS = 25
+
+# Differences below this many microseconds are noise, never a regression
+NOISE_FLOOR_US = 20
+
+# benchmark -> reference it must not be slower than (same size); checked by run and compare
+REFERENCES = {"categorize_video": "substring_scan"}
+REFERENCE_TOLERANCE = 0.10  # Two benchmarks of one run still differ this much from timing noise alone
+
+SEED = 42
+DOMAIN = "trockenbau"
+
+
+class Skip(Exception):
+    """Raised by a benchmark setup whose dependency is missing"""
+
+
+# name -> setup(workload) returning (fn, reset) - fn is timed, reset runs untimed before each repeat
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+# =============================================================================
+# WORKLOADS
+# =============================================================================
+
+
+class Workload:
+    """Generated videos for one catalog size, scored and categorized once"""
+
+    def __init__(self, size: int, workdir: Path):
+        import video_curator_v2 as curator
+        from domains import load_domain
+        from fake_youtube import SyntheticCatalog
+
+        self.size = size
+        self.workdir = workdir
+        self.curator = curator
+        self.domain_config = load_domain(DOMAIN)
+
+        synthetic = SyntheticCatalog(size, self.domain_config, seed=SEED)
+        self.videos = [curator.VideoRecord.from_api(synthetic.video(i)) for i in range(size)]
+        for video in self.videos:
+            video.rating = curator.calculate_trust_score(video, self.domain_config)
+            video.category = curator.categorize_video(video, self.domain_config)
+
+    def entries(self) -> list:
+        """The videos as script.js-style dicts (what the v1 tools handle)"""
+        from catalog import format_views
+
+        return [
+            {**self.curator.record_to_entry(v), "views": format_views(v.views), "youtubeId": v.id} for v in self.videos
+        ]
+
+    def catalog(self, name: str, videos=None):
+        """A Catalog in the work directory, filled with `videos` (default: all)"""
+        from catalog import Catalog
+
+        catalog = Catalog(self.workdir / f"{name}.json", self.workdir / f"{name}.js")
+        for video in self.videos if videos is None else videos:
+            catalog.upsert(video.id, self.curator.record_to_entry(video))
+        return catalog
+
+
+def _no_reset():
+    pass
+
+
+# =============================================================================
+# MICRO-BENCHMARKS
+# =============================================================================
+
+
+@benchmark("parse_duration")
+def _parse_duration(w: Workload):
+    durations = [v.duration for v in w.videos]
+    parse = w.curator.parse_duration
+    return lambda: [parse(d) for d in durations], _no_reset
+
+
+@benchmark("format_views")
+def _format_views(w: Workload):
+    from catalog import format_views
+
+    views = [v.views for v in w.videos]
+    return lambda: [format_views(n) for n in views], _no_reset
+
+
+@benchmark("calculate_trust_score")
+def _trust_score(w: Workload):
+    score, config = w.curator.calculate_trust_score, w.domain_config
+    return lambda: [score(v, config) for v in w.videos], _no_reset
+
+
+@benchmark("score_batch")
+def _score_batch(w: Workload):
+    try:
+        import numpy  # noqa: F401
+    except ImportError as e:
+        raise Skip("numpy not installed") from e
+    curator = w.curator
+    return lambda: curator.score_batch(**curator.score_columns(w.videos, w.domain_config)), _no_reset
+
+
+@benchmark("categorize_video")
+def _categorize(w: Workload):
+    categorize, config = w.curator.categorize_video, w.domain_config
+    return lambda: [categorize(v, config) for v in w.videos], _no_reset
+
+
+@benchmark("substring_scan")
+def _substring_scan(w: Workload):
+    """categorize_video before the keyword index: every keyword as a plain substring (reference)"""
+    categories = [(category.id, category.keywords) for category in w.domain_config.categories]
+
+    def categorize(video) -> str:
+        text = f"{video.title} {video.description}".lower()
+        best_category, best_matches = "grundlagen", 0
+        for cat_id, keywords in categories:
+            matches = sum(1 for keyword in keywords if keyword in text)
+            if matches > best_matches:
+                best_category, best_matches = cat_id, matches
+        return best_category
+
+    return lambda: [categorize(v) for v in w.videos], _no_reset
+
+
+# =============================================================================
+# MACRO-BENCHMARKS
+# =============================================================================
+
+
+@benchmark("apply_category_caps")
+def _category_caps(w: Workload):
+    half = w.size // 2
+    catalog = w.catalog("caps", w.videos[:half])
+    new_videos = w.videos[half:]
+    return lambda: w.curator.apply_category_caps(catalog, new_videos, 12), _no_reset
+
+
+def _save_video_data_tool():
+    try:
+        from crew_tools import SaveVideoDataTool
+    except ImportError as e:
+        raise Skip(f"crewai not installed ({e.name})") from e
+    return SaveVideoDataTool(dry_run=True)
+
+
+@benchmark("v1_merge_videos")
+def _merge_videos(w: Workload):
+    tool = _save_video_data_tool()
+    entries = w.entries()
+    half = len(entries) // 2
+    return lambda: tool._merge_videos(entries[:half], entries[half:]), _no_reset
+
+
+@benchmark("v1_parse_videos_from_js")
+def _parse_videos_from_js(w: Workload):
+    from catalog import render_script
+
+    tool = _save_video_data_tool()
+    catalog = w.catalog("parse")
+    render_script(catalog)
+    js_code = catalog.script_path.read_text(encoding="utf-8")
+    return lambda: tool._parse_videos_from_js(js_code), _no_reset
+
+
+@benchmark("catalog_save")
+def _catalog_save(w: Workload):
+    catalog = w.catalog("save")
+
+    def reset():
+        catalog._saved_text = None  # Force a write
+
+    return catalog.save, reset
+
+
+@benchmark("render_script")
+def _render_script(w: Workload):
+    from catalog import render_script
+
+    catalog = w.catalog("render")
+    return lambda: render_script(catalog), lambda: catalog.script_path.unlink(missing_ok=True)
+
+
+@benchmark("import_script")
+def _import_script(w: Workload):
+    from catalog import render_script
+
+    source = w.catalog("import_source")
+    render_script(source)
+    target = w.catalog("import_target", [])
+    return lambda: target.import_script(source.script_path), target.clear
+
+
+@benchmark("save_videos")
+def _save_videos(w: Workload):
+    catalog = w.catalog("save_videos", [])
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            w.curator.save_videos(w.videos, catalog)
+
+    def reset():
+        catalog.clear()
+        catalog._saved_text = None
+        catalog.script_path.unlink(missing_ok=True)
+
+    return run, reset
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+
+def time_benchmark(fn, reset) -> list:
+    """Seconds per repeat (see MIN_TIME / MIN_REPEATS / MAX_REPEATS)"""
+    times = []
+    while len(times) < MAX_REPEATS and (len(times) < MIN_REPEATS or sum(times) < MIN_TIME):
+        reset()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _git_commit() -> str:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return result.stdout.strip()
+    except OSError:
+        return ""
+
+
+def run_suite(sizes, pattern: str | None = None) -> dict:
+    """Run the selected benchmarks for every size; returns the results document"""
+    selected = [name for name in BENCHMARKS if not pattern or re.search(pattern, name)]
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="benchmarks-") as tmp:
+        for size in sizes:
+            workdir = Path(tmp) / str(size)
+            workdir.mkdir()
+            print(f"\n📦 {size:,} videos")
+            workload = Workload(size, workdir)
+
+            for name in selected:
+                try:
+                    fn, reset = BENCHMARKS[name](workload)
+                except Skip as e:
+                    print(f"   ⏭️  {name:<24} skipped: {e}")
+                    continue
+                times = sorted(time_benchmark(fn, reset))
+                best = times[0]
+                results[f"{name}[{size}]"] = {
+                    "benchmark": name,
+                    "size": size,
+                    "min_s": best,
+                    "median_s": times[len(times) // 2],
+                    "repeats": len(times),
+                    "ns_per_item": best / size * 1e9,
+                }
+                print(f"   {name:<24} {best * 1000:10.3f} ms  ({best / size * 1e9:9.0f} ns/video, {len(times)} runs)")
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Print a comparison table; returns the keys that regressed beyond `threshold`"""
+    regressions = []
+    print(f"\n{'benchmark':<34} {'baseline':>12} {'current':>12} {'change':>9}")
+    for key, base in baseline["results"].items():
+        now = current["results"].get(key)
+        if now is None:
+            print(f"{key:<34} {base['min_s'] * 1000:10.3f}ms {'-':>12} {'missing':>9}")
+            continue
+        change = now["min_s"] / base["min_s"] - 1 if base["min_s"] else 0.0
+        noise = abs(now["min_s"] - base["min_s"]) * 1e6 < NOISE_FLOOR_US
+        marker = ""
+        if change > threshold and not noise:
+            regressions.append(key)
+            marker = "  ❌ regression"
+        elif change < -threshold and not noise:
+            marker = "  ✅ faster"
+        print(f"{key:<34} {base['min_s'] * 1000:10.3f}ms {now['min_s'] * 1000:10.3f}ms {change:+8.1%}{marker}")
+    return regressions
+
+
+def check_references(document: dict) -> list:
+    """Print each REFERENCES pair; returns the keys slower than their reference"""
+    failures = []
+    results = document["results"]
+    for key, result in results.items():
+        reference = REFERENCES.get(result["benchmark"])
+        base = results.get(f"{reference}[{result['size']}]") if reference else None
+        if base is None:
+            continue
+        excess = result["min_s"] - base["min_s"] * (1 + REFERENCE_TOLERANCE)
+        slower = excess > 0 and excess * 1e6 >= NOISE_FLOOR_US
+        marker = "❌ slower than" if slower else "✅ not slower than"
+        print(f"{key:<34} {marker} {reference} ({result['min_s'] / base['min_s']:.2f}x)")
+        if slower:
+            failures.append(key)
+    return failures
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for scoring, categorization, merge and serialization")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run_parser.add_argument("--filter", default=None, help="Only benchmarks whose name matches this regex")
+    run_parser.add_argument(
+        "--save",
+        nargs="?",
+        type=Path,
+        const=BASELINE_PATH,
+        default=None,
+        help=f"Write results (default: {BASELINE_PATH})",
+    )
+
+    compare_parser = commands.add_parser("compare", help="Compare against a baseline, exit 1 on regressions")
+    compare_parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    compare_parser.add_argument("--current", type=Path, default=None, help="Saved results (default: run the suite now)")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.2 = 20%%)"
+    )
+    compare_parser.add_argument("--filter", default=None, help="Only benchmarks whose name matches this regex")
+
+    options = parser.parse_args(argv)
+
+    if options.command == "run":
+        document = run_suite(options.sizes, options.filter)
+        if options.save:
+            options.save.parent.mkdir(parents=True, exist_ok=True)
+            options.save.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+            print(f"\n💾 Saved {len(document['results'])} results to {options.save}")
+        return 1 if check_references(document) else 0
+
+    if not options.baseline.exists():
+        print(f"❌ No baseline at {options.baseline} - record one with: python benchmarks.py run --save")
+        return 1
+    baseline = json.loads(options.baseline.read_text(encoding="utf-8"))
+    if options.filter:
+        baseline["results"] = {
+            k: v for k, v in baseline["results"].items() if re.search(options.filter, v["benchmark"])
+        }
+
+    if options.current:
+        current = json.loads(options.current.read_text(encoding="utf-8"))
+    else:
+        sizes = sorted({result["size"] for result in baseline["results"].values()})
+        names = sorted({result["benchmark"] for result in baseline["results"].values()})
+        current = run_suite(sizes, "^(" + "|".join(map(re.escape, names)) + ")$")
+
+    print(f"\nBaseline: {baseline.get('created')} ({baseline.get('commit') or 'unknown commit'})")
+    regressions = compare(baseline, current, options.threshold)
+    regressions += check_references(current)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {options.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\n✅ No regressions beyond {options.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
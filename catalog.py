@@ -0,0 +1,264 @@
+"""
+DIY Video Finder - Video Catalog Store
+======================================
+
+Single source of truth for the curated videos, used by both curators.
+
+- output/catalog.json holds every video keyed by YouTube ID
+  (numeric views, plain JSON strings - no hand-written JS escaping)
+- Membership checks are dict lookups; nothing has to re-parse script.js
+- The `const videos = [...]` array in output/script.js is GENERATED from
+  the catalog (render_script) and only rewritten when it changes
+- On first use an existing script.js is imported once
+- Every domain has its own shard (shard_paths); the primary domain feeds
+  the website, the others get output/<domain>/catalog.json + videos.js
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+OUTPUT_DIR = Path(__file__).parent / "output"
+DEFAULT_CATALOG_PATH = OUTPUT_DIR / "catalog.json"
+DEFAULT_SCRIPT_PATH = OUTPUT_DIR / "script.js"
+
+# Domain whose shard is the website's script.js
+PRIMARY_DOMAIN = "trockenbau"
+
+CATALOG_VERSION = 1
+DEFAULT_CATEGORY = "grundlagen"
+
+# The array is "[];" or ends at the first "];" that starts a line: entries are indented one
+# per line and strings are JSON-escaped, so a "];" inside a title never does
+_VIDEOS_ARRAY = re.compile(r"const videos\s*=\s*\[(?:\]|[\s\S]*?^[ \t]*\]);", re.M)
+_VIEW_SUFFIXES = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+
+def shard_paths(domain: str) -> tuple:
+    """(catalog path, rendered JS path) for a domain's output shard"""
+    if domain == PRIMARY_DOMAIN:
+        return DEFAULT_CATALOG_PATH, DEFAULT_SCRIPT_PATH
+    return OUTPUT_DIR / domain / "catalog.json", OUTPUT_DIR / domain / "videos.js"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write via a temp file + os.replace, so readers never see a half-written file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def format_views(views: int) -> str:
+    """Format view count: 1234567 -> '1.2M'"""
+    if views >= 1_000_000:
+        return f"{views / 1_000_000:.1f}M"
+    elif views >= 1_000:
+        return f"{views / 1_000:.0f}K"
+    return str(views)
+
+
+def parse_views(views) -> int:
+    """Inverse of format_views for legacy/LLM data: '1.2M' -> 1200000"""
+    if isinstance(views, (int, float)):
+        return int(views)
+    text = str(views).strip().upper().replace(",", "").replace(" ", "")
+    multiplier = _VIEW_SUFFIXES.get(text[-1:], 1)
+    if multiplier > 1:
+        text = text[:-1]
+    try:
+        return int(float(text) * multiplier)
+    except ValueError:
+        return 0
+
+
+def _pair(value) -> dict:
+    """Normalize a title/description to {"de", "en"}"""
+    if isinstance(value, dict):
+        de = str(value.get("de", ""))
+        return {"de": de, "en": str(value.get("en") or de)}
+    return {"de": str(value or ""), "en": str(value or "")}
+
+
+def normalize_entry(video: dict) -> dict:
+    """Canonical catalog entry from a script.js / LLM style video dict"""
+    try:
+        rating = round(float(video.get("rating", 0)), 1)
+    except (TypeError, ValueError):
+        rating = 0.0
+    return {
+        "title": _pair(video.get("title")),
+        "description": _pair(video.get("description")),
+        "rating": rating,
+        "views": parse_views(video.get("views", 0)),
+        "category": video.get("category") or DEFAULT_CATEGORY,
+        "channel": video.get("channel") or "Unknown",
+    }
+
+
+def js_object_to_json(text: str) -> str:
+    """Quote the bare keys of a JS object literal so json.loads() accepts it
+
+    Only touches characters outside of string literals, so titles like
+    "Tipps,Tricks: ..." survive unchanged.
+    """
+    out = []
+    i = 0
+    quote = None
+    while i < len(text):
+        char = text[i]
+        if quote:
+            if char == "\\":
+                escaped = text[i : i + 2]
+                out.append("'" if escaped == "\\'" else escaped)
+                i += 2
+                continue
+            if char == quote:
+                quote = None
+                char = '"'
+            elif char == '"':
+                char = '\\"'
+            out.append(char)
+        elif char in "\"'":
+            quote = char
+            out.append('"')
+        elif char.isalpha() or char == "_":
+            start = i
+            while i < len(text) and (text[i].isalnum() or text[i] == "_"):
+                i += 1
+            word = text[start:i]
+            out.append(f'"{word}"' if text[i:].lstrip().startswith(":") else word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+    # Trailing commas before ] or }
+    return re.sub(r",(\s*[}\]])", r"\1", "".join(out))
+
+
+class Catalog:
+    """Curated videos keyed by YouTube ID (insertion order = display order)"""
+
+    def __init__(self, path: Path = DEFAULT_CATALOG_PATH, script_path: Path = DEFAULT_SCRIPT_PATH):
+        self.path = Path(path)
+        self.script_path = Path(script_path)
+        self.videos = {}
+        self._saved_text = None
+
+        if self.path.exists():
+            self._saved_text = self.path.read_text(encoding="utf-8")
+            self.videos = json.loads(self._saved_text).get("videos", {})
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_CATALOG_PATH, script_path: Path = DEFAULT_SCRIPT_PATH) -> "Catalog":
+        """Open the catalog; the first time, import the videos of an existing script.js"""
+        catalog = cls(path, script_path)
+        if not catalog.path.exists() and catalog.script_path.exists():
+            imported = catalog.import_script(catalog.script_path)
+            print(f"📦 Imported {imported} videos from {catalog.script_path.name} into {catalog.path.name}")
+        return catalog
+
+    @classmethod
+    def for_domain(cls, domain: str) -> "Catalog":
+        """Open the output shard of a domain"""
+        return cls.load(*shard_paths(domain))
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self.videos
+
+    def __len__(self) -> int:
+        return len(self.videos)
+
+    def get(self, video_id: str):
+        return self.videos.get(video_id)
+
+    def upsert(self, video_id: str, entry: dict) -> None:
+        """Add or replace a video (a new video goes to the end)"""
+        self.videos[video_id] = normalize_entry(entry)
+
+    def remove(self, video_id: str) -> None:
+        self.videos.pop(video_id, None)
+
+    def clear(self) -> None:
+        self.videos = {}
+
+    def as_list(self) -> list:
+        """Videos as script.js-style dicts (with youtubeId)"""
+        return [{**entry, "youtubeId": video_id} for video_id, entry in self.videos.items()]
+
+    def import_script(self, script_path: Path) -> int:
+        """Add every video of a legacy script.js videos array"""
+        match = _VIDEOS_ARRAY.search(Path(script_path).read_text(encoding="utf-8"))
+        if not match:
+            return 0
+
+        count = 0
+        for line in match.group(0).splitlines():
+            line = line.strip().rstrip(",")
+            if not line.startswith("{"):
+                continue
+            try:
+                video = json.loads(js_object_to_json(line))
+            except json.JSONDecodeError:
+                print(f"⚠️  Skipping unreadable script.js entry: {line[:60]}...")
+                continue
+            if video.get("youtubeId"):
+                self.upsert(video["youtubeId"], video)
+                count += 1
+        return count
+
+    def save(self) -> bool:
+        """Write the catalog atomically; returns False (nothing written) if unchanged"""
+        text = json.dumps({"version": CATALOG_VERSION, "videos": self.videos}, ensure_ascii=False, indent=2) + "\n"
+        if text == self._saved_text:
+            return False
+
+        _write_atomic(self.path, text)
+        self._saved_text = text
+        return True
+
+
+def render_entry(video_id: str, entry: dict) -> str:
+    """One script.js line; every string is JSON-escaped (valid JS)"""
+
+    def q(value) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    title, description = entry["title"], entry["description"]
+    return (
+        f"  {{title:{{de:{q(title['de'])},en:{q(title['en'])}}}"
+        f",description:{{de:{q(description['de'])},en:{q(description['en'])}}}"
+        f",rating:{entry['rating']:.1f},views:{q(format_views(entry['views']))},category:{q(entry['category'])}"
+        f",youtubeId:{q(video_id)},channel:{q(entry['channel'])}}}"
+    )
+
+
+def render_script(catalog: Catalog, script_path: Path | None = None) -> bool:
+    """Regenerate the videos array of the catalog's script; returns False (nothing written) if unchanged"""
+    script_path = Path(script_path or catalog.script_path)
+    content = script_path.read_text(encoding="utf-8") if script_path.exists() else ""
+    lines = [render_entry(video_id, entry) for video_id, entry in catalog.videos.items()]
+    videos_js = "const videos = [\n" + ",\n".join(lines) + "\n];"
+
+    match = _VIDEOS_ARRAY.search(content)
+    if match and match.group(0) == videos_js:
+        return False
+
+    if match:
+        # Function replacement: titles may contain backslashes
+        new_content = _VIDEOS_ARRAY.sub(lambda _: videos_js, content, count=1)
+    else:
+        new_content = videos_js + "\n\n" + content
+
+    # Update comment with date
+    date_str = datetime.now().strftime("%d. %B %Y")
+    new_content = re.sub(
+        r"// KURATIERTE Videos.*",
+        f"// KURATIERTE Videos vom DIY Video Finder ({date_str})",
+        new_content,
+    )
+
+    _write_atomic(script_path, new_content)
+    return True
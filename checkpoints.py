@@ -0,0 +1,73 @@
+"""
+DIY Video Finder - Task Checkpoints
+===================================
+
+Persists the output of every finished CrewAI task of a video_curator.py run,
+so a failure (e.g. a 429 during the design task) costs one task instead of
+the whole five-agent chain:
+
+- The file is rewritten after each task (atomic replace)
+- Retries inside a run continue from the first unfinished task
+- `video_curator.py --resume` does the same for a run that was aborted
+- A checkpoint only applies to a run with the same settings (signature)
+
+Stdlib only; the crew wiring lives in video_curator.py.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_CHECKPOINT_PATH = Path(__file__).parent / ".cache" / "checkpoints" / "video_curator.json"
+
+
+def run_signature(**settings) -> str:
+    """Short hash of the settings that shape the task outputs"""
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class TaskCheckpoints:
+    """Finished task outputs of one run, in pipeline order"""
+
+    def __init__(self, path: Path = DEFAULT_CHECKPOINT_PATH, signature: str = ""):
+        self.path = Path(path)
+        self.signature = signature
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.tasks = []  # [{"name", "agent", "raw", "completed"}]
+
+    def load(self) -> bool:
+        """Take over the saved outputs if they belong to a run with the same signature"""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if data.get("signature") != self.signature:
+            return False
+        self.started = data.get("started", self.started)
+        self.tasks = data.get("tasks", [])
+        return True
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"signature": self.signature, "started": self.started, "tasks": self.tasks}
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def record(self, name: str, agent: str, raw: str) -> None:
+        """Persist the output of a finished task"""
+        self.tasks.append(
+            {"name": name, "agent": agent, "raw": raw, "completed": datetime.now().isoformat(timespec="seconds")}
+        )
+        self._save()
+
+    def completed(self) -> dict:
+        """{task name: saved entry} of every finished task"""
+        return {entry["name"]: entry for entry in self.tasks}
+
+    def clear(self) -> None:
+        """Forget all outputs (fresh run or finished run)"""
+        self.tasks = []
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,569 @@
+"""
+DIY Video Finder - CrewAI Tools
+===============================
+
+The tools the video_curator.py agents call. This module imports crewai, so
+video_curator.py only loads it when a crew is actually built.
+
+Run-specific settings are tool fields (e.g. dry_run, max_videos) instead of
+module globals, so every crew gets tools configured for its own run. Every
+tool call is traced as a "tool" span (telemetry.py).
+"""
+
+import functools
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+from crewai.tools import BaseTool
+
+import telemetry
+import youtube_client
+from catalog import Catalog, js_object_to_json, render_script
+
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+
+
+def traced(run):
+    """Record each call of a tool's _run() as a "tool" span"""
+
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        with telemetry.span("tool", tool=self.name):
+            return run(self, *args, **kwargs)
+
+    return wrapper
+
+
+# =============================================================================
+# MOCK DATA FOR DRY-RUN MODE
+# =============================================================================
+MOCK_VIDEOS = [
+    {"id": "mwEnTFm80-M", "title": "Wand einziehen | HORNBACH Meisterschmiede", "channel": "HORNBACH", "views": "1.2M"},
+    {
+        "id": "obvKgvIv_Vg",
+        "title": "Erstellung von Montagedecken - Rigips",
+        "channel": "SAINT-GOBAIN RIGIPS",
+        "views": "890K",
+    },
+    {
+        "id": "uoU_BlY_2Lw",
+        "title": "Erstellung von Türöffnungen - Rigips",
+        "channel": "SAINT-GOBAIN RIGIPS",
+        "views": "650K",
+    },
+    {
+        "id": "i7jZ9suB9y8",
+        "title": "Vorsatzschalen mit Unterkonstruktion",
+        "channel": "SAINT-GOBAIN RIGIPS",
+        "views": "720K",
+    },
+    {"id": "abc123test", "title": "Trockenbau Grundlagen für Anfänger", "channel": "Handwerker Tips", "views": "450K"},
+    {"id": "def456test", "title": "Rigips Decke abhängen Anleitung", "channel": "DIY Academy", "views": "380K"},
+]
+
+MOCK_VIDEO_DETAILS = {
+    "mwEnTFm80-M": {
+        "title": "Wand einziehen | HORNBACH Meisterschmiede",
+        "channel": "HORNBACH",
+        "description": "Professionelle Anleitung zum Errichten einer Trockenbauwand mit Metallständerwerk.",
+        "tags": ["Trockenbau", "Rigips", "Wand", "DIY"],
+        "views": "1.2M",
+        "viewCount": 1200000,
+    },
+    "obvKgvIv_Vg": {
+        "title": "Erstellung von Montagedecken - Rigips",
+        "channel": "SAINT-GOBAIN RIGIPS",
+        "description": "Offizielle RIGIPS Anleitung für abgehängte Decken nach DIN 18181.",
+        "tags": ["Decke", "Rigips", "Montage"],
+        "views": "890K",
+        "viewCount": 890000,
+    },
+    "uoU_BlY_2Lw": {
+        "title": "Erstellung von Türöffnungen - Rigips",
+        "channel": "SAINT-GOBAIN RIGIPS",
+        "description": "Türzargen und Öffnungen in Trockenbauwänden fachgerecht erstellen.",
+        "tags": ["Tür", "Öffnung", "Trockenbau"],
+        "views": "650K",
+        "viewCount": 650000,
+    },
+    "i7jZ9suB9y8": {
+        "title": "Vorsatzschalen mit Unterkonstruktion",
+        "channel": "SAINT-GOBAIN RIGIPS",
+        "description": "Vorsatzschalen zur Wandverkleidung mit CW/UW-Profilen.",
+        "tags": ["Vorsatzschale", "Dämmung", "Wand"],
+        "views": "720K",
+        "viewCount": 720000,
+    },
+}
+
+
+# =============================================================================
+# YOUTUBE SEARCH TOOL
+# =============================================================================
+class YouTubeSearchTool(BaseTool):
+    """Search YouTube for real drywall tutorial videos"""
+
+    name: str = "YouTube Video Search"
+    description: str = (
+        """Search YouTube for Trockenbau videos. Input: search query. Returns: JSON with videos (up to 15 results)."""
+    )
+    dry_run: bool = False  # Return mock videos instead of calling the API
+    max_videos: int = 10  # Mock results per search in dry-run mode
+
+    @traced
+    def _run(self, query: str) -> str:
+        # DRY-RUN: Return mock data
+        if self.dry_run:
+            return json.dumps({"videos": MOCK_VIDEOS[: self.max_videos], "mock": True}, ensure_ascii=False)
+
+        if not YOUTUBE_API_KEY:
+            return json.dumps({"error": "YOUTUBE_API_KEY not set"})
+
+        try:
+            youtube = youtube_client.get_youtube(YOUTUBE_API_KEY)
+
+            search_response = youtube_client.execute(
+                youtube.search().list(
+                    q=query,
+                    part="id,snippet",
+                    type="video",
+                    maxResults=15,  # More results to find new videos (video_curator.RESULTS_PER_SEARCH)
+                    order="relevance",  # Better for finding quality tutorials
+                    relevanceLanguage="de",
+                    videoDuration="medium",  # Filter out very short clips
+                )
+            )
+
+            videos = []
+            video_ids = []
+
+            for item in search_response.get("items", []):
+                video_id = item["id"]["videoId"]
+                video_ids.append(video_id)
+                videos.append(
+                    {
+                        "id": video_id,
+                        "title": item["snippet"]["title"][:60],  # Truncate
+                        "channel": item["snippet"]["channelTitle"][:30],
+                    }
+                )
+
+            # Get view counts
+            if video_ids:
+                stats_response = youtube_client.execute(
+                    youtube.videos().list(part="statistics", id=",".join(video_ids))
+                )
+
+                for stats_item in stats_response.get("items", []):
+                    vid_id = stats_item["id"]
+                    for video in videos:
+                        if video["id"] == vid_id:
+                            views = int(stats_item.get("statistics", {}).get("viewCount", 0))
+                            if views >= 1000000:
+                                video["views"] = f"{views // 1000000}M"
+                            elif views >= 1000:
+                                video["views"] = f"{views // 1000}K"
+                            else:
+                                video["views"] = str(views)
+                            break
+
+            return json.dumps({"videos": videos}, ensure_ascii=False)
+
+        except Exception as e:
+            return json.dumps({"error": str(e)[:100]})
+
+
+class LoadExistingDataTool(BaseTool):
+    """Load existing video data from the catalog (output/catalog.json)"""
+
+    name: str = "Load Existing Videos"
+    description: str = "Load current video data from the website. Returns JSON with video count and IDs."
+
+    @traced
+    def _run(self, _: str = "") -> str:
+        try:
+            catalog = Catalog.load()
+            if catalog.videos:
+                summary = [{"id": vid, "cat": entry["category"]} for vid, entry in catalog.videos.items()]
+                return json.dumps(
+                    {
+                        "count": len(catalog),
+                        "existing": summary,
+                        "message": "Diese Video-IDs bereits auf der Website - keine Duplikate hinzufügen!",
+                    },
+                    ensure_ascii=False,
+                )
+            return json.dumps({"count": 0, "message": "Keine existierenden Videos gefunden"})
+        except Exception as e:
+            return json.dumps({"error": str(e)[:50]})
+
+
+class SaveStylesTool(BaseTool):
+    """Save CSS styles directly to output/styles.css"""
+
+    name: str = "Save Styles"
+    description: str = """Save CSS styles directly to output/styles.css.
+    Input: Complete CSS code
+    Returns: Confirmation message."""
+    dry_run: bool = False  # Don't write files
+
+    @traced
+    def _run(self, css_code: str) -> str:
+        # DRY-RUN: Don't write files
+        if self.dry_run:
+            return "🧪 DRY-RUN: Would save CSS to output/styles.css (no file written)"
+
+        try:
+            output_dir = Path(__file__).parent / "output"
+            output_dir.mkdir(exist_ok=True)
+
+            styles_path = output_dir / "styles.css"
+
+            with open(styles_path, "w", encoding="utf-8") as f:
+                f.write(css_code)
+
+            return "✅ Updated output/styles.css"
+
+        except Exception as e:
+            return f"❌ Error saving styles: {str(e)}"
+
+
+# Maximum videos per category
+MAX_VIDEOS_PER_CATEGORY = 5
+
+
+class SaveVideoDataTool(BaseTool):
+    """Merge curated videos into the catalog and regenerate output/script.js"""
+
+    name: str = "Save Video Data"
+    description: str = """Save the video data to the website (output/script.js).
+    Input: JavaScript code starting with 'const videos = [...]'
+    Returns: Confirmation message.
+
+    Smart features:
+    - Merges new videos with existing ones (no duplicates)
+    - Keeps max 5 videos per category (subdomain)
+    - Sorts by rating (best first)"""
+    dry_run: bool = False  # Don't write files
+
+    def _parse_videos_from_js(self, js_content: str) -> list:
+        """Extract video objects from JavaScript code or JSON"""
+        import json
+        import re
+
+        content = js_content.strip()
+
+        # Try 1: Direct JSON array
+        if content.startswith("["):
+            try:
+                return json.loads(content)
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        # Try 2: JSON with videos key
+        if content.startswith("{"):
+            try:
+                data = json.loads(content)
+                if "videos" in data:
+                    return data["videos"]
+                return [data] if "youtubeId" in data else []
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        # Try 3: Find const videos = [...]; - use greedy match to ];
+        match = re.search(r"const videos\s*=\s*(\[[\s\S]*\]);", content)
+        if match:
+            array_str = match.group(1)
+        else:
+            # Try 4: Find any array starting with [ and containing youtubeId
+            match = re.search(r"(\[[\s\S]*\])", content)
+            if match and "youtubeId" in match.group(1):
+                array_str = match.group(1)
+            else:
+                return []
+
+        # Convert JS object syntax (bare keys, single quotes, trailing commas) to JSON
+        try:
+            return json.loads(js_object_to_json(array_str))
+        except json.JSONDecodeError as e:
+            print(f"JSON parse error: {e}")
+            # Fallback: extract individual video objects
+            videos = []
+            # Find all youtubeId values and build minimal objects
+            for m in re.finditer(r'youtubeId["\s:]+["\']?([a-zA-Z0-9_-]+)["\']?', content):
+                vid = m.group(1)
+                # Try to find associated data
+                videos.append(
+                    {
+                        "youtubeId": vid,
+                        "title": {"de": f"Video {vid}", "en": f"Video {vid}"},
+                        "description": {"de": "", "en": ""},
+                        "category": "grundlagen",
+                        "rating": 4.0,
+                        "views": "0",
+                        "channel": "Unknown",
+                    }
+                )
+            return videos
+
+    def _merge_videos(self, existing: list, new_videos: list) -> list:
+        """Merge videos, remove duplicates, sort by rating, limit per category"""
+        # Build dict by youtubeId to remove duplicates (new videos override existing)
+        video_map = {}
+
+        # Add existing videos
+        for v in existing:
+            vid = v.get("youtubeId")
+            if vid:
+                video_map[vid] = v
+
+        # Add/override with new videos
+        for v in new_videos:
+            vid = v.get("youtubeId")
+            if vid:
+                video_map[vid] = v
+
+        # Group by category
+        by_category = {}
+        for v in video_map.values():
+            cat = v.get("category", "grundlagen")
+            if cat not in by_category:
+                by_category[cat] = []
+            by_category[cat].append(v)
+
+        # Sort each category by rating (descending) and limit to MAX_VIDEOS_PER_CATEGORY
+        result = []
+        for _cat, videos in by_category.items():
+            # Sort by rating (best first)
+            sorted_videos = sorted(videos, key=lambda x: float(x.get("rating", 0)), reverse=True)
+            # Keep only top N per category
+            top_videos = sorted_videos[:MAX_VIDEOS_PER_CATEGORY]
+            result.extend(top_videos)
+
+        # Final sort: by rating overall
+        result.sort(key=lambda x: float(x.get("rating", 0)), reverse=True)
+
+        return result
+
+    @traced
+    def _run(self, js_code: str) -> str:
+        # DRY-RUN: Don't write files
+        if self.dry_run:
+            video_count = js_code.count("youtubeId")
+            return f"🧪 DRY-RUN: Would process {video_count} new videos (no file written)"
+
+        try:
+            catalog = Catalog.load()
+            existing_videos = catalog.as_list()
+
+            # Parse new videos from input
+            new_videos = self._parse_videos_from_js(js_code)
+
+            if not new_videos:
+                # Show first 500 chars of input for debugging
+                preview = js_code[:500].replace("\n", " ")
+                return f"❌ Error: Could not parse any videos from input. Preview: {preview}..."
+
+            # Merge: deduplicate, sort by rating, limit per category
+            merged_videos = self._merge_videos(existing_videos, new_videos)
+
+            # Store in the catalog, regenerate script.js from it
+            catalog.clear()
+            for v in merged_videos:
+                catalog.upsert(v["youtubeId"], v)
+            catalog.save()
+            render_script(catalog)
+
+            # Stats
+            new_count = len(new_videos)
+            existing_count = len(existing_videos)
+            merged_count = len(merged_videos)
+
+            # Count per category
+            cat_counts = {}
+            for v in merged_videos:
+                cat = v.get("category", "other")
+                cat_counts[cat] = cat_counts.get(cat, 0) + 1
+
+            cat_summary = ", ".join(f"{k}:{v}" for k, v in sorted(cat_counts.items()))
+
+            return f"✅ Merged videos: {existing_count} existing + {new_count} new → {merged_count} total (max {MAX_VIDEOS_PER_CATEGORY}/category)\n📊 Per category: {cat_summary}"
+
+        except Exception as e:
+            import traceback
+
+            return f"❌ Error saving: {str(e)}\n{traceback.format_exc()}"
+
+
+# =============================================================================
+# VIDEO DETAILS (batched + memoized per run)
+# =============================================================================
+
+# Video ID -> details (None = not found); filled by the tools and by the
+# prefetch after the research task, cleared per run by reset_details_memo()
+_details_memo = {}
+_details_lock = threading.Lock()
+
+# IDs as the research task writes them: "id": "...", "videoId": "...", "youtubeId": "..."
+_VIDEO_ID_FIELD = re.compile(r"[\"']?\b(?:id|videoId|youtubeId)\b[\"']?\s*:\s*[\"']([A-Za-z0-9_-]{6,})[\"']")
+
+
+def reset_details_memo() -> None:
+    with _details_lock:
+        _details_memo.clear()
+
+
+def _mock_details(video_id: str) -> dict:
+    if video_id in MOCK_VIDEO_DETAILS:
+        return {"id": video_id, **MOCK_VIDEO_DETAILS[video_id], "mock": True}
+    return {
+        "id": video_id,
+        "title": f"Mock Video {video_id}",
+        "channel": "Mock Channel",
+        "description": "Mock description for testing",
+        "tags": ["mock"],
+        "views": "100K",
+        "viewCount": 100000,
+        "mock": True,
+    }
+
+
+def _details_from_item(item: dict) -> dict:
+    """The fields the review needs from one videos.list item"""
+    snippet = item.get("snippet", {})
+    stats = item.get("statistics", {})
+
+    # Views formatieren
+    views = int(stats.get("viewCount", 0))
+    if views >= 1000000:
+        views_formatted = f"{views // 1000000}M"
+    elif views >= 1000:
+        views_formatted = f"{views // 1000}K"
+    else:
+        views_formatted = str(views)
+
+    return {
+        "id": item["id"],
+        "title": snippet.get("title", ""),
+        "channel": snippet.get("channelTitle", ""),
+        "description": snippet.get("description", "")[:500],  # Beschreibung kürzen für Token-Limit
+        "tags": snippet.get("tags", [])[:10],  # Nur erste 10 Tags
+        "duration": item.get("contentDetails", {}).get("duration", ""),
+        "views": views_formatted,
+        "viewCount": views,
+        "likeCount": stats.get("likeCount", 0),
+    }
+
+
+def fetch_video_details(video_ids: list, dry_run: bool = False) -> dict:
+    """{id: details or None} for every ID, in input order
+
+    Memoized IDs are free; the rest go out as videos.list requests of up to
+    50 IDs each (1 quota unit per request).
+    """
+    ids = list(dict.fromkeys(vid.strip() for vid in video_ids if vid.strip()))
+    with _details_lock:
+        missing = [vid for vid in ids if vid not in _details_memo]
+    telemetry.count("video_details_lookups_total", len(ids) - len(missing), result="memo")
+    telemetry.count("video_details_lookups_total", len(missing), result="fetched")
+
+    if missing:
+        if dry_run:
+            fetched = {vid: _mock_details(vid) for vid in missing}
+        else:
+            youtube = youtube_client.get_youtube(YOUTUBE_API_KEY)
+            fetched = dict.fromkeys(missing)
+            batch_size = youtube_client.VIDEOS_LIST_MAX_IDS
+            for offset in range(0, len(missing), batch_size):
+                response = youtube_client.execute(
+                    youtube.videos().list(
+                        part="snippet,contentDetails,statistics", id=",".join(missing[offset : offset + batch_size])
+                    )
+                )
+                for item in response.get("items", []):
+                    fetched[item["id"]] = _details_from_item(item)
+        with _details_lock:
+            _details_memo.update(fetched)
+
+    with _details_lock:
+        return {vid: _details_memo.get(vid) for vid in ids}
+
+
+def video_ids_in(text: str) -> list:
+    """Video IDs from a task output (JSON-ish text with id/videoId/youtubeId fields)"""
+    return list(dict.fromkeys(_VIDEO_ID_FIELD.findall(text or "")))
+
+
+def prefetch_video_details(research_output: str, dry_run: bool = False) -> int:
+    """Fetch the details of every researched video in one batch before the review starts"""
+    video_ids = video_ids_in(research_output)
+    if not video_ids:
+        return 0
+    try:
+        details = fetch_video_details(video_ids, dry_run)
+    except Exception as e:
+        print(f"⚠️  Prefetching video details failed: {str(e)[:100]}")
+        return 0
+    found = sum(1 for entry in details.values() if entry)
+    print(f"📦 Prefetched details of {found}/{len(video_ids)} researched videos")
+    return found
+
+
+class GetVideoDetailsBatchTool(BaseTool):
+    """Get the details of many videos with one call (one videos.list request per 50 IDs)"""
+
+    name: str = "Get Video Details Batch"
+    description: str = """Ruft die Details MEHRERER YouTube-Videos mit EINEM Aufruf ab.
+    Input: alle Video-IDs, kommagetrennt (z.B. "mwEnTFm80-M, obvKgvIv_Vg, uoU_BlY_2Lw")
+    Returns: JSON mit Titel, Beschreibung, Kanal, Tags, Views je Video - wichtig für die Qualitätsprüfung."""
+    dry_run: bool = False  # Return mock details instead of calling the API
+
+    @traced
+    def _run(self, video_ids: str) -> str:
+        ids = [vid for vid in re.split(r"[\s,;\[\]\"']+", video_ids) if vid]
+        if not ids:
+            return json.dumps({"error": "Keine Video-IDs angegeben"})
+        if not self.dry_run and not YOUTUBE_API_KEY:
+            return json.dumps({"error": "YOUTUBE_API_KEY not set"})
+
+        try:
+            details = fetch_video_details(ids, self.dry_run)
+        except Exception as e:
+            return json.dumps({"error": str(e)[:100]})
+
+        return json.dumps(
+            {
+                "videos": [entry for entry in details.values() if entry],
+                "not_found": [vid for vid, entry in details.items() if entry is None],
+            },
+            ensure_ascii=False,
+        )
+
+
+class GetVideoDetailsTool(BaseTool):
+    """Get detailed information about a YouTube video for quality review"""
+
+    name: str = "Get Video Details"
+    description: str = """Ruft detaillierte Informationen zu einem YouTube-Video ab.
+    Input: YouTube Video ID (z.B. "mwEnTFm80-M")
+    Returns: Titel, Beschreibung, Kanal, Tags, Views - wichtig für die Qualitätsprüfung."""
+    dry_run: bool = False  # Return mock details instead of calling the API
+
+    @traced
+    def _run(self, video_id: str) -> str:
+        vid_id = video_id.strip()
+
+        if not self.dry_run and not YOUTUBE_API_KEY:
+            return json.dumps({"error": "YOUTUBE_API_KEY not set"})
+
+        try:
+            details = fetch_video_details([vid_id], self.dry_run).get(vid_id)
+            if details is None:
+                return json.dumps({"error": f"Video {vid_id} not found"})
+            return json.dumps(details, ensure_ascii=False)
+
+        except Exception as e:
+            return json.dumps({"error": str(e)[:100]})
@@ -0,0 +1,156 @@
+"""
+DIY Video Finder - Domain Configurations
+========================================
+
+Every file in domains/ describes one topic (the file name is the domain key):
+
+    domains/trockenbau.toml   ->  --domain trockenbau
+
+TOML, JSON and YAML (needs PyYAML) are supported. Files are validated into
+frozen DomainConfig objects, shared by video_curator.py and
+video_curator_v2.py. Each config carries the hash of its source file, so
+compiled artifacts (matchers, indexes) can be cached on disk and are
+rebuilt only when the file changes.
+
+Adding a topic = adding a file, e.g. domains/fliesen.toml.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+DOMAINS_DIR = Path(__file__).parent / "domains"
+DOMAIN_SUFFIXES = (".toml", ".json", ".yaml", ".yml")
+
+
+class DomainConfigError(ValueError):
+    """Raised when a domain file is missing, unreadable or invalid"""
+
+
+@dataclass(frozen=True)
+class Label:
+    de: str
+    en: str
+
+
+@dataclass(frozen=True)
+class Category:
+    id: str
+    label: Label
+    keywords: tuple
+    description: str = ""  # Optional hint for LLM prompts
+
+
+@dataclass(frozen=True)
+class DomainConfig:
+    """One validated, immutable domain definition"""
+
+    key: str
+    name: Label
+    queries: tuple
+    trust_channels: tuple
+    categories: tuple  # Category, in file order (first category wins ties)
+    clickbait_patterns: tuple
+    source_hash: str  # sha256 of the source file
+
+    @property
+    def category_ids(self) -> tuple:
+        return tuple(category.id for category in self.categories)
+
+
+def _parse(path: Path, raw: bytes) -> dict:
+    """Decode a domain file according to its suffix"""
+    suffix = path.suffix.lower()
+    try:
+        if suffix == ".toml":
+            try:
+                import tomllib
+            except ImportError:  # Python 3.10
+                import tomli as tomllib
+            return tomllib.loads(raw.decode("utf-8"))
+        if suffix == ".json":
+            return json.loads(raw)
+        try:
+            import yaml
+        except ImportError as e:
+            raise DomainConfigError(f"{path.name}: YAML domain files need PyYAML (pip install pyyaml)") from e
+        return yaml.safe_load(raw) or {}
+    except DomainConfigError:
+        raise
+    except Exception as e:
+        raise DomainConfigError(f"{path.name}: cannot parse ({e})") from e
+
+
+def _strings(data: dict, field: str, where: str, required: bool = True) -> tuple:
+    """A list of non-empty strings"""
+    value = data.get(field, [] if not required else None)
+    if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+        raise DomainConfigError(f"{where}: '{field}' must be a list of non-empty strings")
+    if required and not value:
+        raise DomainConfigError(f"{where}: '{field}' must not be empty")
+    return tuple(value)
+
+
+def _label(data, where: str) -> Label:
+    if not isinstance(data, dict) or not all(isinstance(data.get(lang), str) for lang in ("de", "en")):
+        raise DomainConfigError(f"{where}: needs 'de' and 'en' strings")
+    return Label(de=data["de"], en=data["en"])
+
+
+def validate(key: str, data: dict, source_hash: str = "") -> DomainConfig:
+    """Turn a decoded domain file into a DomainConfig (raises DomainConfigError)"""
+    if not isinstance(data, dict):
+        raise DomainConfigError(f"{key}: top level must be a table/object")
+
+    categories = data.get("categories", {})
+    if not isinstance(categories, dict):
+        raise DomainConfigError(f"{key}: 'categories' must be a table of category IDs")
+
+    return DomainConfig(
+        key=key,
+        name=_label(data.get("name"), f"{key}.name"),
+        queries=_strings(data, "queries", key),
+        trust_channels=_strings(data, "trust_channels", key, required=False),
+        categories=tuple(
+            Category(
+                id=cat_id,
+                label=_label(cat_data, f"{key}.categories.{cat_id}"),
+                keywords=_strings(cat_data, "keywords", f"{key}.categories.{cat_id}"),
+                description=str(cat_data.get("description", "")),
+            )
+            for cat_id, cat_data in categories.items()
+        ),
+        clickbait_patterns=_strings(data, "clickbait_patterns", key, required=False),
+        source_hash=source_hash,
+    )
+
+
+def load_domain_file(path: Path) -> DomainConfig:
+    """Read and validate one domain file"""
+    path = Path(path)
+    try:
+        raw = path.read_bytes()
+    except OSError as e:
+        raise DomainConfigError(f"{path.name}: {e}") from e
+    return validate(path.stem, _parse(path, raw), hashlib.sha256(raw).hexdigest())
+
+
+def load_domains(directory: Path = DOMAINS_DIR) -> dict:
+    """All domains in `directory` as {key: DomainConfig}, sorted by key"""
+    paths = sorted(p for p in Path(directory).glob("*") if p.suffix.lower() in DOMAIN_SUFFIXES)
+    domains = {}
+    for path in paths:
+        if path.stem in domains:
+            raise DomainConfigError(f"{path.name}: domain '{path.stem}' is defined twice")
+        domains[path.stem] = load_domain_file(path)
+    return domains
+
+
+def load_domain(key: str, directory: Path = DOMAINS_DIR) -> DomainConfig:
+    """One domain by key (file name without suffix)"""
+    for suffix in DOMAIN_SUFFIXES:
+        path = Path(directory) / f"{key}{suffix}"
+        if path.exists():
+            return load_domain_file(path)
+    raise DomainConfigError(f"Unknown domain: {key} (no file in {directory})")
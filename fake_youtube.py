@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+DIY Video Finder - Local YouTube Data API Stand-In
+==================================================
+
+Serves search.list, videos.list and channels.list from a synthetic catalog,
+so both curators (and loadgen.py) can run at scale without network access.
+
+- Catalogs of any size (10k ... 1M+ videos) cost no memory: video i is
+  generated from (seed, i) on demand, so every response is reproducible
+- Titles, descriptions and channels come from a domain file (domains/), so
+  scoring and categorization see realistic input
+- Injected latency (+ jitter), 500 backendError and 403 quotaExceeded
+  responses, and an optional server-side quota limit in API units
+
+Usage:
+    python fake_youtube.py --videos 100000 --latency-ms 80 --error-rate 0.01
+
+    export YOUTUBE_API_ENDPOINT=http://127.0.0.1:8765/
+    export YOUTUBE_API_KEY=fake          # any value, the key is not checked
+    python video_curator_v2.py --dry-run --skip-llm
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from quota import cost_of
+
+DEFAULT_PORT = 8765
+DEFAULT_VIDEOS = 100_000
+
+# search.list stops paging after this many results per query (like the real API)
+RESULTS_PER_QUERY = 500
+SEARCH_MAX_RESULTS = 50
+
+# Share of videos uploaded by one of the domain's trusted channels
+TRUSTED_SHARE = 0.15
+CLICKBAIT_SHARE = 0.05
+CHANNELS = 2_000
+
+_ID_PREFIX = "fk"  # Fake IDs: "fk" + 9 digits = 11 characters, like real ones
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_TITLE_TEMPLATES = (
+    "{Keyword} Anleitung",
+    "{Keyword} selber machen - Schritt für Schritt",
+    "So gelingt {keyword}: Profi-Tipps",
+    "{Keyword} für Anfänger | {domain}",
+    "{domain}: {keyword} richtig gemacht",
+    "{Keyword} in 10 Minuten erklärt",
+)
+_CLICKBAIT_PREFIXES = ("KRASS! ", "Dieser Trick: ", "UNFASSBAR - ", "Niemand kennt das: ")
+_GENERIC_KEYWORDS = ("grundlagen", "werkzeug", "material", "reparatur", "montage")
+
+
+# =============================================================================
+# SYNTHETIC CATALOG
+# =============================================================================
+
+
+class SyntheticCatalog:
+    """Deterministic fake videos; nothing is stored, video i is rebuilt from (seed, i)"""
+
+    def __init__(self, size: int, domain_config=None, seed: int = 0):
+        if size < 1:
+            raise ValueError("catalog size must be at least 1")
+        self.size = size
+        self.seed = seed
+        self.domain_name = domain_config.name.de if domain_config else "Heimwerken"
+        if domain_config and domain_config.categories:
+            self.keywords = tuple(kw for category in domain_config.categories for kw in category.keywords)
+        else:
+            self.keywords = _GENERIC_KEYWORDS
+        self.trusted_channels = tuple(domain_config.trust_channels) if domain_config else ()
+
+        # Search results walk the catalog with a stride coprime to its size
+        self._strides = [p for p in (7919, 104_729, 1_299_709, 15_485_863) if size % p]
+
+    def video_id(self, index: int) -> str:
+        return f"{_ID_PREFIX}{index:09d}"
+
+    def index_of(self, video_id: str) -> int | None:
+        """Catalog index of a fake ID (None if unknown)"""
+        if len(video_id) != 11 or not video_id.startswith(_ID_PREFIX) or not video_id[2:].isdigit():
+            return None
+        index = int(video_id[2:])
+        return index if index < self.size else None
+
+    def _rng(self, *salt) -> random.Random:
+        return random.Random(zlib.crc32(repr((self.seed, *salt)).encode()))
+
+    def _channel(self, rng: random.Random) -> tuple:
+        """(channel ID, channel title)"""
+        if self.trusted_channels and rng.random() < TRUSTED_SHARE:
+            number = rng.randrange(len(self.trusted_channels))
+            return f"UCfaketrusted{number:011d}", self.trusted_channels[number]
+        number = rng.randrange(CHANNELS)
+        return f"UCfakechannel{number:011d}", f"DIY Kanal {number}"
+
+    def video(self, index: int) -> dict:
+        """The videos.list item (snippet, statistics, contentDetails) for video `index`"""
+        rng = self._rng("video", index)
+        keyword = rng.choice(self.keywords)
+        title = rng.choice(_TITLE_TEMPLATES).format(
+            keyword=keyword, Keyword=keyword[:1].upper() + keyword[1:], domain=self.domain_name
+        )
+        if rng.random() < CLICKBAIT_SHARE:
+            title = rng.choice(_CLICKBAIT_PREFIXES) + title
+        channel_id, channel_title = self._channel(rng)
+
+        views = min(int(rng.lognormvariate(10, 2)), 50_000_000)
+        minutes = max(0, int(rng.lognormvariate(2.3, 0.7)))
+        video_id = self.video_id(index)
+        published = _EPOCH - timedelta(days=rng.randrange(3650), seconds=rng.randrange(86_400))
+
+        return {
+            "kind": "youtube#video",
+            "id": video_id,
+            "snippet": {
+                "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "channelId": channel_id,
+                "title": title,
+                "description": (
+                    f"{title}. In diesem Video zeigen wir {keyword} im Detail: Material, Werkzeug und "
+                    f"typische Fehler. Mehr zum Thema {self.domain_name} auf unserem Kanal."
+                ),
+                "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                "channelTitle": channel_title,
+                "tags": [keyword, self.domain_name.lower(), "diy", "anleitung"],
+                "defaultAudioLanguage": "de",
+            },
+            "statistics": {
+                "viewCount": str(views),
+                "likeCount": str(int(views * rng.uniform(0.005, 0.05))),
+                "commentCount": str(int(views * rng.uniform(0.0005, 0.005))),
+            },
+            "contentDetails": {"duration": f"PT{minutes}M{rng.randrange(60)}S"},
+        }
+
+    def search(self, query: str, max_results: int = 5, page_token: str | None = None) -> dict:
+        """One search.list page; each query walks its own reproducible slice of the catalog"""
+        rng = self._rng("search", query.strip().lower())
+        start = rng.randrange(self.size)
+        stride = rng.choice(self._strides) if self._strides else 1
+        total = min(self.size, RESULTS_PER_QUERY)
+
+        offset = int(page_token[1:]) if page_token and page_token[1:].isdigit() else 0
+        max_results = max(0, min(max_results, SEARCH_MAX_RESULTS))
+        positions = range(offset, min(offset + max_results, total))
+
+        items = []
+        for position in positions:
+            index = (start + position * stride) % self.size
+            snippet = self.video(index)["snippet"]
+            items.append(
+                {
+                    "kind": "youtube#searchResult",
+                    "id": {"kind": "youtube#video", "videoId": self.video_id(index)},
+                    "snippet": {key: snippet[key] for key in ("publishedAt", "channelId", "title", "channelTitle")},
+                }
+            )
+
+        response = {
+            "kind": "youtube#searchListResponse",
+            "regionCode": "DE",
+            "pageInfo": {"totalResults": total, "resultsPerPage": max_results},
+            "items": items,
+        }
+        if positions and positions.stop < total:
+            response["nextPageToken"] = f"p{positions.stop}"
+        return response
+
+    def videos(self, video_ids: list, parts: set) -> dict:
+        """videos.list for comma-separated IDs; unknown IDs are left out like on YouTube"""
+        items = []
+        for video_id in video_ids:
+            index = self.index_of(video_id)
+            if index is None:
+                continue
+            video = self.video(index)
+            items.append({key: value for key, value in video.items() if key in ("kind", "id") or key in parts})
+        return {"kind": "youtube#videoListResponse", "pageInfo": {"totalResults": len(items)}, "items": items}
+
+    def channels(self, channel_ids: list) -> dict:
+        """channels.list (snippet + statistics) for fake channel IDs"""
+        items = []
+        for channel_id in channel_ids:
+            number = channel_id[-11:]
+            if not channel_id.startswith("UCfake") or not number.isdigit():
+                continue
+            if channel_id.startswith("UCfaketrusted") and int(number) < len(self.trusted_channels):
+                title = self.trusted_channels[int(number)]
+            else:
+                title = f"DIY Kanal {int(number)}"
+            rng = self._rng("channel", channel_id)
+            items.append(
+                {
+                    "kind": "youtube#channel",
+                    "id": channel_id,
+                    "snippet": {"title": title},
+                    "statistics": {
+                        "subscriberCount": str(int(rng.lognormvariate(9, 2))),
+                        "videoCount": str(rng.randrange(10, 2_000)),
+                    },
+                }
+            )
+        return {"kind": "youtube#channelListResponse", "items": items}
+
+
+# =============================================================================
+# FAULT INJECTION + HTTP SERVER
+# =============================================================================
+
+
+@dataclass
+class Faults:
+    """What the server does to requests besides answering them"""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0  # Uniform +/- around latency_ms
+    error_rate: float = 0.0  # Share of 500 backendError responses
+    quota_error_rate: float = 0.0  # Share of 403 quotaExceeded responses
+    quota_limit: int | None = None  # Units until every call gets 403 quotaExceeded
+
+
+def _error_body(code: int, reason: str, message: str) -> dict:
+    domain = "youtube.quota" if reason == "quotaExceeded" else "global"
+    return {"error": {"code": code, "message": message, "errors": [{"reason": reason, "domain": domain}]}}
+
+
+class FakeYouTubeServer:
+    """Threaded HTTP server answering like youtube/v3 (use as a context manager)"""
+
+    ROUTES = {
+        "/youtube/v3/search": "youtube.search.list",
+        "/youtube/v3/videos": "youtube.videos.list",
+        "/youtube/v3/channels": "youtube.channels.list",
+    }
+
+    def __init__(self, catalog: SyntheticCatalog, faults: Faults | None = None, host="127.0.0.1", port=0, seed=0):
+        self.catalog = catalog
+        self.faults = faults or Faults()
+        self.units_used = 0
+        self.stats = {method: {"calls": 0, "errors": 0, "quota_errors": 0} for method in self.ROUTES.values()}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Base URL for YOUTUBE_API_ENDPOINT"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "FakeYouTubeServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-youtube", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _fault(self, method_id: str):
+        """(status, body) of an injected failure, or None; charges quota like the real API"""
+        faults = self.faults
+        with self._lock:
+            stats = self.stats[method_id]
+            stats["calls"] += 1
+            roll = self._rng.random()
+            cost = cost_of(method_id)
+            if (faults.quota_limit is not None and self.units_used + cost > faults.quota_limit) or (
+                roll < faults.quota_error_rate
+            ):
+                stats["quota_errors"] += 1
+                return 403, _error_body(
+                    403, "quotaExceeded", "The request cannot be completed because you have exceeded your quota."
+                )
+            self.units_used += cost
+            if roll < faults.quota_error_rate + faults.error_rate:
+                stats["errors"] += 1
+                return 500, _error_body(500, "backendError", "Backend Error")
+        return None
+
+    def _delay(self) -> float:
+        faults = self.faults
+        if not faults.latency_ms and not faults.jitter_ms:
+            return 0.0
+        with self._lock:
+            jitter = self._rng.uniform(-faults.jitter_ms, faults.jitter_ms)
+        return max(0.0, faults.latency_ms + jitter) / 1000
+
+    def respond(self, path: str, query: str) -> tuple:
+        """(status, body) for a GET request"""
+        if path == "/stats":
+            with self._lock:
+                return 200, {"units_used": self.units_used, "endpoints": self.stats}
+
+        method_id = self.ROUTES.get(path)
+        if method_id is None:
+            return 404, _error_body(404, "notFound", f"Unknown path: {path}")
+
+        time.sleep(self._delay())
+        fault = self._fault(method_id)
+        if fault is not None:
+            return fault
+
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        ids = [value for value in params.get("id", "").split(",") if value]
+        if method_id == "youtube.search.list":
+            return 200, self.catalog.search(
+                params.get("q", ""), int(params.get("maxResults", 5)), params.get("pageToken")
+            )
+        if method_id == "youtube.videos.list":
+            return 200, self.catalog.videos(ids, set(params.get("part", "snippet").split(",")))
+        return 200, self.catalog.channels(ids)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the pooled client connections
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, body = server.respond(url.path, url.query)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # One line per request would drown everything else
+
+        return Handler
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """--latency-ms, --jitter-ms, --error-rate, --quota-error-rate, --quota-limit"""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request (default: 0)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 500 backendError responses")
+    parser.add_argument("--quota-error-rate", type=float, default=0.0, help="Share of 403 quotaExceeded responses")
+    parser.add_argument(
+        "--quota-limit", type=int, default=None, help="API units until every call fails with quotaExceeded"
+    )
+
+
+def faults_from_args(options: argparse.Namespace) -> Faults:
+    return Faults(
+        latency_ms=options.latency_ms,
+        jitter_ms=options.jitter_ms,
+        error_rate=options.error_rate,
+        quota_error_rate=options.quota_error_rate,
+        quota_limit=options.quota_limit,
+    )
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for the YouTube Data API (synthetic catalog)")
+    parser.add_argument("--videos", type=int, default=DEFAULT_VIDEOS, help=f"Catalog size (default: {DEFAULT_VIDEOS})")
+    parser.add_argument("--domain", default="trockenbau", help="Domain file the titles are built from")
+    parser.add_argument("--seed", type=int, default=0, help="Catalog + fault seed (same seed = same responses)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_fault_arguments(parser)
+    options = parser.parse_args(argv)
+
+    from domains import load_domain
+
+    catalog = SyntheticCatalog(options.videos, load_domain(options.domain), seed=options.seed)
+    server = FakeYouTubeServer(catalog, faults_from_args(options), options.host, options.port, seed=options.seed)
+    print(f"🧪 Fake YouTube API with {options.videos:,} synthetic videos ({options.domain}) at {server.url}")
+    print(f"   export YOUTUBE_API_ENDPOINT={server.url}")
+    print(f"   Stats: {server.url}stats - Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
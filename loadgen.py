@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+DIY Video Finder - Synthetic Load Harness
+=========================================
+
+Runs the video_curator_v2 pipeline stages against fake_youtube.py at
+synthetic scale (no network access) and reports throughput plus per-stage
+latency:
+
+- search:     search.list calls
+- details:    videos.list calls (up to 50 IDs) + VideoRecord.from_api
+- score:      calculate_trust_score() per details batch
+- select:     TopKSelector over every scored video
+- categorize: categorize_video() for the selected videos
+- render:     Catalog + render_script() into a temporary directory
+
+Each catalog size gets a fresh in-process server; cache and quota ledger
+live in a temporary directory, so nothing real is touched.
+
+    python loadgen.py                                   # 10k, 100k and 1M videos
+    python loadgen.py --videos 1000000 --queries 400 --concurrency 16 --latency-ms 50 --error-rate 0.02
+    python loadgen.py --end-to-end --json loadgen.json  # also time run_curation()
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from itertools import cycle
+from pathlib import Path
+
+from fake_youtube import FakeYouTubeServer, SyntheticCatalog, add_fault_arguments, faults_from_args
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+STAGES = ("search", "details", "score", "select", "categorize", "render")
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))]
+
+
+def summarize(samples: list) -> dict:
+    """count/mean/p50/p95/p99/max in milliseconds for a list of seconds"""
+    values = sorted(sample * 1000 for sample in samples)
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values) if values else 0.0,
+        "p50_ms": percentile(values, 50),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+        "max_ms": values[-1] if values else 0.0,
+    }
+
+
+def synthetic_queries(domain_config, count: int) -> list:
+    """`count` distinct queries: domain queries combined with category keywords"""
+    keywords = cycle(kw for category in domain_config.categories for kw in category.keywords)
+    queries = []
+    for round_number, query in enumerate(cycle(domain_config.queries)):
+        if len(queries) >= count:
+            break
+        queries.append(query if round_number < len(domain_config.queries) else f"{query} {next(keywords)}")
+    return list(dict.fromkeys(queries))
+
+
+class StageRun:
+    """Runs the per-query stages for one catalog size and collects timings"""
+
+    def __init__(self, curator, domain_config, results_per_query: int):
+        self.curator = curator
+        self.domain_config = domain_config
+        self.results_per_query = results_per_query
+        self.errors = {"api": 0, "quota": 0}
+        self._lock = threading.Lock()
+
+    def _call(self, request):
+        """Execute a request; returns None (and counts the error) on failure"""
+        import youtube_client
+        from quota import QuotaExceededError
+
+        try:
+            return youtube_client.execute(request)
+        except QuotaExceededError:
+            kind = "quota"
+        except Exception:
+            kind = "api"
+        with self._lock:
+            self.errors[kind] += 1
+        return None
+
+    def query(self, query: str) -> tuple:
+        """search -> details -> score for one query; returns (videos, {stage: [seconds]})"""
+        import youtube_client
+
+        curator = self.curator
+        timings = {"search": [], "details": [], "score": []}
+
+        start = time.perf_counter()
+        response = self._call(curator._search_request(query, self.results_per_query))
+        timings["search"].append(time.perf_counter() - start)
+        if not response:
+            return [], timings
+        video_ids = [item["id"]["videoId"] for item in response.get("items", [])]
+
+        youtube = youtube_client.get_youtube(curator.YOUTUBE_API_KEY)
+        videos = []
+        batch_size = youtube_client.VIDEOS_LIST_MAX_IDS
+        for offset in range(0, len(video_ids), batch_size):
+            start = time.perf_counter()
+            request = youtube.videos().list(
+                part="snippet,statistics,contentDetails", id=",".join(video_ids[offset : offset + batch_size])
+            )
+            details = self._call(request)
+            batch = [curator.VideoRecord.from_api(item) for item in (details or {}).get("items", [])]
+            timings["details"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for video in batch:
+                video.rating = curator.calculate_trust_score(video, self.domain_config)
+            timings["score"].append(time.perf_counter() - start)
+            videos.extend(batch)
+        return videos, timings
+
+
+def run_stages(curator, domain_config, queries: list, options, workdir: Path) -> dict:
+    """Fan the queries out over a thread pool, then select/categorize/render"""
+    from catalog import Catalog, render_script
+
+    stage_run = StageRun(curator, domain_config, options.results)
+    samples = {stage: [] for stage in STAGES}
+    selector = curator.TopKSelector(options.max_videos)
+    seen_ids = set()
+    fetched = 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, options.concurrency)) as executor:
+        for videos, timings in executor.map(stage_run.query, queries):
+            for stage, values in timings.items():
+                samples[stage].extend(values)
+            fetched += len(videos)
+
+            select_start = time.perf_counter()
+            for video in videos:
+                if video.id not in seen_ids:
+                    seen_ids.add(video.id)
+                    selector.push(video)
+            samples["select"].append(time.perf_counter() - select_start)
+
+    selected = selector.best()
+    stage_start = time.perf_counter()
+    for video in selected:
+        video.category = curator.categorize_video(video, domain_config)
+    samples["categorize"].append(time.perf_counter() - stage_start)
+
+    stage_start = time.perf_counter()
+    catalog = Catalog(workdir / "catalog.json", workdir / "script.js")
+    for video in selected:
+        catalog.upsert(video.id, curator.record_to_entry(video))
+    catalog.save()
+    render_script(catalog)
+    samples["render"].append(time.perf_counter() - stage_start)
+    wall = time.perf_counter() - start
+
+    return {
+        "wall_s": wall,
+        "queries": len(queries),
+        "videos_fetched": fetched,
+        "unique_videos": len(seen_ids),
+        "queries_per_s": len(queries) / wall if wall else 0.0,
+        "videos_per_s": fetched / wall if wall else 0.0,
+        "errors": stage_run.errors,
+        "stages": {stage: summarize(values) for stage, values in samples.items()},
+    }
+
+
+def run_end_to_end(curator, domain: str, options) -> dict:
+    """Time one full run_curation() (dry-run, no LLM); its output is captured"""
+    import youtube_client
+
+    curator.configure(
+        curator.parse_args(
+            [
+                "--dry-run",
+                "--skip-llm",
+                "--cache-mode",
+                "off",
+                "--max-videos",
+                str(options.max_videos),
+                "--concurrency",
+                str(options.concurrency),
+            ]
+        )
+    )
+    youtube_client.configure_quota(path=options.workdir / "e2e_ledger.json", daily_limit=options.client_quota)
+
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(buffer):
+        curator.run_curation(domain)
+    wall = time.perf_counter() - start
+    return {"wall_s": wall, "completed": "CURATION COMPLETE" in buffer.getvalue()}
+
+
+def print_report(size: int, report: dict) -> None:
+    print(f"\n📊 {size:,} videos - {report['queries']} queries in {report['wall_s']:.2f}s")
+    print(
+        f"   Throughput: {report['queries_per_s']:.1f} queries/s, {report['videos_per_s']:.0f} videos/s "
+        f"({report['videos_fetched']} fetched, {report['unique_videos']} unique)"
+    )
+    print(f"   Errors:     {report['errors']['api']} API, {report['errors']['quota']} quota")
+    calls = ", ".join(
+        f"{method.split('.')[1]} {stats['calls']} ({stats['errors']} err, {stats['quota_errors']} quota)"
+        for method, stats in report["server"]["endpoints"].items()
+        if stats["calls"]
+    )
+    print(f"   Server:     {report['server']['units_used']} units - {calls}")
+    print(f"   {'stage':<11} {'count':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for stage, stats in report["stages"].items():
+        print(
+            f"   {stage:<11} {stats['count']:>6} {stats['mean_ms']:>7.2f}ms {stats['p50_ms']:>7.2f}ms "
+            f"{stats['p95_ms']:>7.2f}ms {stats['p99_ms']:>7.2f}ms {stats['max_ms']:>7.2f}ms"
+        )
+    if "end_to_end" in report:
+        e2e = report["end_to_end"]
+        print(f"   End-to-end: run_curation() {e2e['wall_s']:.2f}s ({'ok' if e2e['completed'] else 'incomplete'})")
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic-scale load test of the curation pipeline (offline)")
+    parser.add_argument("--videos", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Catalog sizes to test")
+    parser.add_argument("--domain", default="trockenbau")
+    parser.add_argument("--queries", type=int, default=200, help="Search queries per catalog size (default: 200)")
+    parser.add_argument("--results", type=int, default=50, help="search.list maxResults (default: 50)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel queries (default: 8)")
+    parser.add_argument("--max-videos", type=int, default=10, help="Top-K size of the selection (default: 10)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--end-to-end", action="store_true", help="Also time run_curation() for the domain")
+    parser.add_argument("--json", type=Path, default=None, help="Write the report to this JSON file")
+    parser.add_argument(
+        "--client-quota", type=int, default=10**9, help="Daily limit of the client-side ledger (default: unlimited)"
+    )
+    add_fault_arguments(parser)
+    options = parser.parse_args(argv)
+
+    from domains import load_domain
+
+    domain_config = load_domain(options.domain)
+    queries = synthetic_queries(domain_config, options.queries)
+    reports = {}
+
+    with tempfile.TemporaryDirectory(prefix="loadgen-") as tmp:
+        options.workdir = Path(tmp)
+        os.environ.setdefault("YOUTUBE_API_KEY", "fake")
+
+        for size in options.videos:
+            catalog = SyntheticCatalog(size, domain_config, seed=options.seed)
+            with FakeYouTubeServer(catalog, faults_from_args(options), seed=options.seed) as server:
+                os.environ["YOUTUBE_API_ENDPOINT"] = server.url
+
+                import video_curator_v2 as curator
+                import youtube_client
+
+                youtube_client.configure_cache("off")
+                youtube_client.configure_quota(
+                    path=options.workdir / f"ledger_{size}.json", daily_limit=options.client_quota
+                )
+                workdir = options.workdir / str(size)
+                workdir.mkdir()
+
+                report = run_stages(curator, domain_config, queries, options, workdir)
+                if options.end_to_end:
+                    report["end_to_end"] = run_end_to_end(curator, options.domain, options)
+                report["server"] = {"units_used": server.units_used, "endpoints": server.stats}
+
+            reports[str(size)] = report
+            print_report(size, report)
+
+    if options.json:
+        options.json.write_text(json.dumps(reports, indent=2) + "\n", encoding="utf-8")
+        print(f"\n💾 Report written to {options.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
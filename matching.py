@@ -0,0 +1,331 @@
+"""
+DIY Video Finder - Domain Matchers
+==================================
+
+Lookup structures compiled once per domain (DomainConfig) and shared by
+every scoring call:
+
+- SubstringAutomaton: Aho-Corasick over the trusted channel names
+- AnyPattern: all clickbait regexes as one matcher
+- KeywordIndex: keyword -> categories, word and compound aware
+
+get_matcher() memoizes a DomainMatcher per config and pickles it under
+.cache/domain_index/. The classes live in this importable module (not in
+an entry point), so the pickles name "matching" as their module: every
+script can load them, whether it runs as __main__ or is imported.
+"""
+
+import itertools
+import os
+import pickle
+import re
+from collections import deque
+from pathlib import Path
+
+from domains import DomainConfig, DomainConfigError
+
+
+class SubstringAutomaton:
+    """Aho-Corasick automaton: which of N patterns occur in a text?
+
+    Lookup cost depends only on the text length, not on the number of
+    patterns, so trust lists can grow to hundreds of channels.
+    """
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]  # Patterns ending in each state
+        self._match_all = False
+
+        for pattern in patterns:
+            if not pattern:
+                self._match_all = True  # "" is a substring of everything
+                continue
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state] = (pattern,)
+
+        # Breadth-first pass to build failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def search(self, text: str) -> bool:
+        if self._match_all:
+            return True
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                return True
+        return False
+
+    def matches(self, text: str) -> list:
+        """[(start, pattern)] of every occurrence, overlapping ones included, found in one pass"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.extend((end - len(pattern), pattern) for pattern in out[state])
+        return found
+
+
+_GLOBAL_FLAGS = re.compile(r"^\(\?([imsx]+)\)")
+
+# Backreferences / group conditionals: their group numbers would shift inside an alternation
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+class AnyPattern:
+    """Callable text -> bool that matches if any of the regexes matches
+
+    Leading global flags like "(?i)" become scoped groups "(?i:...)" so the
+    patterns can be joined into ONE compiled regex. Patterns that refer to
+    their own groups (backreferences, conditionals) or that cannot be scoped
+    are matched on their own, so the result is always the same as
+    any(re.search(p, text) for p in patterns). Picklable (no lambdas), so it
+    can be part of the on-disk matcher cache.
+    """
+
+    def __init__(self, patterns):
+        self.combined = None
+        self.compiled = []  # Patterns matched on their own
+
+        joinable = []  # (scoped pattern, compiled pattern)
+        for pattern in patterns:
+            regex = re.compile(pattern)  # Invalid patterns raise re.error here
+            if regex.groups and _GROUP_REFERENCE.search(pattern):
+                self.compiled.append(regex)
+                continue
+
+            flags = _GLOBAL_FLAGS.match(pattern)
+            if flags:
+                part = f"(?{flags.group(1)}:{pattern[flags.end() :]})"
+            else:
+                part = f"(?:{pattern})"
+            try:
+                re.compile(part)  # e.g. other global flags, or a verbose-mode comment eating the ")"
+            except re.error:
+                self.compiled.append(regex)
+            else:
+                joinable.append((part, regex))
+
+        if joinable:
+            try:
+                self.combined = re.compile("|".join(part for part, _ in joinable))
+            except re.error:
+                # e.g. the same group name in two patterns
+                self.compiled.extend(regex for _, regex in joinable)
+
+    def __call__(self, text: str) -> bool:
+        if self.combined is not None and self.combined.search(text) is not None:
+            return True
+        return any(regex.search(text) for regex in self.compiled)
+
+
+def compile_any_pattern(patterns) -> AnyPattern:
+    """Compile regexes into ONE matcher (see AnyPattern)"""
+    return AnyPattern(patterns)
+
+
+_WORD = re.compile(r"\w+")
+
+# Compound words: a keyword also counts inside a word if at least this many
+# characters precede it ("trockenbauwand" -> "wand") or follow it
+# ("dachfenster" -> "dach"), so "gewand" or "dachte" do not count
+COMPOUND_MIN_PREFIX = 3
+COMPOUND_MIN_SUFFIX = 3
+
+# Plural/inflection endings tried when matching ("decken" -> "decke")
+INFLECTION_ENDINGS = ("en", "n", "es", "s", "e")
+
+# Distinct words whose keyword matches KeywordIndex remembers (cleared when full)
+KEYWORD_MEMO_SIZE = 50_000
+
+
+def fold(text: str) -> str:
+    """Case- and umlaut-fold text (Tür -> tuer)"""
+    # Chained replace() runs in C; str.translate() with a dict costs ~10x more
+    return text.casefold().replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+
+
+def tokenize(text: str) -> list:
+    """Fold text once and split it into words"""
+    return _WORD.findall(fold(text))
+
+
+class KeywordIndex:
+    """Inverted index keyword -> categories, built from a domain's Category list
+
+    Keywords match whole words (plus simple plural endings) or a part of a
+    compound word (head, tail or middle), never an arbitrary substring.
+    One Aho-Corasick pass finds the keywords in a word; the boundaries are
+    only checked on those hits. Titles and descriptions of one domain reuse
+    the same words over and over, so each word's hits are memoized.
+    """
+
+    def __init__(self, categories):
+        self.order = {category.id: i for i, category in enumerate(categories)}
+        self.words = {}  # folded word -> [(cat_id, keyword)]
+        self.phrases = {}  # folded words -> (regex, [(cat_id, keyword)])
+
+        for category in categories:
+            for keyword in category.keywords:
+                words = tuple(tokenize(keyword))
+                if len(words) == 1:
+                    self.words.setdefault(words[0], []).append((category.id, keyword))
+                elif words:
+                    if words not in self.phrases:
+                        # The same words in a row, separated by anything that is not a word
+                        pattern = r"(?<!\w)" + r"\W+".join(map(re.escape, words)) + r"(?!\w)"
+                        self.phrases[words] = (re.compile(pattern), [])
+                    self.phrases[words][1].append((category.id, keyword))
+
+        self.automaton = SubstringAutomaton(self.words)
+        self._chunk_matches = {}  # whitespace-separated chunk -> ((cat_id, keyword), ...)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_chunk_matches"]  # Filled on use, not part of the on-disk cache
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._chunk_matches = {}
+
+    def rank(self, text: str) -> list:
+        """Return [(cat_id, distinct keyword matches)] best first"""
+        text = fold(text)
+        matched = set()
+
+        # Whitespace never belongs to a word, so a chunk's matches do not depend on its neighbours
+        memo = self._chunk_matches
+        for chunk in text.split():
+            entries = memo.get(chunk)
+            if entries is None:
+                if len(memo) >= KEYWORD_MEMO_SIZE:
+                    memo.clear()
+                entries = memo[chunk] = self._match_chunk(chunk)
+            if entries:
+                matched.update(entries)
+
+        for words, (regex, entries) in self.phrases.items():
+            if words[0] in text and regex.search(text):
+                matched.update(entries)
+
+        counts = {}
+        for cat_id, _keyword in matched:
+            counts[cat_id] = counts.get(cat_id, 0) + 1
+
+        # Ties keep the config order (first category wins)
+        return sorted(counts.items(), key=lambda item: (-item[1], self.order[item[0]]))
+
+    def _match_chunk(self, chunk: str) -> tuple:
+        """The (cat_id, keyword) entries of every keyword that is a word or word part in `chunk`"""
+        found = {}
+        for start, word in self.automaton.matches(chunk):
+            if word not in found and _is_word_part(chunk, start, start + len(word)):
+                found[word] = self.words[word]
+        return tuple(itertools.chain.from_iterable(found.values()))
+
+
+def _is_word_part(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is a whole word (maybe inflected) or a head, tail or middle part of one"""
+    # Head: it starts a word, or at least COMPOUND_MIN_PREFIX word characters precede it
+    # (str.isalnum() or "_" is exactly what \w matches)
+    before = text[start - 1] if start else " "
+    if (before.isalnum() or before == "_") and not (
+        start >= COMPOUND_MIN_PREFIX and _WORD.fullmatch(text, start - COMPOUND_MIN_PREFIX, start)
+    ):
+        return False
+
+    # Tail: the word ends, or an inflection ending or at least COMPOUND_MIN_SUFFIX characters follow
+    after = text[end] if end < len(text) else " "
+    if not (after.isalnum() or after == "_"):
+        return True
+    rest = _WORD.match(text, end).group()
+    return rest in INFLECTION_ENDINGS or len(rest) >= COMPOUND_MIN_SUFFIX
+
+
+class DomainMatcher:
+    """Per-domain lookup structures, compiled once from a DomainConfig"""
+
+    def __init__(self, domain_config: DomainConfig):
+        self.trust_channels = SubstringAutomaton({c.lower() for c in domain_config.trust_channels})
+        try:
+            self.is_clickbait = compile_any_pattern(domain_config.clickbait_patterns)
+        except re.error as e:
+            raise DomainConfigError(f"{domain_config.key}: invalid clickbait pattern ({e})") from e
+        self.keywords = KeywordIndex(domain_config.categories)
+
+    def is_trusted_channel(self, channel: str) -> bool:
+        """True if any trusted name is contained in the (lowercased) channel"""
+        return self.trust_channels.search(channel)
+
+
+# Compiled matchers are pickled here, one file per domain + config file hash
+MATCHER_CACHE_DIR = Path(__file__).parent / ".cache" / "domain_index"
+
+# Bump when DomainMatcher (or anything it pickles) changes shape
+MATCHER_CACHE_VERSION = 5
+
+_matchers = {}
+
+
+def _load_or_build_matcher(domain_config: DomainConfig) -> DomainMatcher:
+    """Unpickle the matcher for this exact config file, or build and store it"""
+    if not domain_config.source_hash:
+        return DomainMatcher(domain_config)
+
+    key = domain_config.key
+    path = MATCHER_CACHE_DIR / f"{key}-{domain_config.source_hash[:16]}-v{MATCHER_CACHE_VERSION}.pickle"
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        pass  # Missing, stale or unreadable - rebuild
+
+    matcher = DomainMatcher(domain_config)
+    try:
+        MATCHER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in MATCHER_CACHE_DIR.glob(f"{key}-*.pickle"):
+            stale.unlink(missing_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Could not cache the {key} matcher: {e}")
+    return matcher
+
+
+def get_matcher(domain_config: DomainConfig) -> DomainMatcher:
+    """Return the compiled matcher for a domain (memory, then disk cache, then built)"""
+    # Configs from files are identified by their hash; ad-hoc ones by value
+    cache_key = (domain_config.key, domain_config.source_hash) if domain_config.source_hash else domain_config
+    matcher = _matchers.get(cache_key)
+    if matcher is None:
+        matcher = _load_or_build_matcher(domain_config)
+        _matchers[cache_key] = matcher
+    return matcher
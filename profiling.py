@@ -0,0 +1,281 @@
+"""
+DIY Video Finder - Run Profiler (--profile)
+===========================================
+
+CPU and memory profiles of one curation run, written to a run-scoped
+directory (default: .cache/profiles/<run_id>/):
+
+- profile.pstats: cProfile of the main thread and every thread started
+  during the run (python -m pstats, snakeviz, ...)
+- stacks.folded:  sampled call stacks of all threads in collapsed format
+  (flamegraph.pl, speedscope, inferno)
+- memory.json:    tracemalloc current/peak memory at every stage boundary
+  (telemetry span end) and the top allocations per stage
+- summary.txt:    slowest functions + memory per stage, human readable
+
+Profiling slows a run down noticeably (cProfile + tracemalloc, and a
+tracemalloc snapshot briefly stalls every thread); use it to find where the
+time goes, not to measure how long a run takes. Stdlib only.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import telemetry
+
+DEFAULT_PROFILE_DIR = Path(__file__).parent / ".cache" / "profiles"
+
+# Stack sampling period for stacks.folded
+SAMPLE_INTERVAL_S = 0.005
+
+# Frames kept per allocation (1 = group by source line, cheapest)
+TRACEMALLOC_FRAMES = 1
+
+# Allocation sites kept per stage snapshot
+TOP_ALLOCATIONS = 15
+
+# A snapshot takes ~1-2s with a few 100k live allocations, so a stage gets a
+# new one only on its first boundary or when its peak grew by this factor
+SNAPSHOT_GROWTH = 1.25
+
+# Functions listed in summary.txt / on the console
+TOP_FUNCTIONS = 30
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """Samples the stacks of all other threads; counts are in collapsed-stack form"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_S):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            # Pool workers share one root ("ThreadPoolExecutor-0_3" -> "ThreadPoolExecutor-0")
+            names = {thread.ident: re.sub(r"_\d+$", "", thread.name) for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                key = ";".join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+class Profiler:
+    """cProfile + stack sampling + tracemalloc stage snapshots for one run
+
+    with Profiler(directory) as profiler:
+        ...  # the run; telemetry spans mark the stage boundaries
+    """
+
+    def __init__(self, directory: Path, interval: float = SAMPLE_INTERVAL_S):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.stages = {}
+        self.boundaries = []
+        self._profile = cProfile.Profile()
+        self._thread_profiles = {threading.get_ident(): self._profile}
+        self._sampler = None
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self._start = 0.0
+        self.wall_s = 0.0
+
+    # -- lifecycle ------------------------------------------------------------
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        # Sampler first: threading.setprofile() only affects threads started afterwards
+        self._sampler = StackSampler(self.interval)
+        self._sampler.start()
+        threading.setprofile(self._profile_new_thread)
+        telemetry.add_span_listener(self._on_span)
+        self._profile.enable()
+
+    def stop(self) -> None:
+        # Last boundary first: its snapshot pauses and re-enables this thread's profile
+        self._on_span("end of run", 0.0, {})
+        self._profile.disable()
+        telemetry.remove_span_listener(self._on_span)
+        threading.setprofile(None)
+        self._sampler.stop()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        self.wall_s = time.perf_counter() - self._start
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+        self.write()
+
+    def _profile_new_thread(self, frame, event, arg) -> None:
+        """threading.setprofile hook: the first event of a new thread gets it its own cProfile"""
+        profile = cProfile.Profile()
+        with self._lock:
+            self._thread_profiles[threading.get_ident()] = profile
+        profile.enable()  # Replaces this hook for the thread
+
+    # -- memory ---------------------------------------------------------------
+
+    def _on_span(self, name: str, duration: float, attrs: dict) -> None:
+        """Stage boundary: memory now, peak since the previous boundary (any thread)"""
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        current_kb, peak_kb = current // 1024, peak // 1024
+        with self._lock:
+            self.boundaries.append(
+                {
+                    "stage": name,
+                    "t_s": round(time.perf_counter() - self._start, 3),
+                    "current_kb": current_kb,
+                    "peak_kb": peak_kb,
+                }
+            )
+            entry = self.stages.setdefault(
+                name,
+                {
+                    "count": 0,
+                    "total_s": 0.0,
+                    "current_kb": 0,
+                    "peak_kb": 0,
+                    "snapshot_peak_kb": None,
+                    "top_allocations": [],
+                },
+            )
+            entry["count"] += 1
+            entry["total_s"] = round(entry["total_s"] + duration, 6)
+            entry["current_kb"] = current_kb
+            entry["peak_kb"] = max(entry["peak_kb"], peak_kb)
+            snapshot = entry["snapshot_peak_kb"] is None or peak_kb > entry["snapshot_peak_kb"] * SNAPSHOT_GROWTH
+            if snapshot:
+                entry["snapshot_peak_kb"] = peak_kb
+            profile = self._thread_profiles.get(threading.get_ident())
+        if snapshot:
+            # Not part of the run: keep the snapshot out of this thread's CPU profile
+            if profile is not None:
+                profile.disable()
+            try:
+                top = self._top_allocations()
+            finally:
+                if profile is not None:
+                    profile.enable()
+            with self._lock:
+                entry["top_allocations"] = top
+
+    @staticmethod
+    def _top_allocations() -> list:
+        # Grouping is done in C; Snapshot.filter_traces() is pure Python and far too slow here
+        stats = tracemalloc.take_snapshot().statistics("lineno")
+        top = []
+        for stat in stats:
+            frame = stat.traceback[0]
+            if frame.filename == tracemalloc.__file__ or frame.filename.startswith("<frozen importlib"):
+                continue
+            top.append(
+                {
+                    "file": frame.filename,
+                    "line": frame.lineno,
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+            )
+            if len(top) == TOP_ALLOCATIONS:
+                break
+        return top
+
+    # -- output ---------------------------------------------------------------
+
+    def stats(self) -> pstats.Stats:
+        """Main thread + worker thread profiles combined"""
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        with self._lock:
+            thread_profiles = [profile for profile in self._thread_profiles.values() if profile is not self._profile]
+        for profile in thread_profiles:
+            profile.create_stats()
+            if profile.stats:
+                stats.add(profile)
+        return stats
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS, sort: str = "cumulative") -> str:
+        stream = io.StringIO()
+        stats = self.stats()
+        stats.stream = stream
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def memory_table(self) -> str:
+        lines = [f"{'stage':<14} {'count':>6} {'time':>9} {'peak':>10} {'after':>10}"]
+        for name, entry in sorted(self.stages.items(), key=lambda item: item[1]["peak_kb"], reverse=True):
+            lines.append(
+                f"{name:<14} {entry['count']:>6} {entry['total_s']:>8.2f}s "
+                f"{entry['peak_kb'] / 1024:>8.1f}MB {entry['current_kb'] / 1024:>8.1f}MB"
+            )
+        return "\n".join(lines)
+
+    def write(self) -> Path:
+        """Write all profile files; returns the directory"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.stats().dump_stats(self.directory / "profile.pstats")
+        (self.directory / "stacks.folded").write_text(self._sampler.folded(), encoding="utf-8")
+        memory = {
+            "wall_s": round(self.wall_s, 3),
+            "samples": self._sampler.samples,
+            "sample_interval_s": self.interval,
+            "stages": self.stages,
+            "boundaries": self.boundaries,
+        }
+        (self.directory / "memory.json").write_text(json.dumps(memory, indent=1) + "\n", encoding="utf-8")
+        summary = (
+            f"Wall time {self.wall_s:.2f}s (profiled), {self._sampler.samples} stack samples\n\n"
+            f"Memory per stage (tracemalloc; peak since the previous stage boundary)\n{self.memory_table()}\n\n"
+            f"Slowest functions (cumulative)\n{self.top_functions()}"
+        )
+        (self.directory / "summary.txt").write_text(summary, encoding="utf-8")
+        return self.directory
+
+    def print_summary(self, limit: int = 10) -> None:
+        """Short console summary: memory per stage and top functions by own time"""
+        print(f"\n🔬 Profile: {self.directory}")
+        print("   " + self.memory_table().replace("\n", "\n   "))
+        stats = self.stats().sort_stats("tottime")
+        print(f"   Top {limit} functions by own time:")
+        for func in stats.fcn_list[:limit]:
+            _, calls, tottime, cumtime, _ = stats.stats[func]
+            filename, line, name = func
+            print(f"   {tottime:8.3f}s own {cumtime:8.3f}s cum {calls:>8} calls  {name} ({Path(filename).name}:{line})")
@@ -0,0 +1,152 @@
+"""
+DIY Video Finder - YouTube Quota Ledger
+=======================================
+
+Tracks YouTube Data API quota units (10,000 per day by default).
+
+- Knows the unit cost of every endpoint we call
+- Persists spend per quota day (YouTube resets at midnight Pacific time)
+- Enforces an optional per-run budget: calls that would exceed it raise
+  QuotaExceededError BEFORE any request is sent
+- Safe to share between processes: every charge re-reads the ledger file
+  under an exclusive file lock
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+DAILY_QUOTA = 10_000
+
+DEFAULT_LEDGER_PATH = Path(__file__).parent / ".cache" / "quota_ledger.json"
+
+# Unit cost per API method
+# https://developers.google.com/youtube/v3/determine_quota_cost
+ENDPOINT_COSTS = {
+    "youtube.search.list": 100,
+    "youtube.videos.list": 1,
+    "youtube.channels.list": 1,
+}
+DEFAULT_COST = 1
+
+# How many days of history to keep in the ledger file
+KEEP_DAYS = 30
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call would exceed the run budget or the daily quota"""
+
+
+def cost_of(method_id: str) -> int:
+    """Quota units charged for one call of an API method"""
+    return ENDPOINT_COSTS.get(method_id, DEFAULT_COST)
+
+
+def quota_day() -> str:
+    """Current quota day (YouTube quotas reset at midnight Pacific time)"""
+    try:
+        from zoneinfo import ZoneInfo
+
+        return datetime.now(ZoneInfo("America/Los_Angeles")).strftime("%Y-%m-%d")
+    except Exception:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive cross-process lock on `path` (no-op where fcntl is unavailable)"""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class QuotaLedger:
+    """Persistent per-day record of quota spend with budget enforcement"""
+
+    def __init__(self, path: Path = DEFAULT_LEDGER_PATH, budget: int | None = None, daily_limit: int = DAILY_QUOTA):
+        self.path = Path(path)
+        self.budget = budget
+        self.daily_limit = daily_limit
+        self.run_units = 0
+        self.run_calls = {}
+        self.exhausted = False
+        self._lock = threading.Lock()
+        self._days = self._load()
+
+    def _load(self) -> dict:
+        if self.path.exists():
+            try:
+                return json.loads(self.path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError):
+                pass
+        return {}
+
+    def _save(self) -> None:
+        # Keep only recent days, write atomically
+        for day in sorted(self._days)[:-KEEP_DAYS]:
+            del self._days[day]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._days, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def spent_today(self) -> int:
+        """Units spent today, across all runs"""
+        return sum(entry["units"] for entry in self._days.get(quota_day(), {}).values())
+
+    def remaining(self) -> int:
+        """Units this run may still spend (run budget and daily quota)"""
+        remaining = self.daily_limit - self.spent_today()
+        if self.budget is not None:
+            remaining = min(remaining, self.budget - self.run_units)
+        return max(0, remaining)
+
+    def can_afford(self, method_id: str) -> bool:
+        """True if one more call of `method_id` fits the budget"""
+        return not self.exhausted and cost_of(method_id) <= self.remaining()
+
+    def charge(self, method_id: str) -> int:
+        """Record one call; raise QuotaExceededError if it does not fit the budget"""
+        cost = cost_of(method_id)
+        with self._lock, file_lock(self.path.with_suffix(".lock")):
+            # Other processes may have charged since we last looked
+            self._days = self._load()
+            if self.exhausted or cost > self.remaining():
+                raise QuotaExceededError(
+                    f"Quota budget reached ({self.run_units} units this run, {self.spent_today()} today)"
+                )
+
+            day = self._days.setdefault(quota_day(), {})
+            entry = day.setdefault(method_id, {"calls": 0, "units": 0})
+            entry["calls"] += 1
+            entry["units"] += cost
+            self.run_units += cost
+            self.run_calls[method_id] = self.run_calls.get(method_id, 0) + 1
+            self._save()
+        return cost
+
+    def mark_exhausted(self) -> None:
+        """The API itself reported quotaExceeded - stop issuing calls"""
+        with self._lock:
+            self.exhausted = True
+
+    def summary(self) -> str:
+        calls = ", ".join(f"{method.split('.')[1]}: {n}" for method, n in sorted(self.run_calls.items()))
+        budget = f" / budget {self.budget}" if self.budget is not None else ""
+        return (
+            f"{self.run_units} units this run{budget} ({calls or 'no calls'}) - "
+            f"{self.spent_today()}/{self.daily_limit} used today"
+        )
@@ -0,0 +1,223 @@
+"""
+DIY Video Finder - LLM Rate Limiting
+====================================
+
+One limiter per LLM provider, shared by every LLM call of the process (the
+CrewAI agents in video_curator.py, the description requests in
+video_curator_v2.py):
+
+- Token buckets for requests per minute and tokens per minute; a burst of
+  calls is spread out instead of running into 429s
+- Retry-After (header, or the retry delay Gemini puts in its error) pauses
+  every caller of that provider, not just the one that got the 429
+- Rate limits and transient errors (5xx, timeouts) are retried per call
+  with jittered exponential backoff
+
+Stdlib only.
+"""
+
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import telemetry
+
+# (requests per minute, tokens per minute) - free/low tiers, on the safe side
+PROVIDER_LIMITS = {
+    "gemini": (15, 1_000_000),
+    "openai": (60, 150_000),
+    "github": (10, 50_000),
+}
+DEFAULT_LIMITS = (10, 50_000)
+
+# Bucket size in seconds of budget: how much may start at once after a quiet phase
+BURST_SECONDS = 10
+
+# Per-call retries for rate limits and transient errors
+MAX_RETRIES = 4
+BACKOFF_BASE_S = 2.0
+BACKOFF_MAX_S = 60.0
+
+# A Retry-After longer than this is not waited out (e.g. daily quota exhausted)
+MAX_RETRY_AFTER_S = 120.0
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504, 529}
+RATE_LIMIT_MARKERS = ("429", "resource_exhausted", "rate limit", "ratelimit", "too many requests")
+TRANSIENT_MARKERS = ("overloaded", "timed out", "timeout", "temporarily unavailable", "connection reset")
+
+
+class TokenBucket:
+    """Refills `rate` units per second up to `capacity` (the lock is the limiter's)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 = now); caller holds the limiter lock"""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Correct an earlier estimate (negative = refund); the level may go below zero"""
+        self.level = min(self.capacity, self.level - amount)
+
+
+def estimate_tokens(prompt, max_output: int = 1000) -> int:
+    """Rough token count of a request: ~4 characters per prompt token + the output limit"""
+    if not isinstance(prompt, str):
+        prompt = " ".join(str(m.get("content", "")) if isinstance(m, dict) else str(m) for m in prompt or [])
+    return len(prompt) // 4 + max_output
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds the server asked us to wait, if it said so"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (AttributeError, TypeError, ValueError):
+        pass
+    # Gemini: "Please retry in 23.5s" / "retryDelay": "23s"
+    match = re.search(r"retry in (\d+(?:\.\d+)?)\s*s|retryDelay['\"]?\s*:\s*['\"](\d+(?:\.\d+)?)s", str(error))
+    if match:
+        return float(match.group(1) or match.group(2))
+    return None
+
+
+def _status_code(error: BaseException) -> int | None:
+    for candidate in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "code", "status"):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def classify(error: BaseException) -> str | None:
+    """Why `error` is worth retrying: "rate_limit", "transient" or None (it isn't)"""
+    status = _status_code(error)
+    text = str(error).lower()
+    if status == 429 or any(marker in text for marker in RATE_LIMIT_MARKERS):
+        return "rate_limit"
+    if status in RETRYABLE_STATUS or any(marker in text for marker in TRANSIENT_MARKERS):
+        return "transient"
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return "transient"
+    return None
+
+
+class RateLimiter:
+    """Requests/tokens per minute for one provider (thread-safe)"""
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float | None = None):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute / 60, requests_per_minute / 60 * BURST_SECONDS)
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute / 60 * BURST_SECONDS) if tokens_per_minute else None
+        )
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request (and `tokens`) fit the budget; returns the seconds waited"""
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = max(
+                    self._paused_until - now,
+                    self.requests.wait_time(1, now),
+                    self.tokens.wait_time(tokens, now) if self.tokens and tokens else 0.0,
+                )
+                if wait <= 0:
+                    self.requests.take(1)
+                    if self.tokens and tokens:
+                        self.tokens.take(tokens)
+                    waited = now - start
+                    if waited > 0.001:
+                        telemetry.observe("llm_rate_limit_wait_seconds", waited, provider=self.name)
+                    return waited
+            time.sleep(wait)
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Replace a request's token estimate with the usage the provider reported"""
+        if self.tokens and actual:
+            with self._lock:
+                self.tokens.adjust(actual - estimated)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds` (Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def call(self, fn, tokens: int = 0, retries: int = MAX_RETRIES):
+        """fn() under the limit; rate limits and transient errors are retried with backoff"""
+        for attempt in range(retries + 1):
+            self.acquire(tokens)
+            try:
+                return fn()
+            except Exception as e:
+                reason = classify(e)
+                if reason is None or attempt == retries:
+                    raise
+                delay = retry_after(e)
+                if delay is not None and delay > MAX_RETRY_AFTER_S:
+                    raise
+                telemetry.count("llm_retries_total", provider=self.name, reason=reason)
+                if delay is None:
+                    # Full jitter: concurrent callers don't retry in lockstep
+                    delay = random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2**attempt))
+                print(f"   ⏳ {self.name}: {reason.replace('_', ' ')} - retry {attempt + 1}/{retries} in {delay:.1f}s")
+                if reason == "rate_limit":
+                    self.pause(delay)  # Every caller of this provider backs off, acquire() waits it out
+                else:
+                    time.sleep(delay)
+
+
+# =============================================================================
+# SHARED LIMITERS
+# =============================================================================
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+# Fraction of the provider limits this process may use (parallel worker processes split them)
+_share = 1.0
+
+
+def configure(share: float = 1.0) -> None:
+    """Use `share` of every provider limit (drops existing limiters)"""
+    global _share
+    with _limiters_lock:
+        _share = share
+        _limiters.clear()
+
+
+def get_limiter(provider: str) -> RateLimiter:
+    """The process-wide limiter of `provider`"""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            rpm, tpm = PROVIDER_LIMITS.get(provider, DEFAULT_LIMITS)
+            limiter = _limiters[provider] = RateLimiter(provider, rpm * _share, tpm * _share if tpm else None)
+        return limiter
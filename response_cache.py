@@ -0,0 +1,144 @@
+"""
+DIY Video Finder - Persistent YouTube API Response Cache
+=======================================================
+
+SQLite-backed cache that sits beneath youtube_client.execute().
+
+- Entries are keyed on the API method + normalized request parameters
+  (sorted, whitespace-trimmed, API key removed)
+- Per-endpoint TTLs; any request that asks for statistics (view/like
+  counts) expires after STATISTICS_TTL. Both curators always request
+  statistics with video details, so in practice videos.list responses live
+  one day - splitting them would not save quota (videos.list costs 1 unit
+  whatever parts it returns)
+- Size-based eviction (least recently used first)
+- WAL journal + busy timeout, so several processes can share one cache file
+
+Cache modes (--cache-mode):
+- use:     read from and write to the cache (default)
+- refresh: ignore cached entries, but store fresh responses
+- off:     bypass the cache completely
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+CACHE_MODES = ("use", "refresh", "off")
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / ".cache" / "youtube_responses.sqlite"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# TTL per API method (seconds)
+ENDPOINT_TTLS = {
+    "youtube.search.list": DAY,
+    "youtube.videos.list": 30 * DAY,  # Only for requests without statistics
+    "youtube.channels.list": 7 * DAY,
+}
+DEFAULT_TTL = DAY
+
+# View/like counts change quickly - any request asking for statistics expires sooner
+STATISTICS_TTL = DAY
+
+# Query parameters that never influence the response
+_IGNORED_PARAMS = {"key", "alt"}
+
+
+def request_key(method_id: str, uri: str) -> str:
+    """Build a stable cache key from an API method and request URI"""
+    params = sorted(
+        (name, value.strip()) for name, value in parse_qsl(urlsplit(uri).query) if name not in _IGNORED_PARAMS
+    )
+    return f"{method_id}?" + "&".join(f"{name}={value}" for name, value in params)
+
+
+def ttl_for(method_id: str, uri: str) -> int:
+    """TTL in seconds for a request (statistics expire faster than details)"""
+    ttl = ENDPOINT_TTLS.get(method_id, DEFAULT_TTL)
+    part = dict(parse_qsl(urlsplit(uri).query)).get("part", "")
+    if "statistics" in part.split(","):
+        ttl = min(ttl, STATISTICS_TTL)
+    return ttl
+
+
+class ResponseCache:
+    """Thread-safe SQLite store for decoded API responses"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, method_id: str, uri: str):
+        """Return the cached response or None if missing/expired"""
+        key = request_key(method_id, uri)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def contains(self, method_id: str, uri: str) -> bool:
+        """True if a fresh entry exists (does not count as hit/miss)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM responses WHERE key = ? AND expires >= ?", (request_key(method_id, uri), time.time())
+            ).fetchone()
+        return row is not None
+
+    def put(self, method_id: str, uri: str, response) -> None:
+        """Store a response and evict old entries if the cache is too large"""
+        body = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, size, expires, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (request_key(method_id, uri), method_id, body, len(body), now + ttl_for(method_id, uri), now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        self._conn.execute("DELETE FROM responses WHERE expires < ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
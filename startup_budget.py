@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+DIY Video Finder - Startup Budget Check
+=======================================
+
+Measures how long the curators take to start, in fresh interpreters:
+
+- `import <module>` via `python -X importtime` (total + slowest imports)
+- `python <script> --help` wall time
+
+Exits with 1 if a measurement is over its budget, so it can run in CI:
+
+    python startup_budget.py
+    python startup_budget.py --top 15 --import-budget-ms 200
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+
+# Curator scripts (module name = file name without .py)
+SCRIPTS = ("video_curator", "video_curator_v2")
+
+DEFAULT_IMPORT_BUDGET_MS = 300
+DEFAULT_HELP_BUDGET_MS = 1000
+DEFAULT_RUNS = 3  # Best-of-N, to smooth out disk cache / scheduler noise
+
+
+def parse_importtime(stderr: str) -> list:
+    """(cumulative_us, self_us, module) for every line of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return rows
+
+
+def measure_import(module: str) -> tuple:
+    """(total_ms, rows) for importing `module` in a fresh interpreter"""
+    # `site` is imported before -c runs; count only what the module pulls in
+    code = f"import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    rows = parse_importtime(proc.stderr)
+    top = next((row for row in rows if row[2] == module), None)
+    return (top[0] / 1000 if top else 0.0), rows
+
+
+def measure_help(script: str) -> float:
+    """Wall time in ms of `python <script>.py --help`"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, f"{script}.py", "--help"], cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script}.py --help failed:\n{proc.stderr.strip()}")
+    return elapsed
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check import and --help startup time against a budget")
+    parser.add_argument("--import-budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS)
+    parser.add_argument("--help-budget-ms", type=float, default=DEFAULT_HELP_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Measurements per check (best is reported)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list per module")
+    options = parser.parse_args(argv)
+
+    over_budget = False
+    for script in SCRIPTS:
+        print(f"\n⏱️  {script}")
+        try:
+            imports = [measure_import(script) for _ in range(max(1, options.runs))]
+            help_ms = min(measure_help(script) for _ in range(max(1, options.runs)))
+        except RuntimeError as e:
+            print(f"   ❌ {e}")
+            over_budget = True
+            continue
+
+        import_ms, rows = min(imports, key=lambda measurement: measurement[0])
+        for label, value, budget in (
+            ("import", import_ms, options.import_budget_ms),
+            ("--help", help_ms, options.help_budget_ms),
+        ):
+            ok = value <= budget
+            over_budget |= not ok
+            print(f"   {'✅' if ok else '❌'} {label:<7} {value:7.1f} ms  (budget {budget:.0f} ms)")
+
+        # Slowest imports by self time (excluding the module itself)
+        print(f"   Slowest imports (self time, top {options.top}):")
+        for cumulative_us, self_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[: options.top]:
+            print(f"     {self_us / 1000:6.1f} ms  (cumulative {cumulative_us / 1000:6.1f} ms)  {name}")
+
+    print(f"\n{'❌ Startup over budget' if over_budget else '✅ Startup within budget'}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""
+DIY Video Finder - Run Telemetry
+================================
+
+Spans, counters and latency histograms for one curation run, used by both
+curators, youtube_client.py and the CrewAI tools.
+
+- span("search"): times a stage; nested spans keep their parent, and every
+  span also feeds the span_duration_seconds histogram
+- count()/observe(): API calls, quota units, cache hits, LLM tokens, ...
+- write_reports(): a JSON run report (spans + metrics + per-stage totals)
+  and the same metrics in Prometheus text format, e.g. for the
+  node_exporter textfile collector
+
+Recording is cheap (a lock and a few dict updates) and always on; nothing
+is written unless write_reports() is called. Stdlib only.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_REPORT_DIR = Path(__file__).parent / ".cache" / "runs"
+
+# Report files kept per directory (oldest are deleted)
+KEEP_REPORTS = 50
+
+# Spans beyond this are only counted (keeps long runs bounded)
+MAX_SPANS = 10_000
+
+METRIC_PREFIX = "diy_video_finder_"
+
+# Seconds - from a cached API call up to a slow CrewAI task
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Span attributes that become labels of span_duration_seconds
+SPAN_LABELS = ("domain", "task", "tool", "provider")
+
+METRIC_HELP = {
+    "span_duration_seconds": "Duration of pipeline stages, CrewAI tasks and tool calls",
+    "youtube_request_duration_seconds": "YouTube Data API request latency (cache misses only)",
+    "youtube_api_calls_total": "YouTube Data API requests sent",
+    "youtube_api_errors_total": "YouTube Data API requests that failed",
+    "youtube_quota_units_total": "YouTube quota units charged",
+    "youtube_cache_requests_total": "Response cache lookups by result",
+    "video_details_lookups_total": "Video details served from the in-run memo or fetched (CrewAI tools)",
+    "llm_requests_total": "LLM requests sent",
+    "llm_tokens_total": "LLM tokens used by kind (prompt/completion)",
+    "llm_retries_total": "LLM calls retried after a rate limit or transient error",
+    "llm_rate_limit_wait_seconds": "Time LLM calls waited for the rate limiter",
+    "run_duration_seconds": "Wall time of the run",
+    "run_timestamp_seconds": "Unix time the run started",
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "buckets": dict(zip(map(str, self.buckets), self.counts, strict=True)),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Recorder:
+    """All telemetry of one run (thread-safe)"""
+
+    def __init__(self, name: str = "run", **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.started = time.time()
+        self.run_id = f"{name}-{datetime.fromtimestamp(self.started).strftime('%Y%m%d-%H%M%S')}"
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 0
+        self.spans = []
+        self.dropped_spans = 0
+        self.counters = {}
+        self.histograms = {}
+
+    # -- recording ------------------------------------------------------------
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def record_span(self, name: str, start: float, end: float, parent=None, error=None, span_id=None, **attrs) -> int:
+        """Add a span measured elsewhere (perf_counter start/end); returns its ID"""
+        span_id = span_id or self._new_id()
+        duration = max(0.0, end - start)
+        with self._lock:
+            if len(self.spans) < MAX_SPANS:
+                self.spans.append(
+                    {
+                        "id": span_id,
+                        "parent": parent,
+                        "name": name,
+                        "start_s": round(start - self._start, 6),
+                        "duration_s": round(duration, 6),
+                        "thread": threading.current_thread().name,
+                        "attrs": attrs,
+                        "error": error,
+                    }
+                )
+            else:
+                self.dropped_spans += 1
+        labels = {key: attrs[key] for key in SPAN_LABELS if key in attrs}
+        self.observe("span_duration_seconds", duration, span=name, **labels)
+        for listener in list(_span_listeners):
+            listener(name, duration, attrs)
+        return span_id
+
+    def current_span(self) -> int | None:
+        """ID of the innermost open span of this thread"""
+        stack = self._local.__dict__.get("stack")
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time a block; yields the attrs dict so the block can add attributes
+
+        Spans opened inside the block (same thread) become its children.
+        """
+        stack = self._local.__dict__.setdefault("stack", [])
+        parent = stack[-1] if stack else None
+        span_id = self._new_id()
+        stack.append(span_id)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield attrs
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            stack.pop()
+            self.record_span(name, start, time.perf_counter(), parent=parent, error=error, span_id=span_id, **attrs)
+
+    # -- export ---------------------------------------------------------------
+
+    def stage_totals(self) -> dict:
+        """{span name: {"count", "total_s"}} - where the run spent its time"""
+        totals = {}
+        with self._lock:
+            for span in self.spans:
+                entry = totals.setdefault(span["name"], {"count": 0, "total_s": 0.0})
+                entry["count"] += 1
+                entry["total_s"] = round(entry["total_s"] + span["duration_s"], 6)
+        return totals
+
+    def report(self) -> dict:
+        """The JSON run report"""
+        with self._lock:
+            spans = list(self.spans)
+            counters = [
+                {"name": n, "labels": dict(labels), "value": v} for (n, labels), v in sorted(self.counters.items())
+            ]
+            histograms = [
+                {"name": n, "labels": dict(labels), **histogram.as_dict()}
+                for (n, labels), histogram in sorted(self.histograms.items())
+            ]
+        return {
+            "run_id": self.run_id,
+            "name": self.name,
+            "attrs": self.attrs,
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "started_unix": self.started,
+            "duration_s": round(time.perf_counter() - self._start, 3),
+            "stages": self.stage_totals(),
+            "spans": spans,
+            "dropped_spans": self.dropped_spans,
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def merge(self, report: dict, **labels) -> None:
+        """Add the spans and metrics of another run report (e.g. from a worker process)
+
+        `labels` (e.g. domain=...) are added to every merged metric and span.
+        """
+        offset = report.get("started_unix", self.started) - self.started
+        id_map = {span["id"]: self._new_id() for span in report.get("spans", [])}
+        with self._lock:
+            for span in report.get("spans", []):
+                if len(self.spans) >= MAX_SPANS:
+                    self.dropped_spans += 1
+                    continue
+                self.spans.append(
+                    {
+                        **span,
+                        "id": id_map[span["id"]],
+                        "parent": id_map.get(span["parent"]),
+                        "start_s": round(span["start_s"] + offset, 6),
+                        "attrs": {**span["attrs"], **labels},
+                    }
+                )
+            self.dropped_spans += report.get("dropped_spans", 0)
+            for counter in report.get("counters", []):
+                key = _key(counter["name"], {**counter["labels"], **labels})
+                self.counters[key] = self.counters.get(key, 0) + counter["value"]
+            for data in report.get("histograms", []):
+                key = _key(data["name"], {**data["labels"], **labels})
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(float(b) for b in data["buckets"])
+                histogram.counts = [
+                    c + data["buckets"].get(str(b), 0) for b, c in zip(histogram.buckets, histogram.counts, strict=True)
+                ]
+                histogram.sum += data["sum"]
+                histogram.count += data["count"]
+
+    def prometheus(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        lines = []
+        typed = set()
+
+        def header(name: str, kind: str) -> None:
+            if name in typed:
+                return
+            typed.add(name)
+            base = name[len(METRIC_PREFIX) :]
+            if base in METRIC_HELP:
+                lines.append(f"# HELP {name} {METRIC_HELP[base]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels_text(labels, extra=()) -> str:
+            pairs = [*labels, *extra]
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+        run_labels = (("run", self.name),)
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = METRIC_PREFIX + name
+                header(metric, "counter")
+                lines.append(f"{metric}{labels_text(run_labels + labels)} {value:g}")
+
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                metric = METRIC_PREFIX + name
+                header(metric, "histogram")
+                for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+                    lines.append(f"{metric}_bucket{labels_text(run_labels + labels, (('le', f'{bound:g}'),))} {count}")
+                lines.append(f"{metric}_bucket{labels_text(run_labels + labels, (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{metric}_sum{labels_text(run_labels + labels)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{labels_text(run_labels + labels)} {histogram.count}")
+
+        for name, value in (
+            ("run_duration_seconds", f"{time.perf_counter() - self._start:.3f}"),
+            ("run_timestamp_seconds", f"{self.started:.0f}"),
+        ):
+            header(METRIC_PREFIX + name, "gauge")
+            lines.append(f"{METRIC_PREFIX}{name}{labels_text(run_labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_reports(self, directory: Path = DEFAULT_REPORT_DIR) -> tuple:
+        """Write <run_id>.json + <run_id>.prom (and latest.*); returns both paths"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        report_path = directory / f"{self.run_id}.json"
+        metrics_path = directory / f"{self.run_id}.prom"
+
+        report_text = json.dumps(self.report(), ensure_ascii=False, indent=1) + "\n"
+        metrics_text = self.prometheus()
+        for path, text in (
+            (report_path, report_text),
+            (metrics_path, metrics_text),
+            (directory / f"latest-{self.name}.json", report_text),
+            (directory / f"latest-{self.name}.prom", metrics_text),
+        ):
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            tmp_path.replace(path)
+
+        for suffix in ("json", "prom"):
+            old = sorted(p for p in directory.glob(f"{self.name}-*.{suffix}"))
+            for path in old[:-KEEP_REPORTS]:
+                path.unlink(missing_ok=True)
+        return report_path, metrics_path
+
+    def summary(self) -> str:
+        """One line: time per stage, slowest first"""
+        totals = sorted(self.stage_totals().items(), key=lambda item: item[1]["total_s"], reverse=True)
+        return ", ".join(f"{name} {entry['total_s']:.1f}s" for name, entry in totals) or "no spans"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# =============================================================================
+# MODULE-LEVEL RECORDER
+# =============================================================================
+
+_recorder = Recorder()
+
+# Called with (name, duration_s, attrs) whenever a span ends (e.g. profiling.py)
+_span_listeners = []
+
+
+def start_run(name: str, **attrs) -> Recorder:
+    """Start a fresh recorder for a run (drops everything recorded so far)"""
+    global _recorder
+    _recorder = Recorder(name, **attrs)
+    return _recorder
+
+
+def get_recorder() -> Recorder:
+    return _recorder
+
+
+def add_span_listener(listener) -> None:
+    _span_listeners.append(listener)
+
+
+def remove_span_listener(listener) -> None:
+    if listener in _span_listeners:
+        _span_listeners.remove(listener)
+
+
+def span(name: str, **attrs):
+    return _recorder.span(name, **attrs)
+
+
+def record_span(name: str, start: float, end: float, **attrs):
+    return _recorder.record_span(name, start, end, **attrs)
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    _recorder.count(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    _recorder.observe(name, value, **labels)
@@ -0,0 +1,99 @@
+"""Tests for catalog.py: catalog.json <-> script.js"""
+
+from catalog import Catalog, render_script
+
+VIDEOS = {
+    "abc123DEF45": {
+        "title": {"de": 'Wand bauen: "Profi" Tipps, Tricks & mehr', "en": "Building walls: pro tips"},
+        "description": {"de": "Ständerwand mit CW/UW-Profilen \\ Schritt für Schritt", "en": "It's easy"},
+        "rating": 4.8,
+        "views": 1_234_567,
+        "category": "waende",
+        "channel": "Knauf DIY",
+    },
+    "x_Y-z098765": {
+        "title": {"de": "Decke abhängen 🏠", "en": "Hanging a ceiling 🏠"},
+        "description": {"de": "Zeilen\numbruch und 'Apostroph'", "en": "Line\nbreak"},
+        "rating": 4.0,
+        "views": 950,
+        "category": "decken",
+        "channel": "OBI",
+    },
+}
+
+SCRIPT_TEMPLATE = """// KURATIERTE Videos vom DIY Video Finder (1. Januar 2026)
+const videos = [
+];
+
+function render() {
+  return videos.length;
+}
+"""
+
+
+def test_script_round_trip_is_byte_identical(tmp_path):
+    script_path = tmp_path / "script.js"
+    script_path.write_text(SCRIPT_TEMPLATE, encoding="utf-8")
+
+    catalog = Catalog(tmp_path / "catalog.json", script_path)
+    for video_id, entry in VIDEOS.items():
+        catalog.upsert(video_id, entry)
+    assert render_script(catalog)
+    rendered = script_path.read_bytes()
+
+    # Import the rendered script into a fresh catalog and render it again
+    imported = Catalog.load(tmp_path / "imported.json", script_path)
+    assert list(imported.videos) == list(VIDEOS)
+    for video_id, entry in VIDEOS.items():
+        assert imported.get(video_id)["title"] == entry["title"]
+        assert imported.get(video_id)["description"] == entry["description"]
+
+    copy_path = tmp_path / "copy.js"
+    copy_path.write_bytes(rendered)
+    assert not render_script(imported, copy_path)  # Unchanged: nothing written
+    assert copy_path.read_bytes() == rendered
+    assert b"function render()" in rendered
+
+
+def test_catalog_save_only_writes_changes(tmp_path):
+    catalog = Catalog(tmp_path / "catalog.json", tmp_path / "script.js")
+    catalog.upsert("abc123DEF45", VIDEOS["abc123DEF45"])
+    assert catalog.save()
+    assert not catalog.save()
+
+    reopened = Catalog(tmp_path / "catalog.json")
+    assert reopened.videos == catalog.videos
+    assert not reopened.save()
+
+
+def test_titles_with_array_terminators_survive_rerendering(tmp_path):
+    script_path = tmp_path / "script.js"
+    script_path.write_text(SCRIPT_TEMPLATE, encoding="utf-8")
+    catalog = Catalog(tmp_path / "catalog.json", script_path)
+    entry = {**VIDEOS["abc123DEF45"], "title": {"de": "Wand [Teil 1]; Profis", "en": "Wall [part 1];\n];"}}
+    catalog.upsert("abc123DEF45", entry)
+    catalog.upsert("x_Y-z098765", VIDEOS["x_Y-z098765"])
+
+    assert render_script(catalog)
+    catalog.upsert("x_Y-z098765", {**VIDEOS["x_Y-z098765"], "rating": 3.0})
+    assert render_script(catalog)  # Replaces the whole array, not just up to the title's "];"
+    rendered = script_path.read_text(encoding="utf-8")
+    assert rendered.count("const videos") == 1
+    assert rendered.endswith("function render() {\n  return videos.length;\n}\n")
+
+    imported = Catalog.load(tmp_path / "imported.json", script_path)
+    assert list(imported.videos) == list(VIDEOS)
+    assert imported.get("abc123DEF45")["title"] == entry["title"]
+    assert imported.get("x_Y-z098765")["rating"] == 3.0
+
+
+def test_render_replaces_an_empty_one_line_array(tmp_path):
+    script_path = tmp_path / "script.js"
+    script_path.write_text("const videos = [];\nrender(videos);\n", encoding="utf-8")
+    catalog = Catalog(tmp_path / "catalog.json", script_path)
+    catalog.upsert("abc123DEF45", VIDEOS["abc123DEF45"])
+
+    assert render_script(catalog)
+    rendered = script_path.read_text(encoding="utf-8")
+    assert rendered.count("const videos") == 1
+    assert rendered.endswith("\n];\nrender(videos);\n")
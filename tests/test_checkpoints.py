@@ -0,0 +1,68 @@
+"""Tests for checkpoints.py and the task restore of video_curator.py"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from checkpoints import TaskCheckpoints, run_signature
+
+
+def test_signature_depends_on_settings_not_order():
+    assert run_signature(max_videos=10, skip_design=False) == run_signature(skip_design=False, max_videos=10)
+    assert run_signature(max_videos=10) != run_signature(max_videos=11)
+
+
+def test_resume_loads_outputs_of_the_same_settings(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    signature = run_signature(max_videos=10)
+
+    run = TaskCheckpoints(path, signature)
+    run.record("research", "Researcher", "[video list]")
+    run.record("quality_review", "Reviewer", "[reviewed list]")
+
+    resumed = TaskCheckpoints(path, signature)
+    assert resumed.load()
+    assert resumed.started == run.started
+    assert list(resumed.completed()) == ["research", "quality_review"]
+    assert resumed.completed()["quality_review"]["raw"] == "[reviewed list]"
+
+    other_settings = TaskCheckpoints(path, run_signature(max_videos=5))
+    assert not other_settings.load()
+    assert other_settings.tasks == []
+
+
+def test_clear_removes_the_checkpoint(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    checkpoints = TaskCheckpoints(path, "sig")
+    checkpoints.record("research", "Researcher", "raw")
+    checkpoints.clear()
+
+    assert not path.exists()
+    assert not TaskCheckpoints(path, "sig").load()
+
+
+def test_unreadable_checkpoint_starts_fresh(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert not TaskCheckpoints(path, "sig").load()
+
+
+def test_restore_finished_tasks_skips_leading_finished_tasks():
+    pytest.importorskip("crewai")
+    import video_curator
+
+    names = ["research", "quality_review", "curation", "development"]
+    tasks = {name: SimpleNamespace(description=name, context=None, output=None) for name in names}
+    tasks["development"].context = [tasks["curation"]]
+    completed = {
+        "research": {"raw": "r", "agent": "Researcher"},
+        "curation": {"raw": "c", "agent": "Curator"},  # Not leading: runs again
+    }
+
+    remaining = video_curator.restore_finished_tasks(tasks, completed)
+
+    assert list(remaining) == ["quality_review", "curation", "development"]
+    assert tasks["research"].output.raw == "r"
+    assert tasks["quality_review"].context == [tasks["research"]]
+    assert tasks["curation"].context == [tasks["research"], tasks["quality_review"]]
+    assert tasks["development"].context == [tasks["curation"]]  # Explicit context is kept
@@ -0,0 +1,119 @@
+"""Tests for domains.py"""
+
+import json
+
+import pytest
+
+from domains import DomainConfigError, load_domain, load_domain_file, load_domains
+
+FLIESEN_TOML = """
+name = { de = "Fliesen", en = "Tiles" }
+queries = ["Fliesen verlegen Anleitung"]
+trust_channels = ["Knauf"]
+clickbait_patterns = ['(?i)krass']
+
+[categories.fugen]
+de = "Fugen"
+en = "Grouting"
+keywords = ["fugen", "verfugen"]
+
+[categories.verlegen]
+de = "Verlegen"
+en = "Laying"
+keywords = ["verlegen"]
+description = "Laying floor and wall tiles"
+"""
+
+FLIESEN = {
+    "name": {"de": "Fliesen", "en": "Tiles"},
+    "queries": ["Fliesen verlegen Anleitung"],
+    "categories": {"fugen": {"de": "Fugen", "en": "Grouting", "keywords": ["fugen"]}},
+}
+
+
+def write_json(directory, key, data):
+    path = directory / f"{key}.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def test_toml_file_is_validated_into_a_frozen_config(tmp_path):
+    path = tmp_path / "fliesen.toml"
+    path.write_text(FLIESEN_TOML, encoding="utf-8")
+    config = load_domain_file(path)
+
+    assert config.key == "fliesen"
+    assert config.name.en == "Tiles"
+    assert config.queries == ("Fliesen verlegen Anleitung",)
+    assert config.category_ids == ("fugen", "verlegen")  # File order
+    assert config.categories[0].keywords == ("fugen", "verfugen")
+    assert config.categories[1].description == "Laying floor and wall tiles"
+    assert config.clickbait_patterns == ("(?i)krass",)
+    with pytest.raises(AttributeError):
+        config.key = "other"
+
+
+def test_optional_fields_default_to_empty(tmp_path):
+    config = load_domain_file(write_json(tmp_path, "fliesen", FLIESEN))
+    assert config.trust_channels == ()
+    assert config.clickbait_patterns == ()
+    assert config.categories[0].description == ""
+
+
+def test_source_hash_follows_the_file_content(tmp_path):
+    path = write_json(tmp_path, "fliesen", FLIESEN)
+    before = load_domain_file(path).source_hash
+    assert load_domain_file(path).source_hash == before
+
+    write_json(tmp_path, "fliesen", {**FLIESEN, "queries": ["Fliesen schneiden"]})
+    assert load_domain_file(path).source_hash != before
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        ({"name": {"de": "Fliesen"}}, "fliesen.name: needs 'de' and 'en'"),
+        ({"queries": []}, "'queries' must not be empty"),
+        ({"queries": ["ok", ""]}, "'queries' must be a list of non-empty strings"),
+        ({"trust_channels": "Knauf"}, "'trust_channels' must be a list"),
+        ({"categories": ["fugen"]}, "'categories' must be a table"),
+        ({"categories": {"fugen": {"de": "a", "en": "b", "keywords": []}}}, "fliesen.categories.fugen"),
+    ],
+)
+def test_invalid_files_name_the_problem(tmp_path, change, message):
+    path = write_json(tmp_path, "fliesen", {**FLIESEN, **change})
+    with pytest.raises(DomainConfigError, match=message):
+        load_domain_file(path)
+
+
+def test_unreadable_files_raise_domain_errors(tmp_path):
+    broken = tmp_path / "broken.toml"
+    broken.write_text("name = {", encoding="utf-8")
+    with pytest.raises(DomainConfigError, match="broken.toml: cannot parse"):
+        load_domain_file(broken)
+    with pytest.raises(DomainConfigError, match="missing.json"):
+        load_domain_file(tmp_path / "missing.json")
+    with pytest.raises(DomainConfigError, match="top level"):
+        load_domain_file(write_json(tmp_path, "list", [FLIESEN]))
+
+
+def test_directory_loading(tmp_path):
+    write_json(tmp_path, "fliesen", FLIESEN)
+    write_json(tmp_path, "estrich", {**FLIESEN, "name": {"de": "Estrich", "en": "Screed"}})
+    (tmp_path / "notes.txt").write_text("not a domain", encoding="utf-8")
+
+    assert list(load_domains(tmp_path)) == ["estrich", "fliesen"]
+    assert load_domain("estrich", tmp_path).name.en == "Screed"
+    with pytest.raises(DomainConfigError, match="Unknown domain: parkett"):
+        load_domain("parkett", tmp_path)
+
+    (tmp_path / "fliesen.toml").write_text(FLIESEN_TOML, encoding="utf-8")
+    with pytest.raises(DomainConfigError, match="defined twice"):
+        load_domains(tmp_path)
+
+
+def test_shipped_domains_load():
+    domains = load_domains()
+    assert "trockenbau" in domains
+    assert domains["trockenbau"].queries
+    assert domains["trockenbau"].category_ids
@@ -0,0 +1,135 @@
+"""Tests for fake_youtube.py"""
+
+import argparse
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+import fake_youtube
+from domains import load_domain
+from fake_youtube import FakeYouTubeServer, Faults, SyntheticCatalog
+
+TROCKENBAU = load_domain("trockenbau")
+
+
+@pytest.fixture
+def catalog():
+    return SyntheticCatalog(10_000, TROCKENBAU, seed=1)
+
+
+def test_videos_are_rebuilt_identically_from_the_seed(catalog):
+    assert catalog.video(42) == SyntheticCatalog(10_000, TROCKENBAU, seed=1).video(42)
+    assert catalog.video(42) != SyntheticCatalog(10_000, TROCKENBAU, seed=2).video(42)
+
+    video = catalog.video(42)
+    assert len(video["id"]) == 11
+    assert catalog.index_of(video["id"]) == 42
+    assert catalog.index_of("fk999999999") is None  # Past the end of the catalog
+    assert catalog.index_of("dQw4w9WgXcQ") is None
+    assert any(keyword in video["snippet"]["title"].lower() for keyword in catalog.keywords)
+
+
+def test_catalog_size_must_be_positive():
+    with pytest.raises(ValueError):
+        SyntheticCatalog(0)
+
+
+def test_search_pages_through_a_fixed_slice(catalog):
+    first = catalog.search("Rigips Decke", max_results=50)
+    assert first == catalog.search("  rigips decke ", max_results=50)  # Normalized like the cache key
+    assert first["pageInfo"]["totalResults"] == fake_youtube.RESULTS_PER_QUERY
+
+    ids, token = [], None
+    while True:
+        page = catalog.search("Rigips Decke", max_results=50, page_token=token)
+        ids += [item["id"]["videoId"] for item in page["items"]]
+        token = page.get("nextPageToken")
+        if token is None:
+            break
+    assert len(ids) == len(set(ids)) == fake_youtube.RESULTS_PER_QUERY
+    assert ids[:50] == [item["id"]["videoId"] for item in first["items"]]
+    assert catalog.search("Gipskarton spachteln")["items"] != first["items"][:5]
+
+
+def test_small_catalogs_return_each_video_once():
+    small = SyntheticCatalog(30, TROCKENBAU)
+    page = small.search("wand", max_results=50)
+    assert len({item["id"]["videoId"] for item in page["items"]}) == 30
+    assert "nextPageToken" not in page
+
+
+def test_videos_and_channels_lists(catalog):
+    video_id = catalog.video_id(7)
+    response = catalog.videos([video_id, "fk000000000x", catalog.video_id(10_000)], {"snippet"})
+    (item,) = response["items"]  # Unknown IDs are left out
+    assert set(item) == {"kind", "id", "snippet"}
+
+    full = catalog.videos([video_id], {"snippet", "statistics", "contentDetails"})["items"][0]
+    assert full == catalog.video(7)
+
+    channel_id = full["snippet"]["channelId"]
+    (channel,) = catalog.channels([channel_id, "UCsomethingreal"])["items"]
+    assert channel["snippet"]["title"] == full["snippet"]["channelTitle"]
+    assert int(channel["statistics"]["subscriberCount"]) >= 0
+
+
+# =============================================================================
+# SERVER + FAULTS
+# =============================================================================
+
+
+def get_json(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_server_answers_like_the_api_over_http(catalog):
+    with FakeYouTubeServer(catalog) as server:
+        status, body = get_json(f"{server.url}youtube/v3/search?q=wand&maxResults=3&part=snippet")
+        assert status == 200
+        assert body == catalog.search("wand", 3)
+
+        ids = ",".join(item["id"]["videoId"] for item in body["items"])
+        status, body = get_json(f"{server.url}youtube/v3/videos?id={ids}&part=snippet,statistics")
+        assert [item["id"] for item in body["items"]] == ids.split(",")
+        assert "contentDetails" not in body["items"][0]
+
+        status, stats = get_json(f"{server.url}stats")
+        assert stats["units_used"] == 101
+        assert stats["endpoints"]["youtube.search.list"]["calls"] == 1
+
+        assert get_json(f"{server.url}youtube/v3/playlists")[0] == 404
+
+
+def test_quota_limit_is_enforced_in_api_units(catalog):
+    with FakeYouTubeServer(catalog, Faults(quota_limit=150)) as server:
+        assert server.respond("/youtube/v3/search", "q=wand")[0] == 200
+        assert server.respond("/youtube/v3/videos", "id=fk000000001")[0] == 200
+        status, body = server.respond("/youtube/v3/search", "q=decke")
+        assert status == 403
+        assert body["error"]["errors"][0]["reason"] == "quotaExceeded"
+        assert server.units_used == 101  # Refused calls cost nothing
+
+
+def test_injected_errors_are_reproducible(catalog):
+    def statuses(seed):
+        with FakeYouTubeServer(catalog, Faults(error_rate=0.3, quota_error_rate=0.1), seed=seed) as server:
+            return [server.respond("/youtube/v3/videos", "id=fk000000001")[0] for _ in range(200)], server.stats
+
+    codes, stats = statuses(seed=3)
+    assert codes == statuses(seed=3)[0]
+    assert {200, 403, 500} == set(codes)
+    assert stats["youtube.videos.list"]["errors"] == codes.count(500)
+    assert stats["youtube.videos.list"]["quota_errors"] == codes.count(403)
+
+
+def test_fault_arguments():
+    parser = argparse.ArgumentParser()
+    fake_youtube.add_fault_arguments(parser)
+    options = parser.parse_args(["--latency-ms", "80", "--error-rate", "0.01", "--quota-limit", "500"])
+    assert fake_youtube.faults_from_args(options) == Faults(latency_ms=80, error_rate=0.01, quota_limit=500)
@@ -0,0 +1,116 @@
+"""Tests for matching.py"""
+
+import dataclasses
+import pickle
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import matching
+from domains import DomainConfigError, load_domain
+from matching import AnyPattern, KeywordIndex, SubstringAutomaton
+
+TROCKENBAU = load_domain("trockenbau")
+
+# =============================================================================
+# PATTERN MATCHING
+# =============================================================================
+
+PATTERN_SETS = [
+    [],
+    ["(?i)krass", "(?i)dieser trick", r"(?i)\d+\s*(euro|€).*gespart"],
+    ["(a)b", r"(c)\1"],
+    [r"(?P<x>a)b", r"(?P<x>c)(?P=x)"],
+    [r"(a)?(?(1)b|c)", "zz"],
+    ["(?x) a  b # comment", "(?m)^end$"],
+    ["(?a)\\w+ä", "(?s)a.b"],
+    ["", "never"],
+]
+PATTERN_TEXTS = ["", "cc", "ab", "c", "zz", "ab cc", "xcc", "c", "KRASS!", "50 € gespart", "a\nb", "x\nend", "ä", "xä"]
+
+
+def test_any_pattern_matches_like_re_search():
+    for patterns in PATTERN_SETS:
+        matcher = AnyPattern(patterns)
+        for text in PATTERN_TEXTS:
+            expected = any(re.search(pattern, text) for pattern in patterns)
+            assert matcher(text) == expected, (patterns, text)
+
+
+def test_any_pattern_joins_patterns_without_group_references():
+    matcher = AnyPattern(["(?i)krass", r"(?i)\d+\s*(euro|€).*gespart", r"(c)\1"])
+    assert matcher.combined is not None
+    assert [regex.pattern for regex in matcher.compiled] == [r"(c)\1"]
+
+
+# =============================================================================
+# KEYWORD INDEX
+# =============================================================================
+
+
+def test_substring_automaton_reports_overlapping_matches():
+    automaton = SubstringAutomaton(["he", "she", "hers", "his"])
+    assert sorted(automaton.matches("ushers")) == [(1, "she"), (2, "he"), (2, "hers")]
+    assert automaton.matches("xyz") == []
+    assert automaton.search("this") and not automaton.search("xyz")
+
+
+def test_keyword_index_memo_is_not_pickled():
+    index = KeywordIndex(TROCKENBAU.categories)
+    ranked = index.rank("Trockenbauwand und Decken: Trockenbau für Anfänger")
+    assert index._chunk_matches
+
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored._chunk_matches == {}
+    assert restored.rank("Trockenbauwand und Decken: Trockenbau für Anfänger") == ranked
+
+
+# =============================================================================
+# MATCHER CACHE
+# =============================================================================
+
+
+@pytest.fixture
+def matcher_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(matching, "MATCHER_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(matching, "_matchers", {})
+    return tmp_path
+
+
+def test_cached_matcher_loads_without_the_entry_point(matcher_cache):
+    matching.get_matcher(TROCKENBAU)
+    (path,) = matcher_cache.glob("trockenbau-*.pickle")
+
+    # A fresh interpreter (like video_curator.py or v2 run as __main__) only needs matching.py
+    script = (
+        "import pickle, sys; matcher = pickle.load(open(sys.argv[1], 'rb')); "
+        "assert 'video_curator_v2' not in sys.modules; print(type(matcher).__module__)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(path)],
+        cwd=Path(matching.__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "matching"
+
+
+def test_matcher_is_built_once_per_config_file(matcher_cache, monkeypatch):
+    built = matching.get_matcher(TROCKENBAU)
+    assert matching.get_matcher(TROCKENBAU) is built
+
+    # A new process finds the pickle instead of rebuilding
+    monkeypatch.setattr(matching, "_matchers", {})
+    monkeypatch.setattr(matching.DomainMatcher, "__init__", lambda *args: pytest.fail("matcher was rebuilt"))
+    loaded = matching.get_matcher(TROCKENBAU)
+    assert loaded.keywords.rank("Decke abhängen") == built.keywords.rank("Decke abhängen")
+
+
+def test_invalid_clickbait_pattern_names_the_domain():
+    broken = dataclasses.replace(TROCKENBAU, clickbait_patterns=("(unclosed",), source_hash="")
+    with pytest.raises(DomainConfigError, match="trockenbau: invalid clickbait pattern"):
+        matching.DomainMatcher(broken)
@@ -0,0 +1,120 @@
+"""Tests for profiling.py"""
+
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+import telemetry
+from profiling import Profiler, StackSampler
+
+
+def busy_worker(seconds: float) -> list:
+    """CPU-bound and allocating, so every profiler has something to see"""
+    deadline = time.perf_counter() + seconds
+    chunks = []
+    while time.perf_counter() < deadline:
+        chunks.append([str(i) for i in range(200)])
+    return chunks
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    monkeypatch.setattr(telemetry, "_recorder", telemetry.Recorder("test"))
+    return telemetry.get_recorder()
+
+
+def test_profile_files_cover_stages_and_worker_threads(tmp_path, recorder):
+    assert not tracemalloc.is_tracing()
+    kept = []
+    with Profiler(tmp_path / "run", interval=0.002) as profiler:
+        with telemetry.span("search"):
+            kept.append(busy_worker(0.05))
+        with telemetry.span("details"):
+            worker = threading.Thread(target=busy_worker, args=(0.1,), name="ThreadPoolExecutor-0_1")
+            worker.start()
+            worker.join()
+    assert not tracemalloc.is_tracing()  # Stopped again because the profiler started it
+
+    directory = tmp_path / "run"
+    assert sorted(p.name for p in directory.iterdir()) == [
+        "memory.json",
+        "profile.pstats",
+        "stacks.folded",
+        "summary.txt",
+    ]
+
+    # The worker thread's cProfile is merged into the main one
+    stats = pstats.Stats(str(directory / "profile.pstats"))
+    assert sum(calls for (_, _, name), (_, calls, *_) in stats.stats.items() if name == "busy_worker") == 2
+
+    folded = (directory / "stacks.folded").read_text(encoding="utf-8").splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+    assert any(line.startswith("ThreadPoolExecutor-0;") and "busy_worker" in line for line in folded)
+
+    memory = json.loads((directory / "memory.json").read_text(encoding="utf-8"))
+    assert [b["stage"] for b in memory["boundaries"]] == ["search", "details", "end of run"]
+    search = memory["stages"]["search"]
+    assert search["count"] == 1
+    assert search["peak_kb"] > 0
+    assert any(entry["file"].endswith("test_profiling.py") for entry in search["top_allocations"])
+    assert memory["samples"] == profiler._sampler.samples > 0
+
+    summary = (directory / "summary.txt").read_text(encoding="utf-8")
+    assert "Memory per stage" in summary
+    assert "busy_worker" in summary
+
+
+def test_stage_snapshots_are_taken_only_when_the_peak_grows(tmp_path, recorder, monkeypatch):
+    taken = []
+    monkeypatch.setattr(Profiler, "_top_allocations", staticmethod(lambda: taken.append(1) or []))
+    profiler = Profiler(tmp_path)
+    profiler.start()
+    try:
+        for _ in range(3):
+            with telemetry.span("save"):
+                pass
+        with telemetry.span("save"):
+            kept = busy_worker(0.02)  # Peak grows well past SNAPSHOT_GROWTH
+    finally:
+        profiler.stop()
+
+    assert sys.getprofile() is None  # The end-of-run snapshot must not switch cProfile back on
+    assert kept
+    assert profiler.stages["save"]["count"] == 4
+    assert len(taken) == 3  # save (first), save (grown), end of run
+
+
+def test_stack_sampler_folds_stacks_per_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait, name="waiter")
+    thread.start()
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    try:
+        while sampler.samples < 5:
+            time.sleep(0.001)
+    finally:
+        sampler.stop()
+        stop.set()
+        thread.join()
+
+    waiter = [stack for stack in sampler.stacks if stack.startswith("waiter;")]
+    assert waiter
+    assert "wait (threading.py:" in waiter[0]
+    assert not any("profile-sampler" in stack for stack in sampler.stacks)
+    assert sampler.folded().endswith("\n")
+
+
+def test_print_summary(tmp_path, recorder, capsys):
+    with Profiler(tmp_path) as profiler, telemetry.span("search"):
+        busy_worker(0.01)
+    profiler.print_summary(limit=3)
+    output = capsys.readouterr().out
+    assert f"Profile: {tmp_path}" in output
+    assert "Top 3 functions by own time" in output
+    assert "search" in output
@@ -0,0 +1,77 @@
+"""Tests for quota.py"""
+
+import json
+import threading
+
+import pytest
+
+from quota import QuotaExceededError, QuotaLedger, cost_of, quota_day
+
+
+def test_costs():
+    assert cost_of("youtube.search.list") == 100
+    assert cost_of("youtube.videos.list") == 1
+    assert cost_of("youtube.unknown.list") == 1
+
+
+def test_run_budget_is_enforced_before_the_call(tmp_path):
+    ledger = QuotaLedger(tmp_path / "ledger.json", budget=150)
+    assert ledger.can_afford("youtube.search.list")
+    ledger.charge("youtube.search.list")
+
+    assert ledger.remaining() == 50
+    assert not ledger.can_afford("youtube.search.list")
+    with pytest.raises(QuotaExceededError):
+        ledger.charge("youtube.search.list")
+    assert ledger.run_units == 100  # The refused call was not recorded
+
+    ledger.charge("youtube.videos.list")
+    assert ledger.run_calls == {"youtube.search.list": 1, "youtube.videos.list": 1}
+    assert "101 units this run / budget 150" in ledger.summary()
+
+
+def test_spend_is_persisted_per_quota_day(tmp_path):
+    path = tmp_path / "ledger.json"
+    QuotaLedger(path).charge("youtube.search.list")
+    QuotaLedger(path).charge("youtube.videos.list")
+
+    days = json.loads(path.read_text(encoding="utf-8"))
+    assert days[quota_day()]["youtube.search.list"] == {"calls": 1, "units": 100}
+    assert QuotaLedger(path).spent_today() == 101
+
+
+def test_daily_limit_counts_every_run(tmp_path):
+    path = tmp_path / "ledger.json"
+    first = QuotaLedger(path, daily_limit=200)
+    second = QuotaLedger(path, daily_limit=200)  # Loaded before `first` spent anything
+
+    first.charge("youtube.search.list")
+    second.charge("youtube.search.list")
+    with pytest.raises(QuotaExceededError):
+        first.charge("youtube.videos.list")  # Re-reads the file: the other run used the rest
+    assert QuotaLedger(path).spent_today() == 200
+
+
+def test_concurrent_charges_are_all_recorded(tmp_path):
+    path = tmp_path / "ledger.json"
+    ledgers = [QuotaLedger(path) for _ in range(4)]
+
+    def charge(ledger):
+        for _ in range(25):
+            ledger.charge("youtube.videos.list")
+
+    threads = [threading.Thread(target=charge, args=(ledger,)) for ledger in ledgers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert QuotaLedger(path).spent_today() == 100
+
+
+def test_exhausted_ledger_refuses_everything(tmp_path):
+    ledger = QuotaLedger(tmp_path / "ledger.json")
+    ledger.mark_exhausted()
+    assert not ledger.can_afford("youtube.videos.list")
+    with pytest.raises(QuotaExceededError):
+        ledger.charge("youtube.videos.list")
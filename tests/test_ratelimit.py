@@ -0,0 +1,107 @@
+"""Tests for ratelimit.py"""
+
+import pytest
+
+import ratelimit
+from ratelimit import RateLimiter, TokenBucket
+
+
+def test_token_bucket_starts_full_and_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, capacity=4)
+    now = bucket._updated
+
+    assert bucket.wait_time(4, now) == 0
+    bucket.take(4)
+    assert bucket.wait_time(1, now) == pytest.approx(0.5)
+    assert bucket.wait_time(1, now + 0.5) == 0
+    assert bucket.wait_time(4, now + 0.5) == pytest.approx(1.5)
+
+
+def test_token_bucket_caps_at_capacity():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    now = bucket._updated
+
+    assert bucket.wait_time(1, now + 3600) == 0
+    assert bucket.level == 2  # Never refills beyond capacity
+    assert bucket.wait_time(10, now + 3600) == 0  # Oversized requests wait for a full bucket only
+    bucket.take(10)
+    assert bucket.level == 0
+
+
+def test_token_bucket_adjust_refunds_and_overdraws():
+    bucket = TokenBucket(rate=1.0, capacity=10)
+    bucket.take(8)
+    bucket.adjust(-5)  # Estimate was 5 too high
+    assert bucket.level == 7
+    bucket.adjust(9)  # Real usage was 9 more than estimated
+    assert bucket.level == -2
+    bucket.adjust(-100)
+    assert bucket.level == 10
+
+
+def test_rate_limiter_spreads_requests_beyond_the_burst():
+    limiter = RateLimiter("test", requests_per_minute=600)  # 10/s, burst of BURST_SECONDS * 10
+
+    burst = int(600 / 60 * ratelimit.BURST_SECONDS)
+    assert sum(limiter.acquire() for _ in range(burst)) < 0.05
+    assert limiter.acquire() == pytest.approx(0.1, abs=0.05)
+
+
+def test_rate_limiter_token_budget():
+    limiter = RateLimiter("test", requests_per_minute=6000, tokens_per_minute=600)  # 10 tokens/s, 100 burst
+    assert limiter.acquire(tokens=100) < 0.05
+    assert limiter.acquire(tokens=2) == pytest.approx(0.2, abs=0.05)
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str):
+        super().__init__("429 Too Many Requests")
+        self.headers = {"retry-after": retry_after}
+
+
+def test_rate_limiter_retries_rate_limits_and_transient_errors(monkeypatch):
+    monkeypatch.setattr(ratelimit, "BACKOFF_BASE_S", 0.001)
+    limiter = RateLimiter("test", requests_per_minute=6000)
+    failures = [RateLimited("0"), TimeoutError("timed out")]
+
+    def flaky():
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+
+    assert limiter.call(flaky, retries=2) == "ok"
+    assert not failures
+
+
+def test_rate_limiter_does_not_retry_other_errors_or_long_retry_after():
+    limiter = RateLimiter("test", requests_per_minute=6000)
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.call(broken)
+    assert len(calls) == 1
+
+    def quota_exhausted():
+        calls.append(1)
+        raise RateLimited(str(ratelimit.MAX_RETRY_AFTER_S + 1))  # e.g. a daily quota
+
+    with pytest.raises(RateLimited):
+        limiter.call(quota_exhausted)
+    assert len(calls) == 2
+
+
+def test_classify_and_retry_after():
+    assert ratelimit.classify(RateLimited("1")) == "rate_limit"
+    assert ratelimit.classify(Exception("503 Service temporarily unavailable")) == "transient"
+    assert ratelimit.classify(ConnectionError()) == "transient"
+    assert ratelimit.classify(ValueError("nope")) is None
+
+    assert ratelimit.retry_after(RateLimited("12")) == 12
+    assert ratelimit.retry_after(Exception('RESOURCE_EXHAUSTED "retryDelay": "23s"')) == 23
+    assert ratelimit.retry_after(Exception("no hint")) is None
@@ -0,0 +1,53 @@
+"""Tests for response_cache.py"""
+
+import response_cache
+from response_cache import ResponseCache, request_key, ttl_for
+
+VIDEOS_URI = "https://youtube.googleapis.com/youtube/v3/videos?part=snippet%2Cstatistics&id=a%2Cb&key=SECRET&alt=json"
+
+
+def test_request_key_ignores_order_whitespace_and_api_key():
+    reordered = "https://other.host/youtube/v3/videos?alt=json&id=a%2Cb%20&key=OTHER&part=snippet%2Cstatistics"
+    assert request_key("youtube.videos.list", VIDEOS_URI) == request_key("youtube.videos.list", reordered)
+    assert "SECRET" not in request_key("youtube.videos.list", VIDEOS_URI)
+    assert request_key("youtube.videos.list", VIDEOS_URI) != request_key("youtube.search.list", VIDEOS_URI)
+
+
+def test_statistics_expire_sooner_than_details():
+    details_only = "https://x/videos?part=snippet%2CcontentDetails&id=a"
+    assert ttl_for("youtube.videos.list", details_only) == response_cache.ENDPOINT_TTLS["youtube.videos.list"]
+    assert ttl_for("youtube.videos.list", VIDEOS_URI) == response_cache.STATISTICS_TTL
+    assert ttl_for("youtube.search.list", "https://x/search?q=a") == response_cache.DAY
+
+
+def test_get_put_and_expiry(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    assert cache.get("youtube.videos.list", VIDEOS_URI) is None
+    cache.put("youtube.videos.list", VIDEOS_URI, {"items": [{"id": "a", "title": "Wand ✓"}]})
+
+    assert cache.contains("youtube.videos.list", VIDEOS_URI)
+    assert cache.get("youtube.videos.list", VIDEOS_URI) == {"items": [{"id": "a", "title": "Wand ✓"}]}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    now = response_cache.time.time()
+    monkeypatch.setattr(response_cache.time, "time", lambda: now + response_cache.STATISTICS_TTL + 1)
+    assert not cache.contains("youtube.videos.list", VIDEOS_URI)
+    assert cache.get("youtube.videos.list", VIDEOS_URI) is None
+
+
+def test_shared_file_between_instances(tmp_path):
+    ResponseCache(tmp_path / "cache.sqlite").put("youtube.search.list", "https://x/search?q=a", {"items": []})
+    assert ResponseCache(tmp_path / "cache.sqlite").get("youtube.search.list", "https://x/search?q=a") == {"items": []}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=250)
+    body = {"text": "x" * 100}
+    cache.put("youtube.search.list", "https://x/search?q=old", body)
+    cache.put("youtube.search.list", "https://x/search?q=used", body)
+    cache.get("youtube.search.list", "https://x/search?q=old")  # Now the most recently used
+    cache.put("youtube.search.list", "https://x/search?q=new", body)
+
+    assert cache.contains("youtube.search.list", "https://x/search?q=old")
+    assert not cache.contains("youtube.search.list", "https://x/search?q=used")
+    assert cache.contains("youtube.search.list", "https://x/search?q=new")
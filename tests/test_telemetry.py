@@ -0,0 +1,160 @@
+"""Tests for telemetry.py"""
+
+import json
+import threading
+
+import pytest
+
+import telemetry
+from telemetry import Histogram, Recorder
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2]
+    assert histogram.as_dict() == {"buckets": {"0.1": 1, "1.0": 2}, "sum": 5.55, "count": 3}
+
+
+def test_nested_spans_keep_their_parent():
+    recorder = Recorder("test")
+    with recorder.span("search", domain="trockenbau") as attrs:
+        outer = recorder.current_span()
+        with recorder.span("details"):
+            pass
+        attrs["videos"] = 3
+    assert recorder.current_span() is None
+
+    details, search = recorder.spans  # Recorded when they end
+    assert details["parent"] == search["id"] == outer
+    assert search["parent"] is None
+    assert search["attrs"] == {"domain": "trockenbau", "videos": 3}
+    assert search["duration_s"] >= details["duration_s"]
+    assert recorder.stage_totals()["search"]["count"] == 1
+
+    # Every span also feeds the duration histogram, labelled with the known attributes
+    histogram = recorder.histograms[("span_duration_seconds", (("domain", "trockenbau"), ("span", "search")))]
+    assert histogram.count == 1
+
+
+def test_span_records_the_error_and_reraises():
+    recorder = Recorder("test")
+    with pytest.raises(KeyError), recorder.span("describe"):
+        raise KeyError("video")
+    assert recorder.spans[0]["error"] == "KeyError"
+
+
+def test_each_thread_has_its_own_span_stack():
+    recorder = Recorder("test")
+
+    def work():
+        with recorder.span("worker"):
+            pass
+
+    with recorder.span("main"):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    worker = next(span for span in recorder.spans if span["name"] == "worker")
+    assert worker["parent"] is None
+
+
+def test_spans_beyond_the_limit_are_only_counted(monkeypatch):
+    monkeypatch.setattr(telemetry, "MAX_SPANS", 2)
+    recorder = Recorder("test")
+    for _ in range(5):
+        recorder.record_span("call", 0.0, 0.1)
+    assert len(recorder.spans) == 2
+    assert recorder.dropped_spans == 3
+    assert recorder.histograms[("span_duration_seconds", (("span", "call"),))].count == 5
+
+
+def test_counters_add_up_per_label_set():
+    recorder = Recorder("test")
+    recorder.count("youtube_api_calls_total", endpoint="search")
+    recorder.count("youtube_api_calls_total", endpoint="search")
+    recorder.count("youtube_quota_units_total", 100, endpoint="search")
+    counters = {(c["name"], c["labels"].get("endpoint")): c["value"] for c in recorder.report()["counters"]}
+    assert counters == {("youtube_api_calls_total", "search"): 2, ("youtube_quota_units_total", "search"): 100}
+
+
+def test_merge_adds_a_worker_report_with_labels():
+    worker = Recorder("worker")
+    with worker.span("search"), worker.span("details"):
+        pass
+    worker.count("youtube_api_calls_total", 3)
+    worker.observe("youtube_request_duration_seconds", 0.2)
+
+    parent = Recorder("parent")
+    parent.count("youtube_api_calls_total", 1, domain="fliesen")
+    parent.merge(json.loads(json.dumps(worker.report())), domain="fliesen")  # Reports cross process boundaries
+    parent.merge(worker.report(), domain="fliesen")
+
+    assert parent.counters[("youtube_api_calls_total", (("domain", "fliesen"),))] == 7
+    histogram = parent.histograms[("youtube_request_duration_seconds", (("domain", "fliesen"),))]
+    assert histogram.count == 2
+    assert histogram.sum == pytest.approx(0.4)
+
+    details = [span for span in parent.spans if span["name"] == "details"]
+    searches = {span["id"] for span in parent.spans if span["name"] == "search"}
+    assert len(details) == 2
+    assert {span["parent"] for span in details} == searches  # IDs are remapped, the tree is kept
+    assert all(span["attrs"]["domain"] == "fliesen" for span in parent.spans)
+
+
+def test_prometheus_text_format():
+    recorder = Recorder("curator")
+    recorder.count("youtube_api_calls_total", 2, endpoint='say "hi"')
+    recorder.observe("youtube_request_duration_seconds", 0.03)
+    lines = recorder.prometheus().splitlines()
+
+    assert "# HELP diy_video_finder_youtube_api_calls_total YouTube Data API requests sent" in lines
+    assert "# TYPE diy_video_finder_youtube_api_calls_total counter" in lines
+    assert 'diy_video_finder_youtube_api_calls_total{run="curator",endpoint="say \\"hi\\""} 2' in lines
+    assert 'diy_video_finder_youtube_request_duration_seconds_bucket{run="curator",le="0.025"} 0' in lines
+    assert 'diy_video_finder_youtube_request_duration_seconds_bucket{run="curator",le="0.05"} 1' in lines
+    assert 'diy_video_finder_youtube_request_duration_seconds_bucket{run="curator",le="+Inf"} 1' in lines
+    assert 'diy_video_finder_youtube_request_duration_seconds_count{run="curator"} 1' in lines
+    assert "# TYPE diy_video_finder_run_duration_seconds gauge" in lines
+
+
+def test_write_reports_keeps_the_latest_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "KEEP_REPORTS", 2)
+    for stamp in ("20260101-000000", "20260102-000000"):
+        (tmp_path / f"curator-{stamp}.json").write_text("{}", encoding="utf-8")
+
+    recorder = Recorder("curator", domain="trockenbau")
+    with recorder.span("search"):
+        pass
+    report_path, metrics_path = recorder.write_reports(tmp_path)
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["attrs"] == {"domain": "trockenbau"}
+    assert report["stages"]["search"]["count"] == 1
+    assert metrics_path.read_text(encoding="utf-8") == (tmp_path / "latest-curator.prom").read_text(encoding="utf-8")
+    assert (tmp_path / "latest-curator.json").exists()
+    assert sorted(p.name for p in tmp_path.glob("curator-*.json")) == ["curator-20260102-000000.json", report_path.name]
+
+
+def test_module_level_recorder_and_listeners(monkeypatch):
+    monkeypatch.setattr(telemetry, "_recorder", telemetry.get_recorder())  # Restored afterwards
+    seen = []
+
+    def listener(name, duration, attrs):
+        seen.append((name, attrs))
+
+    recorder = telemetry.start_run("test")
+    assert telemetry.get_recorder() is recorder
+    telemetry.add_span_listener(listener)
+    try:
+        with telemetry.span("save", videos=2):
+            telemetry.count("llm_requests_total")
+    finally:
+        telemetry.remove_span_listener(listener)
+    with telemetry.span("after"):
+        pass
+
+    assert seen == [("save", {"videos": 2})]
+    assert recorder.counters[("llm_requests_total", ())] == 1
+    assert recorder.summary().startswith(("save", "after"))
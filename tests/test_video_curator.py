@@ -0,0 +1,16 @@
+"""Tests for video_curator.py (parts that run without crewai)"""
+
+import video_curator
+import youtube_client
+
+
+def test_quota_plan_covers_every_researched_video(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(youtube_client, "_ledger", None)  # Restored after the test
+    youtube_client.configure_quota(path=tmp_path / "ledger.json")
+    video_curator.print_quota_plan(video_curator.parse_args(["--max-videos", "10"]))
+    plan = capsys.readouterr().out
+
+    # 5 searches x 15 results = 75 IDs are prefetched: 2 videos.list calls, whatever --max-videos is
+    researched = video_curator.PLANNED_SEARCHES * video_curator.RESULTS_PER_SEARCH
+    assert f"≤2 batched videos.list for ≤{researched} researched IDs" in plan
+    assert f"~{video_curator.PLANNED_SEARCHES * 101 + 2} units" in plan
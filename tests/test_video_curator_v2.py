@@ -0,0 +1,510 @@
+"""Tests for video_curator_v2.py (no network: API calls are replaced per test)"""
+
+import dataclasses
+import random
+import sys
+import threading
+import types
+
+import pytest
+
+import video_curator_v2 as v2
+from catalog import Catalog
+
+# =============================================================================
+# CONCURRENT SEARCH
+# =============================================================================
+
+QUERIES = [f"query {i}" for i in range(8)]
+
+
+class RecordingSearch:
+    """search_fn stand-in that records which queries were started"""
+
+    def __init__(self, results_per_query: int = 10):
+        self.started = []
+        self.results_per_query = results_per_query
+        self._lock = threading.Lock()
+
+    def __call__(self, query: str, max_results: int = 15) -> list:
+        with self._lock:
+            self.started.append(query)
+        return [f"{query}-{i}" for i in range(self.results_per_query)]
+
+
+def test_concurrent_search_keeps_query_order():
+    search = RecordingSearch()
+    results = list(v2.search_queries_concurrent(QUERIES, max_workers=3, search_fn=search))
+
+    assert [query for query, _ in results] == QUERIES
+    assert results[2][1] == search("query 2")
+
+
+def test_concurrent_search_stops_submitting_when_caller_stops():
+    search = RecordingSearch()
+    search_results = v2.search_queries_concurrent(QUERIES, max_workers=2, search_fn=search)
+    for _query, _results in search_results:
+        break
+    search_results.close()
+
+    # Only the first window (max_workers queries) was ever submitted
+    assert set(search.started) <= set(QUERIES[:2])
+    assert "query 0" in search.started
+
+
+def test_concurrent_search_checks_quota_before_each_submit(monkeypatch):
+    allowed = iter([True, True, True, False])
+    monkeypatch.setattr(v2, "_quota_allows", lambda method_id: next(allowed, False))
+    search = RecordingSearch()
+
+    results = list(v2.search_queries_concurrent(QUERIES, max_workers=2, search_fn=search))
+
+    assert [query for query, _ in results] == QUERIES[:3]
+    assert sorted(search.started) == QUERIES[:3]
+
+
+def test_two_phase_search_stops_at_candidate_cap(monkeypatch):
+    search = RecordingSearch(results_per_query=10)
+    monkeypatch.setattr(v2, "search_video_ids", search)
+    monkeypatch.setattr(v2, "fetch_video_details", lambda video_ids: [])
+
+    for max_workers in (1, 2):
+        search.started.clear()
+        _, stats = v2.search_two_phase(QUERIES, set(), max_candidates=10, max_workers=max_workers)
+
+        # Cap reached after the first query: no search.list beyond the in-flight window
+        assert stats["candidates"] == 10
+        assert set(search.started) <= set(QUERIES[:max_workers])
+
+
+# =============================================================================
+# STREAMING SEARCH
+# =============================================================================
+
+
+class PagedSearch:
+    """iter_search_pages / fetch_video_details stand-ins that record every page and details call"""
+
+    def __init__(self, pages: dict):
+        self.pages = pages
+        self.requested = []
+        self.detailed = []
+
+    def iter_search_pages(self, query: str, max_results: int = 10, max_pages: int = 3):
+        for page, video_ids in enumerate(self.pages[query][:max_pages], start=1):
+            self.requested.append((query, page))
+            yield video_ids
+
+    def fetch_video_details(self, video_ids: list) -> list:
+        self.detailed.append(list(video_ids))
+        return [v2.VideoRecord(id=video_id, title=f"Trockenbau {video_id}", channel="Knauf") for video_id in video_ids]
+
+
+@pytest.fixture
+def paged_search(monkeypatch):
+    search = PagedSearch({"a": [["a1", "a2"], ["a3", "b1"]], "b": [["b1", "b1", "old"]], "c": []})
+    monkeypatch.setattr(v2, "iter_search_pages", search.iter_search_pages)
+    monkeypatch.setattr(v2, "fetch_video_details", search.fetch_video_details)
+    return search
+
+
+def test_stream_pages_breadth_first_and_skips_seen_ids(paged_search):
+    seen_ids = {"old"}
+    videos = list(v2.stream_scored_videos(["a", "b", "c"], seen_ids, TROCKENBAU, max_pages=2))
+
+    assert paged_search.requested == [("a", 1), ("b", 1), ("a", 2)]
+    assert paged_search.detailed == [["a1", "a2"], ["b1"], ["a3"]]  # Duplicates and seen IDs never fetched
+    assert [video.id for video in videos] == ["a1", "a2", "b1", "a3"]
+    assert seen_ids == {"old", "a1", "a2", "a3", "b1"}
+    assert all(video.rating == v2.calculate_trust_score(video, TROCKENBAU) for video in videos)
+
+
+def test_stream_is_lazy_and_stops_at_the_quota(paged_search, monkeypatch):
+    stream = v2.stream_scored_videos(["a", "b"], set(), TROCKENBAU)
+    assert next(stream).id == "a1"
+    assert paged_search.requested == [("a", 1)]  # Nothing requested beyond the first page yet
+    stream.close()
+
+    allowed = iter([True, True])
+    monkeypatch.setattr(v2, "_quota_allows", lambda method_id: next(allowed, False))
+    videos = list(v2.stream_scored_videos(["a", "b"], set(), TROCKENBAU))
+    assert [video.id for video in videos] == ["a1", "a2", "b1", "old"]
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+
+def test_stream_and_batch_details_are_rejected(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        v2.parse_args(["--stream", "--batch-details"])
+    assert exit_info.value.code == 2
+    assert "cannot be combined" in capsys.readouterr().err
+
+
+def test_plan_runs_without_api_key(monkeypatch, tmp_path, capsys):
+    import quota
+    import response_cache
+    import youtube_client
+
+    monkeypatch.delenv("YOUTUBE_API_KEY", raising=False)
+    monkeypatch.delenv(youtube_client.ENDPOINT_ENV, raising=False)
+    monkeypatch.setattr(v2, "YOUTUBE_API_KEY", None)
+    # Real main(): only the state files move to tmp_path (restored afterwards)
+    monkeypatch.setattr(response_cache, "DEFAULT_CACHE_PATH", tmp_path / "cache.sqlite")
+    monkeypatch.setattr(quota, "DEFAULT_LEDGER_PATH", tmp_path / "ledger.json")
+    for name in ("_cache", "_ledger", "_service"):
+        monkeypatch.setattr(youtube_client, name, None)
+    monkeypatch.setattr(v2, "args", None)
+
+    assert v2.main(["--plan"]) == 0  # Default --cache-mode use probes the cache
+    output = capsys.readouterr().out
+    assert "QUOTA PLAN (no API calls made)" in output
+    queries = v2.DOMAINS[v2.ACTIVE_DOMAIN].queries
+    assert f"search.list: {len(queries)} calls" in output
+    assert youtube_client._service is None  # No API client was built
+
+    assert v2.main([]) == 1
+
+
+# =============================================================================
+# CATEGORIES
+# =============================================================================
+
+TROCKENBAU = v2.DOMAINS["trockenbau"]
+
+# Titles on which the keyword index must agree with the old substring scorer
+CATEGORY_TITLES = [
+    "Trockenbau Grundlagen für Anfänger",
+    "Erste Schritte im Trockenbau",
+    "Ständerwand bauen - Schritt für Schritt",
+    "Trennwand mit CW Profilen stellen",
+    "Wandaufbau mit CW Profilen",
+    "Trockenbauwand selber bauen",
+    "Trockenbauwandverkleidung richtig anbringen",
+    "Vorwandinstallation im Bad",
+    "Rigips Decke montieren Tutorial",
+    "Decken abhängen mit Direktabhänger",
+    "Deckenverkleidung aus Gipskarton",
+    "Deckenmontage mit dem Plattenheber",
+    "Gipskarton spachteln Anleitung",
+    "Fugen verspachteln und schleifen",
+    "Fugenspachtel im Test",
+    "Q4 Finish für glatte Wände",
+    "Dachausbau Trockenbau Dämmung",
+    "Dachschräge verkleiden Wand Anschluss",
+    "Dachfenster einbauen und verkleiden",
+    "Dämmung zwischen den Sparren",
+    "Attic conversion drywall basics",
+    "Türzarge im Trockenbau setzen",
+    "Türöffnung in der Ständerwand",
+    "Haustür abdichten",
+    "Werkzeugkoffer für den Trockenbau",
+    "Die besten Tools für Trockenbauer",
+    "Schrauben für Gipskarton: welche Material-Stärke?",
+    "Drywall ceiling installation",
+    "How to hang a door in a wall",
+    "Rigips schneiden und befestigen",
+]
+
+# Word-boundary cases where the keyword index deliberately differs
+INTENDED_CATEGORY_CHANGES = {
+    "Das dachte ich auch": ("dachausbau", "grundlagen"),  # "dachte" is not "dach" + compound part
+    "Ein Gewand nähen": ("waende", "grundlagen"),  # "gewand": too short a head before "wand"
+    "Tuer einbauen ohne Profi": ("grundlagen", "tueren"),  # ue spelling folds to "tür"
+    "Erste Schrittedecke": ("grundlagen", "decken"),  # "erste schritte" only counts as words
+}
+
+
+def substring_category(title: str) -> str:
+    """The scorer before the keyword index: every keyword as a plain substring"""
+    text = title.lower()
+    best_category, best_matches = "grundlagen", 0
+    for category in TROCKENBAU.categories:
+        matches = sum(1 for keyword in category.keywords if keyword in text)
+        if matches > best_matches:
+            best_category, best_matches = category.id, matches
+    return best_category
+
+
+def categorize(title: str) -> str:
+    return v2.categorize_video(v2.VideoRecord(id="x", title=title), TROCKENBAU)
+
+
+def test_keyword_index_matches_substring_scorer():
+    for title in CATEGORY_TITLES:
+        assert categorize(title) == substring_category(title), title
+
+
+def test_keyword_index_word_boundary_changes():
+    for title, (before, after) in INTENDED_CATEGORY_CHANGES.items():
+        assert substring_category(title) == before, title
+        assert categorize(title) == after, title
+
+
+def test_keyword_index_matches_compound_heads_and_middles():
+    assert v2.rank_categories(v2.VideoRecord(id="x", title="Dachfenster"), TROCKENBAU) == [("dachausbau", 1)]
+    assert v2.rank_categories(v2.VideoRecord(id="x", title="Wandaufbau mit CW Profilen"), TROCKENBAU) == [
+        ("waende", 1),
+        ("werkzeuge", 1),
+    ]
+    assert categorize("Gipskartonwandaufbau") == "waende"
+
+
+# =============================================================================
+# LLM DESCRIPTIONS
+# =============================================================================
+
+
+def test_llm_clients_get_a_request_timeout(monkeypatch):
+    created = {}
+
+    class Client:
+        def __init__(self, **kwargs):
+            created.update(kwargs)
+
+    genai = types.ModuleType("google.genai")
+    genai.Client = Client
+    google = sys.modules.get("google") or types.ModuleType("google")
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.genai", genai)
+    monkeypatch.setattr(google, "genai", genai, raising=False)
+    monkeypatch.setattr(v2, "_llm_clients", {})
+
+    v2._get_llm_client("gemini")
+    assert created["http_options"]["timeout"] == v2.LLM_STREAM_TIMEOUT * 1000
+
+
+def described(video_id: str) -> v2.VideoRecord:
+    return v2.VideoRecord(id=video_id, title=f"Video {video_id}", description_de="de", description_en="en")
+
+
+def test_description_cache_save_keeps_entries_of_other_writers(tmp_path):
+    path = tmp_path / "descriptions.json"
+    first, second = v2.DescriptionCache(path), v2.DescriptionCache(path)
+    first.put(described("a"), "model")
+    second.put(described("b"), "model")
+    first.save()
+    second.save()
+
+    reloaded = v2.DescriptionCache(path)
+    assert reloaded.get(described("a"), "model") == {"de": "de", "en": "en"}
+    assert reloaded.get(described("b"), "model") == {"de": "de", "en": "en"}
+
+
+def test_description_cache_concurrent_saves(tmp_path):
+    path = tmp_path / "descriptions.json"
+
+    def writer(n: int) -> None:
+        for i in range(10):
+            cache = v2.DescriptionCache(path)
+            cache.put(described(f"{n}-{i}"), "model")
+            cache.save()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(v2.DescriptionCache(path).entries) == 40
+
+
+STREAMED_ANSWER = """```json
+[
+  {"de": "Wand {mit} \\"Profilen\\"", "en": "Wall [with] profiles"},
+  {"de": "Decke", "en": "Ceiling", "extra": {"nested": [1, 2]}},
+  {"de": "kaputt" "en": "broken"},
+  {"de": "Ende", "en": "End"}
+]
+```
+{"ignored": true}"""
+
+
+def test_json_array_stream_same_objects_for_any_split():
+    parser = v2.JsonArrayStream()
+    expected = parser.feed(STREAMED_ANSWER)
+    assert parser.finished
+
+    for size in (1, 2, 3, 7, 50):
+        parser = v2.JsonArrayStream()
+        objects = []
+        for start in range(0, len(STREAMED_ANSWER), size):
+            objects.extend(parser.feed(STREAMED_ANSWER[start : start + size]))
+        assert objects == expected, size
+
+
+def test_json_array_stream_bad_input():
+    objects = v2.JsonArrayStream().feed(STREAMED_ANSWER)
+    assert objects[0] == {"de": 'Wand {mit} "Profilen"', "en": "Wall [with] profiles"}
+    assert objects[1]["extra"] == {"nested": [1, 2]}
+    assert objects[2] is None  # Invalid object keeps its position
+    assert objects[3] == {"de": "Ende", "en": "End"}
+    assert len(objects) == 4  # Nothing after the closing "]"
+
+    no_array = v2.JsonArrayStream()
+    assert no_array.feed('{"de": "x"} no array here') == []
+    assert not no_array.started
+
+    truncated = v2.JsonArrayStream()
+    assert truncated.feed('[{"de": "a", "en": "b"}, {"de": "c"') == [{"de": "a", "en": "b"}]
+    assert not truncated.finished
+
+
+# =============================================================================
+# SCORING + SELECTION
+# =============================================================================
+
+
+def random_videos(count: int, seed: int = 0) -> list:
+    rnd = random.Random(seed)
+    titles = ["Trockenbau Wand bauen", "KRASS! Dieser Trick", "50 Euro gespart mit Rigips", "Decke abhängen"]
+    channels = ["Knauf DIY", "OBI Baumarkt", "Heimwerker Max", "Sven baut"]
+    durations = ["PT45S", "PT2M30S", "PT4M", "PT12M5S", "PT25M", "PT45M", "PT1H5M", "P0D", ""]
+    return [
+        v2.VideoRecord(
+            id=f"v{i}",
+            title=rnd.choice(titles),
+            channel=rnd.choice(channels),
+            views=rnd.choice([0, 49_999, 50_000, 100_000, 499_999, 500_000, 1_000_000, rnd.randint(0, 2_000_000)]),
+            likes=rnd.randint(0, 10_000),
+            duration=rnd.choice(durations),
+            rating=rnd.choice([4.0, 4.3, 4.5, 5.0]),
+        )
+        for i in range(count)
+    ]
+
+
+def test_top_k_selector_matches_sorted():
+    videos = random_videos(500)
+    for k in (0, 1, 7, 100, 600):
+        selector = v2.TopKSelector(k)
+        for video in videos:
+            selector.push(video)
+
+        expected = sorted(videos, key=lambda v: (v.rating, v.views), reverse=True)[:k]
+        assert [v.id for v in selector.best()] == [v.id for v in expected], k
+        assert selector.seen == len(videos)
+
+
+def test_score_batch_matches_scalar_scores():
+    np = pytest.importorskip("numpy")
+    videos = random_videos(300, seed=1)
+
+    columns = v2.score_columns(videos, TROCKENBAU)
+    batch = v2.score_batch(**columns)
+    scalar = np.array([v2.calculate_trust_score(video, TROCKENBAU) for video in videos])
+
+    assert np.array_equal(batch, scalar)
+
+
+# =============================================================================
+# INCREMENTAL UPDATES
+# =============================================================================
+
+
+def catalog_entry(rating: float, category: str, title: str = "Trockenbau Wand", views: int = 1000) -> dict:
+    return {
+        "title": {"de": title, "en": f"{title} (en)"},
+        "description": {"de": "Beschreibung", "en": "Description"},
+        "rating": rating,
+        "views": views,
+        "category": category,
+        "channel": "Knauf",
+    }
+
+
+def test_category_caps_keep_the_best_and_prefer_existing_on_ties(tmp_path):
+    catalog = Catalog(tmp_path / "catalog.json", tmp_path / "videos.js")
+    catalog.upsert("old-low", catalog_entry(4.0, "waende"))
+    catalog.upsert("old-tie", catalog_entry(4.5, "waende"))
+    catalog.upsert("old-decke", catalog_entry(3.0, "decken"))
+    new_videos = [
+        v2.VideoRecord(id="new-best", rating=5.0, category="waende"),
+        v2.VideoRecord(id="new-tie", rating=4.5, category="waende"),
+        v2.VideoRecord(id="new-decke", rating=2.0, category="decken"),
+    ]
+
+    dropped_ids, kept = v2.apply_category_caps(catalog, new_videos, 2)
+
+    assert dropped_ids == ["old-low"]
+    assert [video.id for video in kept] == ["new-best", "new-decke"]
+    assert v2.apply_category_caps(catalog, new_videos, 0) == ([], new_videos)
+
+
+def fetched(video_id: str, title: str = "Trockenbau Wand", views: int = 1000) -> v2.VideoRecord:
+    return v2.VideoRecord(id=video_id, title=title, description="Von YouTube", channel="Knauf", views=views)
+
+
+def test_refresh_existing_rescores_only_changed_videos(tmp_path, monkeypatch):
+    catalog = Catalog(tmp_path / "catalog.json", tmp_path / "videos.js")
+    for video_id in ("same", "views", "renamed", "gone"):
+        catalog.upsert(video_id, catalog_entry(3.0, "grundlagen"))
+    requested = []
+
+    def fetch_video_details(video_ids):
+        requested.extend(video_ids)
+        return [fetched("same"), fetched("views", views=80_000), fetched("renamed", title="Decke abhängen")]
+
+    monkeypatch.setattr(v2, "fetch_video_details", fetch_video_details)
+    updated, retitled = v2.refresh_existing(catalog, TROCKENBAU)
+
+    assert requested == ["same", "views", "renamed", "gone"]
+    assert [video.id for video in updated] == ["views"]
+    assert [video.id for video in retitled] == ["renamed"]
+
+    video = updated[0]
+    assert video.rating == v2.calculate_trust_score(video, TROCKENBAU)
+    assert video.category == "waende"
+    assert (video.title_en, video.description_de) == ("Trockenbau Wand (en)", "Beschreibung")  # Not described again
+    assert retitled[0].category == "decken"
+    assert retitled[0].description_de == ""  # Needs a new description
+
+
+@pytest.fixture
+def incremental_run(monkeypatch, tmp_path):
+    """main() with searches, details and the shard paths replaced; returns run(search results, details)"""
+    import catalog as catalog_module
+    import quota
+    import youtube_client
+
+    paths = (tmp_path / "catalog.json", tmp_path / "videos.js")
+    monkeypatch.setattr(catalog_module, "shard_paths", lambda domain: paths)
+    monkeypatch.setattr(quota, "DEFAULT_LEDGER_PATH", tmp_path / "ledger.json")
+    for name in ("_cache", "_ledger", "_service"):
+        monkeypatch.setattr(youtube_client, name, None)
+    monkeypatch.setattr(v2, "YOUTUBE_API_KEY", "test")
+    monkeypatch.setattr(v2, "args", None)
+    monkeypatch.setitem(v2.DOMAINS, "trockenbau", dataclasses.replace(TROCKENBAU, queries=("trockenbau",)))
+
+    def run(results: list, details: list) -> Catalog:
+        monkeypatch.setattr(v2, "search_youtube", lambda query, max_results=10: list(results))
+        monkeypatch.setattr(v2, "fetch_video_details", lambda video_ids: [v for v in details if v.id in video_ids])
+        options = ["--incremental", "--skip-llm", "--cache-mode", "off", "--concurrency", "1"]
+        assert v2.main([*options, "--max-per-category", "0", "--report-dir", str(tmp_path / "runs")]) == 0
+        return Catalog(*paths)
+
+    return run
+
+
+def test_incremental_run_adds_new_and_refreshes_changed_videos(incremental_run, capsys):
+    first = incremental_run([fetched("a"), fetched("b", title="Decke abhängen")], [])
+    assert list(first.videos) == ["a", "b"]
+    first_text = first.path.read_text(encoding="utf-8")
+
+    # Same results, same stats: nothing is described or written
+    assert incremental_run([fetched("a")], [fetched("a"), fetched("b", title="Decke abhängen")]).videos == first.videos
+    assert "Catalog unchanged" in capsys.readouterr().out
+    assert first.path.read_text(encoding="utf-8") == first_text
+
+    # One new video, one existing video with more views: only those two change
+    third = incremental_run(
+        [fetched("c", title="Gipskarton spachteln")],
+        [fetched("a", views=90_000), fetched("b", title="Decke abhängen")],
+    )
+    assert list(third.videos) == ["a", "b", "c"]
+    assert third.get("a")["views"] == 90_000
+    assert third.get("a")["description"] == first.get("a")["description"]
+    assert third.get("b") == first.get("b")
+    assert third.get("c")["description"]["de"] == "Von YouTube"
@@ -0,0 +1,107 @@
+"""Tests for youtube_client.py (requests are stand-ins, nothing is sent)"""
+
+import threading
+
+import pytest
+
+import youtube_client
+from quota import QuotaExceededError
+
+
+class FakeRequest:
+    """Just enough of a googleapiclient HttpRequest for execute()"""
+
+    def __init__(self, method_id: str = "youtube.videos.list", uri: str = "https://x/videos?id=a&part=snippet"):
+        self.methodId = method_id
+        self.uri = uri
+        self.sent = []
+
+    def execute(self, http=None):
+        self.sent.append(http)
+        return {"items": [{"id": "a"}]}
+
+
+class QuotaError(Exception):
+    def __init__(self):
+        super().__init__("quota")
+        self.resp = type("Response", (), {"status": 403})()
+        self.content = b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}'
+
+
+@pytest.fixture(autouse=True)
+def isolated_client(monkeypatch):
+    """No cache or ledger unless a test configures one; module state is restored afterwards"""
+    for name, value in (("_cache", None), ("_cache_mode", "off"), ("_ledger", None), ("_service", None)):
+        monkeypatch.setattr(youtube_client, name, value)
+    monkeypatch.setattr(youtube_client, "_thread_local", threading.local())
+    monkeypatch.delenv(youtube_client.ENDPOINT_ENV, raising=False)
+
+
+def test_get_youtube_builds_the_service_once():
+    pytest.importorskip("googleapiclient")
+    service = youtube_client.get_youtube("key")
+    assert youtube_client.get_youtube("key") is service
+    assert youtube_client.get_youtube("other key") is not service
+
+
+def test_each_thread_gets_its_own_connection():
+    pytest.importorskip("httplib2")
+    connections = []
+
+    def send():
+        request = FakeRequest()
+        youtube_client.execute(request)
+        youtube_client.execute(request)
+        connections.extend(request.sent)
+
+    threads = [threading.Thread(target=send) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(connections) == 6
+    assert len({id(http) for http in connections}) == 3  # Reused within a thread, never shared
+
+
+def test_execute_serves_cache_hits_without_sending(tmp_path):
+    pytest.importorskip("httplib2")
+    youtube_client.configure_cache("use", path=tmp_path / "cache.sqlite")
+
+    first, second = FakeRequest(), FakeRequest()
+    assert youtube_client.execute(first) == youtube_client.execute(second)
+    assert len(first.sent) == 1
+    assert second.sent == []
+
+    youtube_client.configure_cache("refresh")
+    refreshed = FakeRequest()
+    youtube_client.execute(refreshed)
+    assert len(refreshed.sent) == 1  # refresh ignores cached entries
+
+
+def test_execute_charges_the_ledger_and_stops_at_the_budget(tmp_path):
+    pytest.importorskip("httplib2")
+    ledger = youtube_client.configure_quota(budget=101, path=tmp_path / "ledger.json")
+
+    youtube_client.execute(FakeRequest("youtube.search.list"))
+    youtube_client.execute(FakeRequest("youtube.videos.list"))
+    blocked = FakeRequest("youtube.videos.list")
+    with pytest.raises(QuotaExceededError):
+        youtube_client.execute(blocked)
+
+    assert blocked.sent == []  # Refused before anything was sent
+    assert ledger.run_units == 101
+
+
+def test_quota_error_from_the_api_exhausts_the_ledger(tmp_path):
+    pytest.importorskip("httplib2")
+    ledger = youtube_client.configure_quota(path=tmp_path / "ledger.json")
+
+    class Exhausted(FakeRequest):
+        def execute(self, http=None):
+            raise QuotaError()
+
+    with pytest.raises(QuotaExceededError):
+        youtube_client.execute(Exhausted())
+    assert ledger.exhausted
+    assert not ledger.can_afford("youtube.videos.list")
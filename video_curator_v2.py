@@ -8,19 +8,43 @@ Architecture:
 - Trust-Score system for quality ratings
 - Optional single LLM call for descriptions (batch)
 - Domain-config based (easily extendable to new topics)
+- Several domains (--domain all / a,b) run in parallel worker processes
+- Every stage is traced (telemetry.py): JSON run report + Prometheus metrics
+- --profile: CPU + memory profiles per stage (profiling.py)
 
 Author: DIY Video Finder Team
 """
 
 import argparse
+import hashlib
+import heapq
+import io
+import itertools
 import json
+import multiprocessing
 import os
 import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import redirect_stdout
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlencode
 
 from dotenv import load_dotenv
 
+import ratelimit
+import telemetry
+import youtube_client
+from catalog import Catalog, format_views, render_script
+from domains import DomainConfig, load_domains
+from matching import get_matcher
+from quota import QuotaExceededError, cost_of, file_lock
+
 # Load environment variables
 load_dotenv()
 
@@ -34,94 +58,12 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 # =============================================================================
-# DOMAIN CONFIGURATIONS (Easily extendable!)
+# DOMAIN CONFIGURATIONS (Easily extendable: add a file to domains/)
 # =============================================================================
 
-DOMAINS = {
-    "trockenbau": {
-        "name": {"de": "Trockenbau", "en": "Drywall"},
-        "queries": [
-            "Trockenbau Anleitung Profi",
-            "Rigips Decke montieren Tutorial",
-            "Trockenbau Wand bauen Schritt für Schritt",
-            "Gipskarton spachteln Anleitung",
-            "Dachausbau Trockenbau Dämmung",
-            "Trockenbauwand selber bauen",
-            "Rigips schneiden und befestigen",
-        ],
-        "trust_channels": [
-            "SAINT-GOBAIN RIGIPS",
-            "RIGIPS",
-            "Knauf",
-            "Knauf GmbH",
-            "Knauf DIY",
-            "HORNBACH",
-            "OBI",
-            "OBI Baumarkt",
-            "BAUHAUS",
-            "toom",
-            "toom Baumarkt",
-            "HELLWEG",
-            "Siniat",
-            "Fermacell",
-        ],
-        "categories": {
-            "grundlagen": {
-                "de": "📚 Grundlagen",
-                "en": "📚 Basics",
-                "keywords": ["grundlagen", "basics", "einführung", "anfänger", "erste schritte"],
-            },
-            "waende": {
-                "de": "🧱 Wände",
-                "en": "🧱 Walls",
-                "keywords": ["wand", "ständerwand", "trennwand", "vorwand", "wall"],
-            },
-            "decken": {
-                "de": "⬆️ Decken",
-                "en": "⬆️ Ceilings",
-                "keywords": ["decke", "abhängen", "ceiling", "deckenmontage"],
-            },
-            "spachteln": {
-                "de": "✨ Spachteln",
-                "en": "✨ Finishing",
-                "keywords": ["spachteln", "verspachteln", "fugen", "finish", "schleifen"],
-            },
-            "dachausbau": {
-                "de": "🏠 Dachausbau",
-                "en": "🏠 Attic",
-                "keywords": ["dach", "dachausbau", "dachschräge", "dämmung", "attic"],
-            },
-            "tueren": {
-                "de": "🚪 Türen",
-                "en": "🚪 Doors",
-                "keywords": ["tür", "türzarge", "door", "öffnung"],
-            },
-            "werkzeuge": {
-                "de": "🛠️ Werkzeuge",
-                "en": "🛠️ Tools",
-                "keywords": ["werkzeug", "tool", "schrauben", "profile", "material"],
-            },
-        },
-        "clickbait_patterns": [
-            r"(?i)krass",
-            r"(?i)dieser trick",
-            r"(?i)unfassbar",
-            r"(?i)niemand kennt",
-            r"(?i)geheim",
-            r"(?i)schockierend",
-            r"(?i)\d+\s*(euro|€).*gespart",
-        ],
-    },
-    # Future: Add more domains here
-    # "fliesen": {
-    #     "name": {"de": "Fliesen", "en": "Tiles"},
-    #     "queries": [...],
-    #     "trust_channels": [...],
-    #     ...
-    # },
-}
-
-# Current active domain
+DOMAINS = load_domains()
+
+# Default domain (--domain)
 ACTIVE_DOMAIN = "trockenbau"
 
 
@@ -129,15 +71,162 @@ ACTIVE_DOMAIN = "trockenbau"
 # ARGUMENT PARSING
 # =============================================================================
 
-parser = argparse.ArgumentParser(description="DIY Video Finder v2 - Video Curation")
-parser.add_argument("--domain", type=str, default="trockenbau", help="Domain to curate (default: trockenbau)")
-parser.add_argument("--max-videos", type=int, default=10, help="Maximum videos to add (default: 10)")
-parser.add_argument("--dry-run", action="store_true", help="Don't save, just show what would be added")
-parser.add_argument("--skip-llm", action="store_true", help="Skip LLM descriptions, use YouTube data only")
-parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
 
-args = parser.parse_args()
-ACTIVE_DOMAIN = args.domain
+def parse_args(argv: list | None = None) -> argparse.Namespace:
+    """Parse CLI options (argv=None reads sys.argv, [] gives the defaults)"""
+    parser = argparse.ArgumentParser(description="DIY Video Finder v2 - Video Curation")
+    parser.add_argument(
+        "--domain",
+        type=str,
+        default=ACTIVE_DOMAIN,
+        help=f"Domain to curate, a comma-separated list or 'all' (default: {ACTIVE_DOMAIN})",
+    )
+    parser.add_argument(
+        "--domain-workers",
+        type=int,
+        default=None,
+        help="Worker processes for multi-domain runs (default: one per domain)",
+    )
+    parser.add_argument("--max-videos", type=int, default=10, help="Maximum videos to add (default: 10)")
+    parser.add_argument("--dry-run", action="store_true", help="Don't save, just show what would be added")
+    parser.add_argument("--skip-llm", action="store_true", help="Skip LLM descriptions, use YouTube data only")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    parser.add_argument(
+        "--batch-details",
+        action="store_true",
+        help="Collect IDs from all searches first, then fetch details in batches of 50 (saves quota)",
+    )
+    parser.add_argument(
+        "--cache-mode",
+        choices=["use", "refresh", "off"],
+        default="use",
+        help="YouTube response cache: use (default), refresh (ignore cached entries) or off",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Page through search results lazily and stop once enough videos reach --min-score",
+    )
+    parser.add_argument(
+        "--min-score", type=float, default=4.5, help="Trust score that counts as a strong candidate (default: 4.5)"
+    )
+    parser.add_argument(
+        "--max-pages", type=int, default=3, help="Max result pages per query in --stream mode (default: 3)"
+    )
+    parser.add_argument(
+        "--quota-budget",
+        type=int,
+        default=None,
+        help="Max YouTube quota units this run may spend (default: daily quota)",
+    )
+    parser.add_argument(
+        "--plan", action="store_true", help="Print the projected quota spend and exit without API calls"
+    )
+    parser.add_argument("--llm-concurrency", type=int, default=3, help="Parallel LLM description requests (default: 3)")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Parallel YouTube searches (default: 4, 1 = sequential)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Add new videos to the existing catalog instead of replacing it and re-score existing ones whose "
+        "title or stats changed (only new or retitled videos get new descriptions)",
+    )
+    parser.add_argument(
+        "--max-per-category",
+        type=int,
+        default=12,
+        help="In --incremental mode, keep at most N videos per category (default: 12, 0 = no cap)",
+    )
+    parser.add_argument(
+        "--report-dir",
+        type=Path,
+        default=telemetry.DEFAULT_REPORT_DIR,
+        help="Where the run report (JSON) and Prometheus metrics are written (default: .cache/runs)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run: cProfile stats, collapsed stacks and tracemalloc snapshots per stage",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help="Where --profile writes its run directory (default: .cache/profiles)",
+    )
+    options = parser.parse_args(argv)
+    if options.stream and options.batch_details:
+        parser.error("--stream and --batch-details cannot be combined (pick one search mode)")
+    return options
+
+
+# Options of the current run - set by configure() (main() or a worker process)
+args = None
+
+
+def configure(options: argparse.Namespace):
+    """Make `options` the active run options and set up the API cache + quota ledger"""
+    global args
+    args = options
+    youtube_client.configure_cache(options.cache_mode)
+    youtube_client.configure_quota(options.quota_budget)
+
+
+# =============================================================================
+# VIDEO RECORD
+# =============================================================================
+
+
+@dataclass(slots=True)
+class VideoRecord:
+    """One candidate video - the fixed schema shared by every pipeline stage
+
+    __slots__ keeps large candidate pools compact (no per-object __dict__).
+    """
+
+    # Search/details stage (YouTube data)
+    id: str
+    title: str = ""
+    description: str = ""  # Truncated to 500 chars
+    channel: str = ""
+    published: str = ""
+    views: int = 0
+    likes: int = 0
+    duration: str = ""  # ISO 8601, e.g. "PT12M5S"
+    thumbnail: str = ""
+
+    # Score/categorize stage
+    rating: float = 0.0
+    category: str = ""
+
+    # Describe stage
+    title_en: str = ""
+    description_de: str = ""
+    description_en: str = ""
+
+    @property
+    def views_formatted(self) -> str:
+        return format_views(self.views)
+
+    @classmethod
+    def from_api(cls, item: dict) -> "VideoRecord":
+        """Build a record from a videos.list item"""
+        snippet = item["snippet"]
+        stats = item.get("statistics", {})
+        content = item.get("contentDetails", {})
+
+        return cls(
+            id=item["id"],
+            title=snippet.get("title", ""),
+            description=snippet.get("description", "")[:500],
+            channel=sys.intern(snippet.get("channelTitle", "")),  # Few distinct channels, many videos
+            published=snippet.get("publishedAt", ""),
+            views=int(stats.get("viewCount", 0)),
+            likes=int(stats.get("likeCount", 0)),
+            duration=sys.intern(content.get("duration", "")),
+            thumbnail=snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
+        )
 
 
 # =============================================================================
@@ -147,69 +236,292 @@ ACTIVE_DOMAIN = args.domain
 
 def search_youtube(query: str, max_results: int = 15) -> list:
     """Search YouTube for videos"""
+    video_ids = search_video_ids(query, max_results=max_results)
+    if not video_ids:
+        return []
+
+    # Get detailed video info
+    return fetch_video_details(video_ids)
+
+
+def search_video_ids(query: str, max_results: int = 15) -> list:
+    """Run search.list only and return the video IDs (no details)"""
     if not YOUTUBE_API_KEY:
         print("❌ YOUTUBE_API_KEY not set!")
         return []
 
     try:
-        from googleapiclient.discovery import build
-
-        youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
-
-        response = (
-            youtube.search()
-            .list(
-                q=query,
-                part="id,snippet",
-                type="video",
-                maxResults=max_results,
-                order="relevance",
-                relevanceLanguage="de",
-                videoDuration="medium",
-            )
-            .execute()
-        )
+        with telemetry.span("search", query=query):
+            response = youtube_client.execute(_search_request(query, max_results))
+
+        return [item["id"]["videoId"] for item in response.get("items", [])]
+
+    except QuotaExceededError as e:
+        print(f"⛔ Skipping search '{query}': {e}")
+        return []
+    except Exception as e:
+        print(f"❌ YouTube API error: {e}")
+        return []
 
-        video_ids = [item["id"]["videoId"] for item in response.get("items", [])]
 
-        if not video_ids:
-            return []
+def _search_params(query: str, max_results: int = 15, page_token: str | None = None) -> dict:
+    """search.list parameters for a query (one place for the request and its cache key)"""
+    params = {
+        "q": query,
+        "part": "id,snippet",
+        "type": "video",
+        "maxResults": max_results,
+        "order": "relevance",
+        "relevanceLanguage": "de",
+        "videoDuration": "medium",
+    }
+    if page_token:
+        params["pageToken"] = page_token
+    return params
 
-        # Get detailed video info
-        details = (
-            youtube.videos()
-            .list(
-                part="snippet,statistics,contentDetails",
-                id=",".join(video_ids),
-            )
-            .execute()
+
+def _search_request(query: str, max_results: int = 15, page_token: str | None = None):
+    """Build (but do not send) the search.list request for a query"""
+    youtube = youtube_client.get_youtube(YOUTUBE_API_KEY)
+    return youtube.search().list(**_search_params(query, max_results, page_token))
+
+
+def _search_cache_uri(query: str, max_results: int = 15) -> str:
+    """A URI with the same cache key as _search_request(query).uri - no API client (or key) needed"""
+    return "search?" + urlencode(_search_params(query, max_results))
+
+
+def iter_search_pages(query: str, max_results: int = 10, max_pages: int = 3):
+    """Yield the video IDs of each search.list page, following nextPageToken lazily
+
+    The next page is only requested when the caller asks for it.
+    """
+    if not YOUTUBE_API_KEY:
+        print("❌ YOUTUBE_API_KEY not set!")
+        return
+
+    page_token = None
+    for page in range(max_pages):
+        try:
+            with telemetry.span("search", query=query, page=page + 1):
+                response = youtube_client.execute(_search_request(query, max_results, page_token))
+        except QuotaExceededError as e:
+            print(f"⛔ Stopping search '{query}': {e}")
+            return
+        except Exception as e:
+            print(f"❌ YouTube API error: {e}")
+            return
+
+        yield [item["id"]["videoId"] for item in response.get("items", [])]
+
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def stream_scored_videos(
+    queries: list, seen_ids: set, domain_config: DomainConfig, max_results: int = 10, max_pages: int = 3
+):
+    """Yield new videos with their trust score as soon as each page arrives
+
+    Queries are paged breadth-first (page 1 of every query, then page 2, ...)
+    so weak first pages lead to digging deeper rather than stopping. IDs in
+    `seen_ids` are skipped before their details are fetched.
+    """
+    pagers = deque((query, iter_search_pages(query, max_results, max_pages)) for query in queries)
+
+    while pagers:
+        if not _quota_allows("youtube.search.list"):
+            print("⛔ Quota budget reached - stopping search")
+            return
+
+        query, pager = pagers.popleft()
+        video_ids = next(pager, None)
+        if video_ids is None:
+            continue
+        pagers.append((query, pager))
+
+        new_ids = [video_id for video_id in dict.fromkeys(video_ids) if video_id not in seen_ids]
+        seen_ids.update(new_ids)
+        print(f"🔍 {query}: {len(video_ids)} results, {len(new_ids)} new")
+
+        videos = fetch_video_details(new_ids)
+        with telemetry.span("score", videos=len(videos)):
+            for video in videos:
+                video.rating = calculate_trust_score(video, domain_config)
+        yield from videos
+
+
+def fetch_video_details(video_ids: list) -> list:
+    """Fetch details via videos.list, packing up to 50 IDs into each call"""
+    videos = []
+    batch_size = youtube_client.VIDEOS_LIST_MAX_IDS
+
+    for start in range(0, len(video_ids), batch_size):
+        batch = video_ids[start : start + batch_size]
+        try:
+            youtube = youtube_client.get_youtube(YOUTUBE_API_KEY)
+
+            with telemetry.span("details", ids=len(batch)):
+                details = youtube_client.execute(
+                    youtube.videos().list(
+                        part="snippet,statistics,contentDetails",
+                        id=",".join(batch),
+                    )
+                )
+
+            videos.extend(VideoRecord.from_api(item) for item in details.get("items", []))
+
+        except QuotaExceededError as e:
+            print(f"⛔ Skipping details for {len(video_ids) - start} videos: {e}")
+            break
+        except Exception as e:
+            print(f"❌ YouTube API error: {e}")
+
+    return videos
+
+
+def search_queries_concurrent(queries: list, max_results: int = 15, max_workers: int = 4, search_fn=None):
+    """Run search_youtube() (or `search_fn`) for several queries in parallel.
+
+    Yields (query, results) tuples in the order of `queries`, no matter which
+    request finishes first, so downstream dedup stays deterministic.
+
+    At most `max_workers` searches are in flight: the next query is submitted
+    only when the caller asks for the next result, and only while the quota
+    ledger still allows a search.list call. Closing the generator (or
+    breaking out of the loop) never starts another search.
+    """
+    search_fn = search_fn or search_youtube
+    remaining = iter(queries)
+    in_flight = deque()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+
+    def submit_next() -> None:
+        if not _quota_allows("youtube.search.list"):
+            return
+        query = next(remaining, None)
+        if query is not None:
+            in_flight.append((query, executor.submit(search_fn, query, max_results=max_results)))
+
+    try:
+        for _ in range(max(1, max_workers)):
+            submit_next()
+        while in_flight:
+            query, future = in_flight.popleft()
+            yield query, future.result()
+            submit_next()
+    finally:
+        running = [future for _, future in in_flight if not future.cancel()]
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Searches already running are charged - let them land before the run summary
+        wait(running)
+
+
+def search_two_phase(
+    queries: list, seen_ids: set, max_candidates: int, max_results: int = 15, max_workers: int = 4
+) -> tuple[list, dict]:
+    """Two-phase fetch: collect IDs from every search, then fetch details once.
+
+    Phase 1 runs search.list for the queries and keeps only IDs that are not
+    in `seen_ids` (existing + already collected). Phase 2 fetches details for
+    the surviving IDs in packed videos.list calls of up to 50 IDs.
+
+    Returns (videos, stats) where stats compares against one videos.list call
+    per query (the single-phase behaviour of search_youtube()).
+    """
+    if max_workers > 1:
+        search_results = search_queries_concurrent(
+            queries, max_results=max_results, max_workers=max_workers, search_fn=search_video_ids
         )
+    else:
+        search_results = ((query, search_video_ids(query, max_results=max_results)) for query in queries)
 
-        videos = []
-        for item in details.get("items", []):
-            snippet = item["snippet"]
-            stats = item.get("statistics", {})
-            content = item.get("contentDetails", {})
-
-            videos.append(
-                {
-                    "id": item["id"],
-                    "title": snippet.get("title", ""),
-                    "description": snippet.get("description", "")[:500],
-                    "channel": snippet.get("channelTitle", ""),
-                    "published": snippet.get("publishedAt", ""),
-                    "views": int(stats.get("viewCount", 0)),
-                    "likes": int(stats.get("likeCount", 0)),
-                    "duration": content.get("duration", ""),
-                    "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
-                }
-            )
+    candidate_ids = []
+    skipped = 0
+    single_phase_calls = 0
 
-        return videos
+    for query, video_ids in search_results:
+        print(f"🔍 Searched: {query} ({len(video_ids)} results)")
+        if video_ids:
+            single_phase_calls += 1
 
-    except Exception as e:
-        print(f"❌ YouTube API error: {e}")
-        return []
+        for video_id in video_ids:
+            if video_id in seen_ids:
+                skipped += 1
+            else:
+                seen_ids.add(video_id)
+                candidate_ids.append(video_id)
+
+        if len(candidate_ids) >= max_candidates:
+            break
+        if not _quota_allows("youtube.search.list"):
+            print("⛔ Quota budget reached - stopping search")
+            break
+    search_results.close()  # Searches not started yet never run
+
+    videos = fetch_video_details(candidate_ids)
+
+    batch_size = youtube_client.VIDEOS_LIST_MAX_IDS
+    detail_calls = (len(candidate_ids) + batch_size - 1) // batch_size
+    saved_calls = max(0, single_phase_calls - detail_calls)
+    stats = {
+        "candidates": len(candidate_ids),
+        "skipped_ids": skipped,
+        "detail_calls": detail_calls,
+        "saved_calls": saved_calls,
+        "saved_units": saved_calls,  # videos.list costs 1 quota unit per call
+    }
+    return videos, stats
+
+
+def _quota_allows(method_id: str) -> bool:
+    """True if the quota ledger allows one more call of `method_id`"""
+    ledger = youtube_client.get_ledger()
+    return ledger is None or ledger.can_afford(method_id)
+
+
+def plan_quota(
+    queries: list,
+    max_results: int = 10,
+    batch_details: bool = False,
+    use_cache: bool = True,
+    max_pages: int = 1,
+    refresh_ids: int = 0,
+) -> dict:
+    """Project the quota units a run will spend (upper bound, before any call)
+
+    First-page searches already in the response cache are free and not counted.
+    With max_pages > 1 (--stream) every query may be paged that deep.
+    `refresh_ids` existing videos (--incremental) are re-fetched in batches of 50.
+    """
+    cache = youtube_client.get_cache() if use_cache else None
+    first_pages = [
+        q
+        for q in queries
+        if cache is None or not cache.contains("youtube.search.list", _search_cache_uri(q, max_results))
+    ]
+    searches = len(first_pages) + len(queries) * (max_pages - 1)
+
+    if batch_details:
+        batch_size = youtube_client.VIDEOS_LIST_MAX_IDS
+        detail_calls = (searches * max_results + batch_size - 1) // batch_size
+    else:
+        detail_calls = searches
+    refresh_calls = -(-refresh_ids // youtube_client.VIDEOS_LIST_MAX_IDS)
+    detail_calls += refresh_calls
+
+    search_units = searches * cost_of("youtube.search.list")
+    detail_units = detail_calls * cost_of("youtube.videos.list")
+    return {
+        "searches": searches,
+        "cached_searches": len(queries) - len(first_pages),
+        "search_units": search_units,
+        "detail_calls": detail_calls,
+        "refresh_calls": refresh_calls,
+        "detail_units": detail_units,
+        "total_units": search_units + detail_units,
+    }
 
 
 def parse_duration(duration: str) -> int:
@@ -228,7 +540,7 @@ def parse_duration(duration: str) -> int:
 # =============================================================================
 
 
-def calculate_trust_score(video: dict, domain_config: dict) -> float:
+def calculate_trust_score(video: VideoRecord, domain_config: DomainConfig) -> float:
     """
     Calculate trust score for a video (0.0 - 5.0)
 
@@ -240,17 +552,16 @@ def calculate_trust_score(video: dict, domain_config: dict) -> float:
     - Like ratio
     """
     score = 3.0  # Base score
+    matcher = get_matcher(domain_config)
 
-    channel = video.get("channel", "").lower()
-    title = video.get("title", "").lower()
-    views = video.get("views", 0)
-    duration = parse_duration(video.get("duration", ""))
+    channel = video.channel.lower()
+    title = video.title.lower()
+    views = video.views
+    duration = parse_duration(video.duration)
 
     # Trust channel bonus (+1.5)
-    for trusted in domain_config.get("trust_channels", []):
-        if trusted.lower() in channel:
-            score += 1.5
-            break
+    if matcher.is_trusted_channel(channel):
+        score += 1.5
 
     # View count bonus
     if views >= 1_000_000:
@@ -271,62 +582,382 @@ def calculate_trust_score(video: dict, domain_config: dict) -> float:
         score -= 0.3
 
     # Clickbait penalty
-    for pattern in domain_config.get("clickbait_patterns", []):
-        if re.search(pattern, title):
-            score -= 0.8
-            break
+    if matcher.is_clickbait(title):
+        score -= 0.8
 
     # Clamp to 4.0-5.0 range (we only want good videos)
     return max(4.0, min(5.0, score))
 
 
-def categorize_video(video: dict, domain_config: dict) -> str:
+def score_batch(views, likes, durations, trusted, clickbait):
+    """Vectorized calculate_trust_score() over columnar NumPy arrays
+
+    views/likes: int arrays, durations: parsed minutes (see parse_durations()),
+    trusted/clickbait: bool arrays from the domain matcher. Same thresholds
+    and the same 4.0-5.0 clamp as the scalar function; the additions happen
+    in the same order, so results are bit-identical. `likes` is accepted for
+    the column schema but - like in calculate_trust_score() - not scored yet.
+
+    Requires numpy (only imported when batch scoring is used).
+    """
+    import numpy as np
+
+    views = np.asarray(views, dtype=np.int64)
+    durations = np.asarray(durations, dtype=np.int64)
+
+    score = np.full(views.shape, 3.0)
+    score += np.where(np.asarray(trusted, dtype=bool), 1.5, 0.0)
+    score += np.select(
+        [views >= 1_000_000, views >= 500_000, views >= 100_000, views >= 50_000],
+        [0.8, 0.6, 0.4, 0.2],
+        default=0.0,
+    )
+    score += np.select(
+        [
+            (durations >= 5) & (durations <= 20),
+            (durations >= 3) & (durations <= 30),
+            (durations < 2) | (durations > 60),
+        ],
+        [0.3, 0.1, -0.3],
+        default=0.0,
+    )
+    score -= np.where(np.asarray(clickbait, dtype=bool), 0.8, 0.0)
+
+    return np.clip(score, 4.0, 5.0)
+
+
+def parse_durations(durations: list):
+    """parse_duration() for a whole column - each distinct value is parsed once"""
+    import numpy as np
+
+    unique, inverse = np.unique(np.asarray(durations, dtype=str), return_inverse=True)
+    minutes = np.array([parse_duration(d) for d in unique], dtype=np.int64)
+    return minutes[inverse]
+
+
+def score_columns(videos: list, domain_config: DomainConfig) -> dict:
+    """Build the columnar input for score_batch() from VideoRecords"""
+    import numpy as np
+
+    matcher = get_matcher(domain_config)
+    channels = [v.channel.lower() for v in videos]
+    titles = [v.title.lower() for v in videos]
+
+    # Channel names and titles repeat a lot - match each distinct value once
+    trusted = {channel: matcher.is_trusted_channel(channel) for channel in set(channels)}
+    clickbait = {title: matcher.is_clickbait(title) for title in set(titles)}
+
+    return {
+        "views": np.array([v.views for v in videos], dtype=np.int64),
+        "likes": np.array([v.likes for v in videos], dtype=np.int64),
+        "durations": parse_durations([v.duration for v in videos]),
+        "trusted": np.array([trusted[channel] for channel in channels], dtype=bool),
+        "clickbait": np.array([clickbait[title] for title in titles], dtype=bool),
+    }
+
+
+def rank_categories(video: VideoRecord, domain_config: DomainConfig) -> list:
+    """Rank categories by keyword matches in title + description
+
+    Returns [(category, match_count)], best first; empty if nothing matched.
+    """
+    text = f"{video.title} {video.description}"
+    return get_matcher(domain_config).keywords.rank(text)
+
+
+def categorize_video(video: VideoRecord, domain_config: DomainConfig) -> str:
     """Categorize video based on title and description keywords"""
-    text = f"{video.get('title', '')} {video.get('description', '')}".lower()
+    ranked = rank_categories(video, domain_config)
+    return ranked[0][0] if ranked else "grundlagen"
+
 
-    best_category = "grundlagen"
-    best_matches = 0
+# =============================================================================
+# SELECTION
+# =============================================================================
+
+
+class TopKSelector:
+    """Keep the best K videos of a stream in O(K) memory (min-heap)
+
+    Ranked by (rating, views), best first. Ties go to the video that was
+    pushed first - the same order a stable sort of all candidates gives.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.seen = 0
+        self._heap = []
+
+    def push(self, video: VideoRecord) -> bool:
+        """Offer a scored video; returns True if it is (currently) in the top K"""
+        entry = (video.rating, video.views, -self.seen, video)
+        self.seen += 1
 
-    for cat_id, cat_config in domain_config.get("categories", {}).items():
-        matches = sum(1 for kw in cat_config.get("keywords", []) if kw in text)
-        if matches > best_matches:
-            best_matches = matches
-            best_category = cat_id
+        if self.k <= 0:
+            return False
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:3] > self._heap[0][:3]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
 
-    return best_category
+    def best(self) -> list:
+        """Current top K, best first (can be called at any time)"""
+        return [entry[-1] for entry in sorted(self._heap, reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
 
 
 # =============================================================================
-# LLM DESCRIPTION GENERATION (Optional, Single Batch Call)
+# LLM DESCRIPTION GENERATION (Optional, Chunked + Cached)
 # =============================================================================
 
+GEMINI_MODEL = "gemini-2.0-flash"
+OPENAI_MODEL = "gpt-4o-mini"  # Cheaper model for descriptions
+
+# Videos per LLM request - small chunks fail (or time out) independently
+DESCRIPTION_CHUNK_SIZE = 5
+
+# Output limit per request (also the token estimate the rate limiter starts with)
+DESCRIPTION_MAX_TOKENS = 2000
+
+# Give up on a streamed answer after this many seconds (completed entries are kept);
+# also the clients' request timeout, so a stream that stalls between chunks is cut off
+LLM_STREAM_TIMEOUT = 60
+
+# Extra requests for entries still missing after a chunk's first answer
+DESCRIPTION_RETRIES = 1
+
+DESCRIPTION_CACHE_PATH = Path(__file__).parent / ".cache" / "descriptions.json"
+
 
-def generate_descriptions_batch(videos: list) -> list:
-    """Generate DE+EN descriptions for all videos in ONE LLM call"""
+class JsonArrayStream:
+    """Incremental parser for a streamed JSON array of objects
+
+    feed() takes raw text fragments as they arrive and returns every object
+    that has been completed so far. Text before the opening "[" (e.g. a
+    markdown fence) is ignored; an object that is not valid JSON is
+    returned as None so positions stay aligned with the prompt.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._current = []
+
+    def feed(self, text: str) -> list:
+        completed = []
+        for char in text:
+            if self.finished:
+                break
+            if not self.started:
+                self.started = char == "["
+                continue
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._current = [char]
+                elif char == "]":
+                    self.finished = True
+                continue
+
+            self._current.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        completed.append(json.loads("".join(self._current)))
+                    except json.JSONDecodeError:
+                        completed.append(None)
+        return completed
+
+
+class DescriptionCache:
+    """Persistent memo of generated descriptions
+
+    Keyed by video ID + a hash of title and model, so a renamed video or a
+    model switch generates a fresh description. Domain worker processes
+    share the file: save() merges under a file lock instead of overwriting.
+    """
+
+    def __init__(self, path: Path = DESCRIPTION_CACHE_PATH):
+        self.path = path
+        self.entries = self._load()
+        self._added = {}  # Entries put() in this process, not saved yet
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    @staticmethod
+    def key(video: VideoRecord, model: str) -> str:
+        digest = hashlib.sha1(f"{model}\n{video.title}".encode()).hexdigest()[:12]
+        return f"{video.id}:{digest}"
+
+    def get(self, video: VideoRecord, model: str) -> dict | None:
+        return self.entries.get(self.key(video, model))
+
+    def put(self, video: VideoRecord, model: str) -> None:
+        key = self.key(video, model)
+        self.entries[key] = self._added[key] = {"de": video.description_de, "en": video.description_en}
+
+    def save(self) -> None:
+        """Add this process's new entries to the file (entries other processes saved are kept)"""
+        if not self._added:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path.with_suffix(".lock")):
+            entries = self._load()
+            entries.update(self._added)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entries, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        self.entries = entries
+        self._added = {}
+
+
+_llm_clients = {}
+_llm_clients_lock = threading.Lock()
+
+
+def _get_llm_client(provider: str):
+    """Create the Gemini/OpenAI client once and reuse it for every chunk"""
+    with _llm_clients_lock:
+        if provider not in _llm_clients:
+            if provider == "gemini":
+                from google import genai
+
+                _llm_clients[provider] = genai.Client(
+                    api_key=GOOGLE_API_KEY,
+                    http_options={"timeout": LLM_STREAM_TIMEOUT * 1000},  # Milliseconds
+                )
+            else:
+                from openai import OpenAI
+
+                _llm_clients[provider] = OpenAI(api_key=OPENAI_API_KEY, timeout=LLM_STREAM_TIMEOUT)
+        return _llm_clients[provider]
+
+
+def generate_descriptions_batch(videos: list, max_workers: int = 3) -> list:
+    """Generate DE+EN descriptions in small concurrent LLM calls
+
+    - Cached descriptions (same video, title and model) are reused for free
+    - The rest is split into chunks of DESCRIPTION_CHUNK_SIZE, sent in
+      parallel under the provider's shared rate limiter (ratelimit.py:
+      requests + tokens per minute, Retry-After, per-call retries)
+    - Answers are streamed; entries that are missing or malformed are
+      requested again, then fall back to YouTube descriptions
+    """
     if not videos:
         return videos
 
     # Try Gemini first (has free tier), then OpenAI
     if GOOGLE_API_KEY:
-        return _generate_with_gemini(videos)
+        provider, model, generate = "gemini", GEMINI_MODEL, _generate_with_gemini
     elif OPENAI_API_KEY:
-        return _generate_with_openai(videos)
+        provider, model, generate = "openai", OPENAI_MODEL, _generate_with_openai
     else:
         print("⚠️  No LLM API key - using YouTube descriptions")
         return _use_youtube_descriptions(videos)
 
+    cache = DescriptionCache()
+    missing = []
+    for video in videos:
+        cached = cache.get(video, model)
+        if cached:
+            video.description_de = cached["de"]
+            video.description_en = cached["en"]
+        else:
+            missing.append(video)
+
+    chunks = [missing[i : i + DESCRIPTION_CHUNK_SIZE] for i in range(0, len(missing), DESCRIPTION_CHUNK_SIZE)]
+    print(f"   💾 {len(videos) - len(missing)} cached, {len(missing)} to generate in {len(chunks)} chunk(s)")
+
+    def run_chunk(chunk: list) -> None:
+        pending = chunk
+        for attempt in range(1 + DESCRIPTION_RETRIES):
+            if attempt:
+                print(f"   🔁 Retrying {len(pending)} missing description(s)")
+            with telemetry.span("llm_request", provider=provider, videos=len(pending)):
+                generate(pending)
+
+            for video in pending:
+                if video.description_de and video.description_en:
+                    cache.put(video, model)
+            pending = [v for v in pending if not (v.description_de and v.description_en)]
+            if not pending:
+                return
+
+        _use_youtube_descriptions(pending)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        list(executor.map(run_chunk, chunks))
+
+    cache.save()
+    return videos
+
+
+def _build_video_list(videos: list) -> str:
+    return "\n".join([f'{i + 1}. "{v.title}" von {v.channel} ({v.views:,} Views)' for i, v in enumerate(videos)])
+
+
+def _stream_descriptions(videos: list, fragments) -> int:
+    """Assign each {"de", "en"} object to its video as soon as it is complete
+
+    Stops at LLM_STREAM_TIMEOUT or when the stream breaks; whatever was
+    completed until then is kept. The deadline is checked per fragment, a
+    stream that stalls completely is ended by the client's request timeout
+    (see _get_llm_client). Returns the number of videos described.
+    """
+    parser = JsonArrayStream()
+    deadline = time.monotonic() + LLM_STREAM_TIMEOUT
+    index = 0
+    assigned = 0
 
-def _generate_with_gemini(videos: list) -> list:
-    """Use Gemini for batch description generation"""
     try:
-        from google import genai
+        for fragment in fragments:
+            # After the closing "]" the rest is only drained (final chunks carry token usage)
+            for entry in [] if parser.finished else parser.feed(fragment or ""):
+                if index < len(videos) and isinstance(entry, dict) and entry.get("de") and entry.get("en"):
+                    videos[index].description_de = entry["de"]
+                    videos[index].description_en = entry["en"]
+                    assigned += 1
+                index += 1
+            if time.monotonic() > deadline:
+                print(f"⚠️  LLM stream timed out after {LLM_STREAM_TIMEOUT}s - keeping {assigned} descriptions")
+                break
+    except Exception as e:
+        print(f"⚠️  LLM stream interrupted: {e} - keeping {assigned} descriptions")
+
+    return assigned
 
-        client = genai.Client(api_key=GOOGLE_API_KEY)
+
+def _generate_with_gemini(videos: list) -> int:
+    """Use Gemini (streamed) for one chunk; returns the number of videos described"""
+    try:
+        client = _get_llm_client("gemini")
 
         # Build batch prompt
-        video_list = "\n".join(
-            [f'{i+1}. "{v["title"]}" von {v["channel"]} ({v["views"]:,} Views)' for i, v in enumerate(videos)]
-        )
+        video_list = _build_video_list(videos)
 
         prompt = f"""Du bist ein Experte für Trockenbau-Tutorials. Erstelle kurze, informative Beschreibungen für diese YouTube-Videos.
 
@@ -344,81 +975,117 @@ Beispiel:
 
 JSON Array (exakt {len(videos)} Einträge):"""
 
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
-        )
-        text = response.text.strip()
-
-        # Extract JSON from response
-        json_match = re.search(r"\[.*\]", text, re.DOTALL)
-        if json_match:
-            descriptions = json.loads(json_match.group())
-            for i, video in enumerate(videos):
-                if i < len(descriptions):
-                    video["description_de"] = descriptions[i].get("de", "")
-                    video["description_en"] = descriptions[i].get("en", "")
-            return videos
+        estimate = ratelimit.estimate_tokens(prompt, DESCRIPTION_MAX_TOKENS)
 
-    except Exception as e:
-        print(f"⚠️  Gemini error: {e} - using YouTube descriptions")
+        def request():
+            telemetry.count("llm_requests_total", provider="gemini")
+            stream = client.models.generate_content_stream(
+                model=GEMINI_MODEL,
+                contents=prompt,
+                config={"max_output_tokens": DESCRIPTION_MAX_TOKENS},
+            )
+            return _started(stream)
 
-    return _use_youtube_descriptions(videos)
+        stream = ratelimit.get_limiter("gemini").call(request, tokens=estimate)
+        return _stream_descriptions(videos, _gemini_fragments(stream, estimate))
 
+    except Exception as e:
+        print(f"⚠️  Gemini error: {e}")
 
-def _generate_with_openai(videos: list) -> list:
-    """Use OpenAI for batch description generation"""
-    try:
-        from openai import OpenAI
+    return 0
 
-        client = OpenAI(api_key=OPENAI_API_KEY)
 
-        video_list = "\n".join(
-            [f'{i+1}. "{v["title"]}" von {v["channel"]} ({v["views"]:,} Views)' for i, v in enumerate(videos)]
-        )
+def _generate_with_openai(videos: list) -> int:
+    """Use OpenAI (streamed) for one chunk; returns the number of videos described"""
+    try:
+        client = _get_llm_client("openai")
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Cheaper model for descriptions
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Du erstellst kurze, informative Video-Beschreibungen für Trockenbau-Tutorials. Antworte NUR mit JSON.",
-                },
-                {
-                    "role": "user",
-                    "content": f"""Erstelle Beschreibungen für diese Videos:
+        video_list = _build_video_list(videos)
+        messages = [
+            {
+                "role": "system",
+                "content": "Du erstellst kurze, informative Video-Beschreibungen für Trockenbau-Tutorials. Antworte NUR mit JSON.",
+            },
+            {
+                "role": "user",
+                "content": f"""Erstelle Beschreibungen für diese Videos:
 
 {video_list}
 
 JSON Array mit {len(videos)} Einträgen:
 [{{"de": "Deutsche Beschreibung", "en": "English description"}}, ...]""",
-                },
-            ],
-            max_tokens=2000,
-        )
+            },
+        ]
+        estimate = ratelimit.estimate_tokens(messages, DESCRIPTION_MAX_TOKENS)
+
+        def request():
+            telemetry.count("llm_requests_total", provider="openai")
+            return client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=messages,
+                max_tokens=DESCRIPTION_MAX_TOKENS,
+                stream=True,
+                stream_options={"include_usage": True},  # Last chunk reports the token usage
+            )
 
-        text = response.choices[0].message.content.strip()
-        json_match = re.search(r"\[.*\]", text, re.DOTALL)
-        if json_match:
-            descriptions = json.loads(json_match.group())
-            for i, video in enumerate(videos):
-                if i < len(descriptions):
-                    video["description_de"] = descriptions[i].get("de", "")
-                    video["description_en"] = descriptions[i].get("en", "")
-            return videos
+        response = ratelimit.get_limiter("openai").call(request, tokens=estimate)
+        return _stream_descriptions(videos, _openai_fragments(response, estimate))
 
     except Exception as e:
-        print(f"⚠️  OpenAI error: {e} - using YouTube descriptions")
+        print(f"⚠️  OpenAI error: {e}")
+
+    return 0
+
+
+def _started(stream):
+    """Read the first chunk now, inside the rate limiter's retried call
+
+    Gemini only raises a 429 once the stream is read.
+    """
+    stream = iter(stream)
+    try:
+        first = next(stream)
+    except StopIteration:
+        return iter(())
+    return itertools.chain([first], stream)
+
+
+def _record_usage(provider: str, estimate: int, prompt: int | None, completion: int | None) -> None:
+    """Token metrics + replace the rate limiter's estimate with the real usage"""
+    if prompt:
+        telemetry.count("llm_tokens_total", prompt, provider=provider, kind="prompt")
+    if completion:
+        telemetry.count("llm_tokens_total", completion, provider=provider, kind="completion")
+    ratelimit.get_limiter(provider).settle(estimate, (prompt or 0) + (completion or 0))
+
+
+def _gemini_fragments(stream, estimate: int):
+    """Text of each streamed Gemini chunk; token usage is recorded when the stream ends"""
+    usage = None
+    try:
+        for chunk in stream:
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            yield chunk.text
+    finally:
+        if usage is not None:
+            _record_usage("gemini", estimate, usage.prompt_token_count, usage.candidates_token_count)
+
 
-    return _use_youtube_descriptions(videos)
+def _openai_fragments(response, estimate: int):
+    """Text of each streamed OpenAI chunk; the final usage chunk is recorded"""
+    for chunk in response:
+        if chunk.usage is not None:
+            _record_usage("openai", estimate, chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+        if chunk.choices:
+            yield chunk.choices[0].delta.content
 
 
 def _use_youtube_descriptions(videos: list) -> list:
     """Fallback: Use YouTube description (truncated)"""
     for video in videos:
-        desc = video.get("description", "")[:150]
-        video["description_de"] = desc
-        video["description_en"] = desc  # Same for both (YouTube is usually German)
+        desc = video.description[:150]
+        video.description_de = desc
+        video.description_en = desc  # Same for both (YouTube is usually German)
     return videos
 
 
@@ -427,64 +1094,91 @@ def _use_youtube_descriptions(videos: list) -> list:
 # =============================================================================
 
 
-def format_views(views: int) -> str:
-    """Format view count: 1234567 -> '1.2M'"""
-    if views >= 1_000_000:
-        return f"{views/1_000_000:.1f}M"
-    elif views >= 1_000:
-        return f"{views/1_000:.0f}K"
-    return str(views)
-
-
-def load_existing_videos(script_path: Path) -> set:
-    """Load existing video IDs from script.js"""
-    existing_ids = set()
-    if script_path.exists():
-        content = script_path.read_text(encoding="utf-8")
-        # Extract youtubeId values
-        matches = re.findall(r'youtubeId:"([^"]+)"', content)
-        existing_ids = set(matches)
-    return existing_ids
-
-
-def save_videos(videos: list, script_path: Path, domain_config: dict):
-    """Save videos to script.js"""
-    if not script_path.exists():
-        print(f"❌ Script file not found: {script_path}")
-        return
+def apply_category_caps(catalog: Catalog, new_videos: list, per_category: int) -> tuple:
+    """Keep at most `per_category` videos per category, highest rated first
 
-    content = script_path.read_text(encoding="utf-8")
-
-    # Format videos as JavaScript
-    video_entries = []
-    for v in videos:
-        entry = (
-            f'  {{title:{{de:"{v["title"]}",en:"{v.get("title_en", v["title"])}"}}'
-            f',description:{{de:"{v.get("description_de", "")}",en:"{v.get("description_en", "")}"}}'
-            f',rating:{v["rating"]:.1f},views:"{v["views_formatted"]}",category:"{v["category"]}"'
-            f',youtubeId:"{v["id"]}",channel:"{v["channel"]}"}}'
-        )
-        video_entries.append(entry)
+    Existing catalog entries win ties, so a full category only changes for
+    a strictly better video. Returns (IDs to drop from the catalog, kept new videos).
+    """
+    if not per_category:
+        return [], new_videos
+
+    existing_ids = list(catalog.videos)
+    items = [(entry["rating"], entry["category"]) for entry in catalog.videos.values()]
+    items += [(video.rating, video.category) for video in new_videos]
+
+    by_category = {}
+    for i, (_, category) in enumerate(items):
+        by_category.setdefault(category, []).append(i)
+
+    dropped = set()
+    for indices in by_category.values():
+        ranked = sorted(indices, key=lambda i: (-items[i][0], i))
+        dropped.update(ranked[per_category:])
+
+    offset = len(existing_ids)
+    return (
+        [existing_ids[i] for i in sorted(dropped) if i < offset],
+        [video for i, video in enumerate(new_videos) if offset + i not in dropped],
+    )
 
-    videos_js = "[\n" + ",\n".join(video_entries) + "\n]"
 
-    # Update the videos array in script.js
-    new_content = re.sub(
-        r"const videos = \[[\s\S]*?\];",
-        f"const videos = {videos_js};",
-        content,
-    )
+def refresh_existing(catalog: Catalog, domain_config: DomainConfig) -> tuple:
+    """Re-fetch the catalog's videos and re-score the ones whose title or statistics changed
 
-    # Update comment with date
-    date_str = datetime.now().strftime("%d. %B %Y")
-    new_content = re.sub(
-        r"// KURATIERTE Videos.*",
-        f"// KURATIERTE Videos vom DIY Video Finder ({date_str})",
-        new_content,
-    )
+    One videos.list call per 50 entries; unchanged videos are not scored again.
+    Returns (updated, retitled) records: `updated` videos keep their stored
+    descriptions, `retitled` ones need new descriptions.
+    """
+    updated, retitled = [], []
+    for video in fetch_video_details(list(catalog.videos)):
+        entry = catalog.get(video.id)
+        if entry is None:
+            continue
+        if video.title != entry["title"]["de"]:
+            changed = retitled
+        elif video.views != entry["views"] or video.channel != entry["channel"]:
+            changed = updated
+            video.title_en = entry["title"]["en"]
+            video.description_de = entry["description"]["de"]
+            video.description_en = entry["description"]["en"]
+        else:
+            continue
+        video.rating = calculate_trust_score(video, domain_config)
+        video.category = categorize_video(video, domain_config)
+        changed.append(video)
+    return updated, retitled
+
+
+def record_to_entry(v: VideoRecord) -> dict:
+    """Catalog entry for a curated video"""
+    return {
+        "title": {"de": v.title, "en": v.title_en or v.title},
+        "description": {"de": v.description_de, "en": v.description_en},
+        "rating": v.rating,
+        "views": v.views,
+        "category": v.category,
+        "channel": v.channel,
+    }
+
+
+def save_videos(videos: list, catalog: Catalog, replace: bool = True, dropped_ids=()):
+    """Store videos in the catalog and regenerate script.js (only files that changed are written)"""
+    if replace:
+        catalog.clear()
+    for video_id in dropped_ids:
+        catalog.remove(video_id)
+    for v in videos:
+        catalog.upsert(v.id, record_to_entry(v))
 
-    script_path.write_text(new_content, encoding="utf-8")
-    print(f"✅ Saved {len(videos)} videos to {script_path}")
+    catalog_changed = catalog.save()
+    script_changed = render_script(catalog)
+    if catalog_changed or script_changed:
+        print(
+            f"✅ Saved {len(videos)} videos ({len(catalog)} in catalog) to {catalog.path} + {catalog.script_path.name}"
+        )
+    else:
+        print("✅ Catalog already up to date - nothing written")
 
 
 # =============================================================================
@@ -492,90 +1186,320 @@ def save_videos(videos: list, script_path: Path, domain_config: dict):
 # =============================================================================
 
 
-def run_curation():
-    """Main curation pipeline"""
-    domain_config = DOMAINS.get(ACTIVE_DOMAIN)
+def run_curation(domain: str = ACTIVE_DOMAIN):
+    """Main curation pipeline for one domain (traced as one "curation" span)"""
+    if args is None:
+        configure(parse_args([]))  # Library use without main(): default options
+
+    with telemetry.span("curation", domain=domain):
+        _curate(domain)
+
+
+def _curate(domain: str):
+    domain_config = DOMAINS.get(domain)
     if not domain_config:
-        print(f"❌ Unknown domain: {ACTIVE_DOMAIN}")
+        print(f"❌ Unknown domain: {domain}")
         return
 
     print("\n" + "=" * 70)
     print("🎬 DIY VIDEO FINDER v2 - Lean & Reliable")
     print("=" * 70)
     print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print(f"🎯 Domain: {domain_config['name']['de']}")
+    print(f"🎯 Domain: {domain_config.name.de}")
     print(f"📊 Max Videos: {args.max_videos}")
     print(f"🧪 Mode: {'DRY-RUN' if args.dry_run else 'LIVE'}")
-    print(f"🤖 LLM: {'Disabled' if args.skip_llm else 'Enabled (1 batch call)'}")
+    print(f"🤖 LLM: {'Disabled' if args.skip_llm else 'Enabled (chunked, cached)'}")
+
+    # Load existing videos (once - the catalog is reused for the incremental merge)
+    catalog = Catalog.for_domain(domain)
+
+    ledger = youtube_client.get_ledger()
+    plan = plan_quota(
+        domain_config.queries,
+        max_results=10,
+        batch_details=args.batch_details,
+        use_cache=args.cache_mode == "use",
+        max_pages=args.max_pages if args.stream else 1,
+        refresh_ids=len(catalog) if args.incremental else 0,
+    )
+    print(f"📈 Quota: ≤{plan['total_units']} units projected, {ledger.remaining()} available")
     print("=" * 70 + "\n")
 
-    # Load existing videos
-    script_path = Path(__file__).parent / "output" / "script.js"
-    existing_ids = load_existing_videos(script_path)
-    print(f"📂 Existing videos: {len(existing_ids)}")
-
-    # Search for videos
-    all_videos = []
-    seen_ids = set(existing_ids)
-
-    for query in domain_config["queries"]:
-        print(f"🔍 Searching: {query}")
-        results = search_youtube(query, max_results=10)
-
-        for video in results:
-            if video["id"] not in seen_ids:
-                seen_ids.add(video["id"])
-                all_videos.append(video)
-
-        if len(all_videos) >= args.max_videos * 2:  # Get extra for filtering
-            break
-
-    print(f"\n📥 Found {len(all_videos)} new videos")
-
-    if not all_videos:
-        print("⚠️  No new videos found!")
+    if args.plan:
+        search_cost = cost_of("youtube.search.list")
+        detail_cost = cost_of("youtube.videos.list")
+        print("📋 QUOTA PLAN (no API calls made)")
+        print(f"   search.list: {plan['searches']} calls × {search_cost} = {plan['search_units']} units")
+        if plan["cached_searches"]:
+            print(f"                ({plan['cached_searches']} more served from cache for free)")
+        print(f"   videos.list: ≤{plan['detail_calls']} calls × {detail_cost} = {plan['detail_units']} units")
+        if plan["refresh_calls"]:
+            print(f"                ({plan['refresh_calls']} to refresh the {len(catalog)} existing videos)")
+        print(f"   Total:       ≤{plan['total_units']} units")
+        print(f"   Today:       {ledger.spent_today()}/{ledger.daily_limit} used, {ledger.remaining()} available")
+        if plan["total_units"] > ledger.remaining():
+            print("   ⚠️  Projection exceeds the budget - the run will stop early")
         return
 
-    # Calculate trust scores and categorize
-    for video in all_videos:
-        video["rating"] = calculate_trust_score(video, domain_config)
-        video["category"] = categorize_video(video, domain_config)
-        video["views_formatted"] = format_views(video["views"])
+    print(f"📂 Existing videos: {len(catalog)}")
+
+    # Search for videos - every new candidate is scored as it arrives and
+    # offered to a bounded top-K selection (memory stays O(max_videos))
+    seen_ids = set(catalog.videos)
+    selector = TopKSelector(args.max_videos)
+
+    def offer(video: VideoRecord):
+        if not video.rating:
+            video.rating = calculate_trust_score(video, domain_config)
+        selector.push(video)
+
+    queries = domain_config.queries
+    if args.batch_details:
+        candidates, fetch_stats = search_two_phase(
+            queries,
+            seen_ids,
+            max_candidates=args.max_videos * 2,
+            max_results=10,
+            max_workers=args.concurrency,
+        )
+        with telemetry.span("score", videos=len(candidates)):
+            for video in candidates:
+                offer(video)
+        print(
+            f"📦 Details: {fetch_stats['detail_calls']} videos.list call(s) for {fetch_stats['candidates']} IDs "
+            f"({fetch_stats['skipped_ids']} known/duplicate IDs skipped, "
+            f"saved {fetch_stats['saved_calls']} calls / {fetch_stats['saved_units']} quota units)"
+        )
+    elif args.stream:
+        strong = 0
+        for video in stream_scored_videos(queries, seen_ids, domain_config, max_results=10, max_pages=args.max_pages):
+            offer(video)
+            if video.rating >= args.min_score:
+                strong += 1
+            if strong >= args.max_videos:
+                print(f"✂️  {strong} videos with score ≥ {args.min_score} - stopping search early")
+                break
+    else:
+        if args.concurrency > 1:
+            print(f"🔍 Searching {len(queries)} queries ({args.concurrency} parallel)")
+            search_results = search_queries_concurrent(queries, max_results=10, max_workers=args.concurrency)
+        else:
+            search_results = ((query, search_youtube(query, max_results=10)) for query in queries)
+
+        for query, results in search_results:
+            print(f"🔍 Searching: {query}" if args.concurrency <= 1 else f"   ✓ {query}: {len(results)} results")
+
+            with telemetry.span("score", videos=len(results)):
+                for video in results:
+                    if video.id not in seen_ids:
+                        seen_ids.add(video.id)
+                        offer(video)
+
+            if selector.seen >= args.max_videos * 2:  # Get extra for filtering
+                break
+            if not _quota_allows("youtube.search.list"):
+                print("⛔ Quota budget reached - stopping search")
+                break
+        search_results.close()  # Searches not started yet never run
+
+    print(f"\n📥 Found {selector.seen} new videos")
+    cache = youtube_client.get_cache()
+    if cache is not None:
+        print(f"💾 API cache ({args.cache_mode}): {cache.hits} hits, {cache.misses} misses")
+
+    if not selector.seen:
+        print("⚠️  No new videos found!")
+        if not (args.incremental and catalog):
+            return
 
-    # Sort by rating (best first) and take top N
-    all_videos.sort(key=lambda v: (v["rating"], v["views"]), reverse=True)
-    selected_videos = all_videos[: args.max_videos]
+    # Top N by rating (best first); only the selected videos need a category
+    selected_videos = selector.best()
+    with telemetry.span("categorize", videos=len(selected_videos)):
+        for video in selected_videos:
+            video.category = categorize_video(video, domain_config)
 
     print(f"\n✅ Selected top {len(selected_videos)} videos:")
     for v in selected_videos:
-        print(f"   ⭐ {v['rating']:.1f} | {v['views_formatted']:>6} | {v['channel'][:25]:<25} | {v['title'][:40]}")
+        print(f"   ⭐ {v.rating:.1f} | {v.views_formatted:>6} | {v.channel[:25]:<25} | {v.title[:40]}")
+
+    # Incremental: refresh the existing videos, then merge with the catalog
+    # BEFORE the LLM step, so videos that would not fit their category never
+    # cost a description. Only new and retitled videos get new descriptions.
+    updated, retitled = [], []
+    if args.incremental:
+        with telemetry.span("refresh", videos=len(catalog)):
+            updated, retitled = refresh_existing(catalog, domain_config)
+        for video in updated + retitled:
+            catalog.upsert(video.id, record_to_entry(video))  # The caps see the new ratings and categories
+
+        dropped_ids, selected_videos = apply_category_caps(catalog, selected_videos, args.max_per_category)
+        dropped = set(dropped_ids)
+        updated = [video for video in updated if video.id not in dropped]
+        retitled = [video for video in retitled if video.id not in dropped]
+        print(
+            f"\n🔀 Merge: +{len(selected_videos)} new, ~{len(updated) + len(retitled)} changed "
+            f"({len(retitled)} retitled), -{len(dropped_ids)} existing "
+            f"(max {args.max_per_category or '∞'} per category)"
+        )
+        if not selected_videos and not dropped_ids and not updated and not retitled:
+            print("✅ Catalog unchanged - nothing to describe or write")
+            print(f"\n📈 Quota: {ledger.summary()}")
+            return
 
     # Generate descriptions (optional LLM call)
-    if not args.skip_llm:
-        print("\n📝 Generating descriptions (1 LLM call)...")
-        selected_videos = generate_descriptions_batch(selected_videos)
-    else:
-        selected_videos = _use_youtube_descriptions(selected_videos)
-
-    # Note: Currently replaces all videos
-    # Future: Merge with existing videos for incremental updates
-
-    # Save to script.js
-    if not args.dry_run:
-        save_videos(selected_videos, script_path, domain_config)
-    else:
+    selected_videos += retitled
+    with telemetry.span("describe", videos=len(selected_videos), llm=not args.skip_llm):
+        if not args.skip_llm:
+            print("\n📝 Generating descriptions...")
+            selected_videos = generate_descriptions_batch(selected_videos, max_workers=args.llm_concurrency)
+        else:
+            selected_videos = _use_youtube_descriptions(selected_videos)
+
+    # Save to the catalog + script.js (--incremental keeps existing entries, otherwise they are replaced)
+    if args.dry_run:
         print("\n🧪 DRY-RUN - would save these videos:")
         for v in selected_videos:
-            print(f"   {v['id']}: {v['title'][:50]}")
+            print(f"   {v.id}: {v.title[:50]}")
+        if args.incremental:
+            for v in updated:
+                print(f"   🔄 {v.id}: re-scored ⭐ {v.rating:.1f} ({v.category})")
+            for video_id in dropped_ids:
+                print(f"   ➖ {video_id}: dropped from {catalog.get(video_id)['category']}")
+    elif args.incremental:
+        with telemetry.span("save", videos=len(selected_videos) + len(updated)):
+            save_videos(selected_videos + updated, catalog, replace=False, dropped_ids=dropped_ids)
+    else:
+        with telemetry.span("save", videos=len(selected_videos)):
+            save_videos(selected_videos, catalog)
+
+    print(f"\n📈 Quota: {ledger.summary()}")
 
     print("\n" + "=" * 70)
     print("✅ CURATION COMPLETE")
     print("=" * 70)
 
 
-if __name__ == "__main__":
-    if not YOUTUBE_API_KEY:
+# =============================================================================
+# MULTI-DOMAIN
+# =============================================================================
+
+
+def resolve_domains(value: str) -> list:
+    """'all', 'a,b' or a single name -> known domain keys (unknown ones are reported)"""
+    if value.strip().lower() == "all":
+        return list(DOMAINS)
+
+    domains = []
+    for name in (part.strip() for part in value.split(",")):
+        if name in DOMAINS:
+            if name not in domains:
+                domains.append(name)
+        elif name:
+            print(f"❌ Unknown domain: {name} (available: {', '.join(DOMAINS)})")
+    return domains
+
+
+def _init_domain_worker(options: argparse.Namespace, llm_share: float):
+    """Worker process setup - cache file and quota ledger are shared through the filesystem
+
+    LLM rate limits are per process, so each worker gets its share of them.
+    """
+    configure(options)
+    ratelimit.configure(share=llm_share)
+
+
+def _curate_domain(domain: str) -> tuple:
+    """Run one domain in a worker; output and telemetry are returned to the parent"""
+    recorder = telemetry.start_run("domain", domain=domain)
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(buffer):
+        try:
+            if args.profile:
+                _profiled(run_curation, args.profile_dir / domain, domain)
+            else:
+                run_curation(domain)
+        except Exception as e:
+            print(f"❌ {domain} failed: {e}")
+    return domain, buffer.getvalue(), time.perf_counter() - start, recorder.report()
+
+
+def run_domains_parallel(domains: list, max_workers: int | None = None):
+    """Curate several domains at once, one process per domain
+
+    Every domain writes its own output shard (catalog.shard_paths), so
+    workers never touch the same file. The run budget is split evenly.
+    """
+    workers = max(1, min(len(domains), max_workers or len(domains)))
+    budget = args.quota_budget // len(domains) if args.quota_budget is not None else None
+
+    print(f"🌐 Curating {len(domains)} domains in {workers} processes: {', '.join(domains)}")
+    if budget is not None:
+        print(f"📈 Quota budget: {budget} units per domain")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),  # Fresh interpreter: no inherited DB/HTTP handles
+        initializer=_init_domain_worker,
+        initargs=(argparse.Namespace(**{**vars(args), "quota_budget": budget}), 1 / workers),
+    ) as executor:
+        futures = [executor.submit(_curate_domain, domain) for domain in domains]
+        for future in as_completed(futures):
+            domain, log, elapsed, report = future.result()
+            telemetry.get_recorder().merge(report, domain=domain)
+            print(f"\n{'─' * 70}\n📁 {domain} ({elapsed:.1f}s)\n{'─' * 70}")
+            print(log, end="")
+
+    ledger = youtube_client.configure_quota(args.quota_budget)  # Re-read: workers charged the shared file
+    print(f"\n🌐 {len(domains)} domains done in {time.perf_counter() - start:.1f}s")
+    print(f"📈 Quota: {ledger.spent_today()}/{ledger.daily_limit} used today")
+
+
+def _profiled(fn, directory: Path, *fn_args):
+    """Run fn(*fn_args) under profiling.Profiler and print where the time went"""
+    import profiling
+
+    with profiling.Profiler(directory) as profiler:
+        fn(*fn_args)
+    profiler.print_summary()
+
+
+def main(argv: list | None = None) -> int:
+    """Command line entry point"""
+    options = parse_args(argv)
+    if not YOUTUBE_API_KEY and not options.plan:  # --plan makes no API calls
         print("❌ ERROR: YOUTUBE_API_KEY not set in .env")
-        exit(1)
+        return 1
+
+    configure(options)
+    domains = resolve_domains(options.domain)
+    if not domains:
+        return 1
+
+    recorder = telemetry.start_run("video_curator_v2", domains=domains)
 
-    run_curation()
+    def curate():
+        if len(domains) == 1:
+            run_curation(domains[0])
+        else:
+            run_domains_parallel(domains, options.domain_workers)
+
+    if options.profile:
+        import profiling
+
+        # Run-scoped directory; domain worker processes write to <run_id>/<domain>/
+        options.profile_dir = (options.profile_dir or profiling.DEFAULT_PROFILE_DIR) / recorder.run_id
+        _profiled(curate, options.profile_dir)
+    else:
+        curate()
+
+    if not options.plan:
+        report_path, metrics_path = recorder.write_reports(options.report_dir)
+        print(f"\n⏱️  Stages: {recorder.summary()}")
+        print(f"   Run report: {report_path} (+ {metrics_path.name})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+DIY Video Finder - Shared YouTube Data API Client
+=================================================
+
+Used by both video_curator.py and video_curator_v2.py.
+
+- The service object is built ONCE from the discovery document bundled with
+  google-api-python-client (no network round trip, no per-call rebuild)
+- Every thread gets its own keep-alive HTTP connection (httplib2 is not
+  thread-safe), so requests can be issued from a thread pool
+- Optional persistent response cache (see response_cache.py)
+- Optional quota ledger with budget enforcement (see quota.py)
+- Calls, quota units, cache hits and latency are recorded in telemetry.py
+- YOUTUBE_API_ENDPOINT points every request at another server, e.g. the
+  local stand-in from fake_youtube.py; cache and ledger then live in
+  .cache/fake-api/ so synthetic data never mixes with real responses
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import telemetry
+
+# Seconds before a single API request is aborted
+HTTP_TIMEOUT = 30
+
+# videos.list accepts at most 50 comma-separated IDs per call
+VIDEOS_LIST_MAX_IDS = 50
+
+# Environment variable that overrides the API base URL (e.g. http://127.0.0.1:8765/)
+ENDPOINT_ENV = "YOUTUBE_API_ENDPOINT"
+
+_service = None
+_service_key = None
+_service_lock = threading.Lock()
+_thread_local = threading.local()
+
+_cache = None
+_cache_mode = "off"
+_ledger = None
+
+
+def api_endpoint() -> str | None:
+    """Base URL override from YOUTUBE_API_ENDPOINT (None = the real API)"""
+    endpoint = os.getenv(ENDPOINT_ENV, "").strip()
+    if not endpoint:
+        return None
+    return endpoint if endpoint.endswith("/") else endpoint + "/"
+
+
+def _state_path(default: Path) -> Path:
+    """Cache/ledger file for the current endpoint (kept apart for a fake server)"""
+    if api_endpoint() is None:
+        return default
+    return default.parent / "fake-api" / default.name
+
+
+def get_youtube(api_key: str | None = None):
+    """Return the shared YouTube v3 service (built on first use)"""
+    global _service, _service_key
+
+    api_key = api_key or os.getenv("YOUTUBE_API_KEY")
+    endpoint = api_endpoint()
+    with _service_lock:
+        if _service is None or _service_key != (api_key, endpoint):
+            from googleapiclient.discovery import build
+
+            _service = build(
+                "youtube",
+                "v3",
+                developerKey=api_key,
+                static_discovery=True,  # Bundled discovery doc, no download
+                cache_discovery=False,
+                client_options={"api_endpoint": endpoint} if endpoint else None,
+            )
+            _service_key = (api_key, endpoint)
+    return _service
+
+
+def _thread_http():
+    """Keep-alive HTTP transport owned by the calling thread"""
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        import httplib2
+
+        http = httplib2.Http(timeout=HTTP_TIMEOUT)
+        _thread_local.http = http
+    return http
+
+
+def configure_cache(mode: str = "use", path=None):
+    """Enable the persistent response cache ("use", "refresh" or "off")"""
+    global _cache, _cache_mode
+
+    from response_cache import DEFAULT_CACHE_PATH, ResponseCache
+
+    _cache_mode = mode
+    if mode == "off":
+        _cache = None
+    elif _cache is None:
+        _cache = ResponseCache(path or _state_path(DEFAULT_CACHE_PATH))
+    return _cache
+
+
+def get_cache():
+    """Return the active response cache (None if disabled)"""
+    return _cache
+
+
+def configure_quota(budget: int | None = None, path=None, daily_limit: int | None = None):
+    """Enable quota accounting, optionally capped at `budget` units for this run"""
+    global _ledger
+
+    from quota import DAILY_QUOTA, DEFAULT_LEDGER_PATH, QuotaLedger
+
+    _ledger = QuotaLedger(
+        path or _state_path(DEFAULT_LEDGER_PATH), budget=budget, daily_limit=daily_limit or DAILY_QUOTA
+    )
+    return _ledger
+
+
+def get_ledger():
+    """Return the active quota ledger (None if disabled)"""
+    return _ledger
+
+
+def execute(request):
+    """Execute an API request on the current thread's pooled connection
+
+    Cache hits are free; everything else is charged to the quota ledger
+    first and raises quota.QuotaExceededError once the budget is spent.
+    """
+    method = request.methodId
+    if _cache is not None and _cache_mode == "use":
+        cached = _cache.get(method, request.uri)
+        telemetry.count("youtube_cache_requests_total", method=method, result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+
+    if _ledger is not None:
+        units = _ledger.charge(method)
+    else:
+        from quota import cost_of
+
+        units = cost_of(method)
+    telemetry.count("youtube_api_calls_total", method=method)
+    telemetry.count("youtube_quota_units_total", units, method=method)
+
+    start = time.perf_counter()
+    try:
+        response = request.execute(http=_thread_http())
+    except Exception as e:
+        quota_error = _is_quota_error(e)
+        telemetry.count("youtube_api_errors_total", method=method, reason="quota" if quota_error else "error")
+        if _ledger is not None and quota_error:
+            from quota import QuotaExceededError
+
+            _ledger.mark_exhausted()
+            raise QuotaExceededError("YouTube daily quota exceeded (403 quotaExceeded)") from e
+        raise
+    finally:
+        telemetry.observe("youtube_request_duration_seconds", time.perf_counter() - start, method=method)
+
+    if _cache is not None:
+        _cache.put(method, request.uri, response)
+    return response
+
+
+def _is_quota_error(error: Exception) -> bool:
+    """True for the 403 quotaExceeded / dailyLimitExceeded API errors"""
+    status = getattr(getattr(error, "resp", None), "status", None)
+    content = getattr(error, "content", b"") or b""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+    return status == 403 and ("quotaExceeded" in content or "dailyLimitExceeded" in content)